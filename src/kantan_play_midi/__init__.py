@@ -13,8 +13,21 @@ from .models import Note, Performance
 from .exceptions import KantanPlayMIDIError, InvalidInputError, MIDIDeviceError, ConfigurationError
 from .processor import PerformanceProcessor
 from .timing import TimingCalculator
-from .sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from .sequence import (
+    PlaybackSequence, ColumnarSequence, EventStream, MIDIEvent, MIDIEventType, RowSequence
+)
 from .player import PlaybackState
+from .scheduler import PrecisionScheduler
+from .compiled import CompiledSequence
+from .async_player import AsyncMIDIPlayer
+from .multi_player import MultiPortPlayer
+from .backends import MIDIOutputBackend, RtMidiBackend, LoopbackBackend
+from .metrics import PlaybackMetrics
+from .playlist import Playlist
+from .realtime import RealtimeConfig, RealtimeReport
+from .ports import PortManager, get_port_manager
+from .sequence_file import MappedSequence, save_sequence, load_sequence
+from .smf import export_smf
 
 __all__ = [
     "MIDIConfig", 
@@ -30,7 +43,27 @@ __all__ = [
     "PerformanceProcessor",
     "TimingCalculator",
     "PlaybackSequence",
+    "ColumnarSequence",
+    "EventStream",
     "MIDIEvent",
     "MIDIEventType",
-    "PlaybackState"
+    "RowSequence",
+    "PlaybackState",
+    "PrecisionScheduler",
+    "CompiledSequence",
+    "AsyncMIDIPlayer",
+    "MultiPortPlayer",
+    "MIDIOutputBackend",
+    "RtMidiBackend",
+    "LoopbackBackend",
+    "PlaybackMetrics",
+    "Playlist",
+    "RealtimeConfig",
+    "RealtimeReport",
+    "PortManager",
+    "get_port_manager",
+    "MappedSequence",
+    "save_sequence",
+    "load_sequence",
+    "export_smf",
 ]
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+asyncio対応のMIDI演奏制御モジュール
+"""
+import asyncio
+import time
+from typing import List, Optional, Union
+
+from .exceptions import MIDIDeviceError
+from .backends import MIDIOutputBackend
+from .sequence import RowSequence
+from .compiled import CompiledSequence
+from .player import MIDIPlayer, PlaybackState
+from .scheduler import PrecisionScheduler
+
+
+def _wake(waiter: "asyncio.Future[bool]", reached: bool) -> None:
+    """待機中のFutureを完了させる"""
+    if not waiter.done():
+        waiter.set_result(reached)
+
+
+class AsyncMIDIPlayer:
+    """asyncioのイベントループ上でMIDI演奏を制御するクラス
+
+    演奏はイベントループ上の1つのタスクとして実行され、スレッドを使用しない。
+    締め切りの ``spin_window`` 秒前まではループに制御を返し、残りだけをスピンで詰める。
+    MIDIポートの接続やノート送出は内部の :class:`MIDIPlayer` に委譲する。
+    """
+
+    def __init__(
+        self,
+        midi_port: Optional[str] = None,
+        spin_window: float = 0.001,
+        fast_panic: bool = False,
+        backend: Optional[MIDIOutputBackend] = None
+    ):
+        """
+        Args:
+            midi_port: 使用するMIDIポート名
+            spin_window: イベント送出直前にスピン待機する時間幅（秒）
+            fast_panic: 停止時にCC 123/CC 120で全ノートを解放する
+            backend: MIDI出力バックエンド（指定しない場合はrtmidiを使用）
+        """
+        if spin_window < 0:
+            raise ValueError(f"spin_window must be non-negative, got {spin_window}")
+        self.player = MIDIPlayer(midi_port, fast_panic=fast_panic, backend=backend)
+        self.spin_window_ns = int(spin_window * 1_000_000_000)
+        self._state = PlaybackState.STOPPED
+        self._current_sequence: Optional[CompiledSequence] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._completion: Optional["asyncio.Future[None]"] = None
+        self._waiter: Optional["asyncio.Future[bool]"] = None
+        self._start_ns: int = 0
+        self._pause_ns: int = 0
+
+    @property
+    def scheduler(self) -> PrecisionScheduler:
+        """送出したイベントの遅延を記録するスケジューラ"""
+        return self.player.scheduler
+
+    @property
+    def midi_port(self) -> Optional[str]:
+        """接続中のMIDIポート名"""
+        return self.player.midi_port
+
+    def get_available_ports(self) -> List[str]:
+        """利用可能なMIDIポートのリストを取得"""
+        return self.player.get_available_ports()
+
+    def connect(self, port_name: Optional[str] = None) -> None:
+        """
+        MIDIポートに接続する
+
+        Args:
+            port_name: 接続するポート名（指定しない場合は最初の利用可能ポート）
+
+        Raises:
+            MIDIDeviceError: 接続に失敗した場合
+        """
+        self.player.connect(port_name)
+
+    async def disconnect(self) -> None:
+        """演奏を停止してMIDIポートから切断する"""
+        await self.stop()
+        self.player.disconnect()
+
+    def is_connected(self) -> bool:
+        """MIDI接続状態を確認"""
+        return self.player.is_connected()
+
+    async def play_sequence(
+        self, sequence: Union[RowSequence, CompiledSequence]
+    ) -> "asyncio.Future[None]":
+        """
+        シーケンスの演奏を開始
+
+        Args:
+            sequence: 演奏するシーケンス（CompiledSequence以外は演奏前にコンパイルされる）
+
+        Returns:
+            asyncio.Future[None]: 演奏の完了（または停止）時に完了するFuture
+
+        Raises:
+            MIDIDeviceError: MIDI接続がない場合、または既に演奏中の場合
+        """
+        if not self.is_connected():
+            raise MIDIDeviceError("MIDI device not connected")
+
+        if self._state != PlaybackState.STOPPED:
+            raise MIDIDeviceError("Already playing. Stop current playback first.")
+
+        if not isinstance(sequence, CompiledSequence):
+            sequence = CompiledSequence.from_sequence(
+                sequence, self.player.channel, self.player.baud_rate
+            )
+
+        loop = asyncio.get_running_loop()
+        self._current_sequence = sequence
+        self._completion = loop.create_future()
+        self.scheduler.reset()
+        self._state = PlaybackState.PLAYING
+        self._start_ns = time.perf_counter_ns()
+        self._task = loop.create_task(self._playback_task(sequence))
+        return self._completion
+
+    async def wait(self) -> None:
+        """演奏の完了まで待機"""
+        if self._completion is not None:
+            await asyncio.shield(self._completion)
+
+    async def pause(self) -> None:
+        """演奏を一時停止"""
+        if self._state == PlaybackState.PLAYING:
+            self._pause_ns = time.perf_counter_ns()
+            self._state = PlaybackState.PAUSED
+            self._interrupt()
+
+    async def resume(self) -> None:
+        """演奏を再開"""
+        if self._state == PlaybackState.PAUSED:
+            self._start_ns += time.perf_counter_ns() - self._pause_ns
+            self._state = PlaybackState.PLAYING
+            self._interrupt()
+
+    async def stop(self) -> None:
+        """演奏を停止し、押下中のノートを解放"""
+        if self._state != PlaybackState.STOPPED:
+            self._state = PlaybackState.STOPPED
+            self._interrupt()
+
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        self.player.release_held_notes()
+
+    def get_state(self) -> PlaybackState:
+        """現在の演奏状態を取得"""
+        return self._state
+
+    def get_current_time(self) -> float:
+        """現在の演奏時刻を取得（秒）"""
+        if self._state == PlaybackState.STOPPED:
+            return 0.0
+        elif self._state == PlaybackState.PAUSED:
+            return (self._pause_ns - self._start_ns) / 1e9
+        else:
+            return (time.perf_counter_ns() - self._start_ns) / 1e9
+
+    def _interrupt(self) -> None:
+        """待機中の演奏タスクを起こす"""
+        if self._waiter is not None:
+            _wake(self._waiter, False)
+
+    async def _sleep_until(self, deadline_ns: int) -> bool:
+        """
+        指定した単調時刻まで待機する
+
+        Returns:
+            bool: 締め切りに到達した場合はTrue、pause/resume/stopで起こされた場合はFalse
+        """
+        perf_counter_ns = time.perf_counter_ns
+        remaining = deadline_ns - perf_counter_ns()
+
+        if remaining > self.spin_window_ns:
+            # スピン幅の手前まではイベントループに制御を返す
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            handle = loop.call_later(
+                (remaining - self.spin_window_ns) / 1_000_000_000, _wake, waiter, True
+            )
+            self._waiter = waiter
+            try:
+                if not await waiter:
+                    return False
+            finally:
+                handle.cancel()
+                self._waiter = None
+
+        while perf_counter_ns() < deadline_ns:
+            pass
+        return True
+
+    async def _idle(self) -> None:
+        """pause/resume/stopで起こされるまでCPUを使わずに待機"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiter = waiter
+        try:
+            await waiter
+        finally:
+            self._waiter = None
+
+    async def _playback_task(self, compiled: CompiledSequence) -> None:
+        """演奏タスク"""
+        player = self.player
+        record_lateness = self.scheduler.record_lateness
+
+        try:
+            for offset_ns, burst, masks in zip(
+                compiled.deadlines_ns, compiled.bursts, compiled.note_masks
+            ):
+                while True:
+                    if self._state == PlaybackState.STOPPED:
+                        return
+                    if self._state == PlaybackState.PAUSED:
+                        await self._idle()
+                        continue
+                    deadline_ns = self._start_ns + offset_ns
+                    if await self._sleep_until(deadline_ns) and \
+                            self._state == PlaybackState.PLAYING:
+                        break
+
+                try:
+                    for _ in burst:
+                        record_lateness(deadline_ns)
+                    player.send_burst(burst, masks)
+                except Exception as e:
+                    print(f"Error executing MIDI event: {e}")
+        finally:
+            self._state = PlaybackState.STOPPED
+            if self._completion is not None and not self._completion.done():
+                self._completion.set_result(None)
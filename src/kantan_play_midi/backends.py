@@ -0,0 +1,203 @@
+"""
+MIDI出力バックエンドモジュール
+"""
+from abc import ABC, abstractmethod
+from array import array
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import rtmidi
+
+from .exceptions import MIDIDeviceError
+from .ports import PortManager, get_port_manager
+
+
+class MIDIOutputBackend(ABC):
+    """MIDI出力バックエンドの基底クラス
+
+    MIDIPlayerはこのインターフェースを通してポートの列挙・接続・メッセージ送出を行う。
+    """
+
+    @abstractmethod
+    def get_ports(self) -> List[str]:
+        """利用可能なMIDIポートのリストを取得"""
+
+    @abstractmethod
+    def open(self, port_name: Optional[str] = None) -> str:
+        """
+        MIDIポートを開く
+
+        Args:
+            port_name: 開くポート名（指定しない場合は最初の利用可能ポート）
+
+        Returns:
+            str: 実際に開いたポート名
+
+        Raises:
+            MIDIDeviceError: ポートを開けなかった場合
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """MIDIポートを閉じる"""
+
+    def discard(self) -> None:
+        """
+        送信に失敗した接続を破棄する
+
+        再接続の前に呼び出される。共有しているハンドルがある場合は、
+        再利用されないように破棄する。
+        """
+        self.close()
+
+    @abstractmethod
+    def is_open(self) -> bool:
+        """ポートが開いているかを確認"""
+
+    @abstractmethod
+    def send_message(self, message: Sequence[int]) -> None:
+        """
+        MIDIメッセージを送信
+
+        Args:
+            message: 送信するメッセージのバイト列
+        """
+
+
+class RtMidiBackend(MIDIOutputBackend):
+    """python-rtmidiを使用する出力バックエンド
+
+    ポートの列挙とハンドルの生成はPortManagerに委ね、同じポートを使う他のバックエンドと
+    開いたハンドルを共有する。
+    """
+
+    def __init__(self, port_manager: Optional[PortManager] = None) -> None:
+        """
+        Args:
+            port_manager: 使用するポート管理（指定しない場合はプロセス全体で共有のもの）
+        """
+        self.port_manager = port_manager if port_manager is not None else get_port_manager()
+        self._midi_out: Optional[rtmidi.MidiOut] = None
+        self._port_name: Optional[str] = None
+
+    def get_ports(self) -> List[str]:
+        """利用可能なMIDIポートのリストを取得"""
+        return self.port_manager.get_ports()
+
+    def open(self, port_name: Optional[str] = None) -> str:
+        """MIDIポートを開く"""
+        self.close()
+
+        port_name, self._midi_out = self.port_manager.acquire(port_name)
+        self._port_name = port_name
+        return port_name
+
+    def close(self) -> None:
+        """MIDIポートを閉じる（ハンドルはPortManagerに返却する）"""
+        midi_out, port_name = self._midi_out, self._port_name
+        self._midi_out = None
+        self._port_name = None
+        if midi_out is not None and port_name is not None:
+            self.port_manager.release(port_name, midi_out)
+
+    def discard(self) -> None:
+        """送信に失敗した接続を破棄する（プールされたハンドルも破棄）"""
+        midi_out, port_name = self._midi_out, self._port_name
+        self.close()
+        if midi_out is not None and port_name is not None:
+            self.port_manager.invalidate(port_name, midi_out)
+
+    def is_open(self) -> bool:
+        """ポートが開いているかを確認"""
+        return self._midi_out is not None and self._midi_out.is_port_open()
+
+    def send_message(self, message: Sequence[int]) -> None:
+        """MIDIメッセージを送信"""
+        if self._midi_out is None:
+            raise MIDIDeviceError("MIDI device not connected")
+        self._midi_out.send_message(message)
+
+
+class LoopbackBackend(MIDIOutputBackend):
+    """送信したメッセージをプロセス内に記録するループバックバックエンド
+
+    MIDIサブシステムのない環境でのテストや、実際の送出タイミングの計測に使用する。
+    メッセージは送信時刻（``time.perf_counter_ns()``）とともに事前確保したバッファへ
+    固定長（3バイト）で記録されるため、記録中にメモリ確保は発生しない。
+    バッファが一杯になった後のメッセージは記録されず、``dropped`` に計上される。
+    """
+
+    MESSAGE_SIZE = 3
+
+    def __init__(self, port_names: Sequence[str] = ("Loopback",), capacity: int = 65536):
+        """
+        Args:
+            port_names: 仮想的に提供するポート名
+            capacity: 記録できるメッセージ数
+        """
+        self.port_names = list(port_names)
+        self.capacity = capacity
+        self.timestamps_ns = array('q', bytes(8 * capacity))
+        self.buffer = bytearray(self.MESSAGE_SIZE * capacity)
+        self.count = 0
+        self.dropped = 0
+        self.port_name: Optional[str] = None
+
+    def get_ports(self) -> List[str]:
+        """利用可能なMIDIポートのリストを取得"""
+        return list(self.port_names)
+
+    def open(self, port_name: Optional[str] = None) -> str:
+        """ループバックポートを開く"""
+        if not self.port_names:
+            raise MIDIDeviceError("No MIDI output ports available")
+        if port_name:
+            if port_name not in self.port_names:
+                raise MIDIDeviceError(
+                    f"MIDI port '{port_name}' not found. Available: {self.port_names}"
+                )
+        else:
+            port_name = self.port_names[0]
+        self.port_name = port_name
+        return port_name
+
+    def close(self) -> None:
+        """ループバックポートを閉じる（記録は保持する）"""
+        self.port_name = None
+
+    def is_open(self) -> bool:
+        """ポートが開いているかを確認"""
+        return self.port_name is not None
+
+    def send_message(self, message: Sequence[int]) -> None:
+        """MIDIメッセージを送信時刻とともに記録"""
+        timestamp = time.perf_counter_ns()
+        if self.port_name is None:
+            raise MIDIDeviceError("MIDI device not connected")
+
+        index = self.count
+        if index >= self.capacity:
+            self.dropped += 1
+            return
+        offset = index * self.MESSAGE_SIZE
+        self.buffer[offset:offset + self.MESSAGE_SIZE] = bytes(message)[:self.MESSAGE_SIZE]
+        self.timestamps_ns[index] = timestamp
+        self.count = index + 1
+
+    def get_messages(self) -> List[Tuple[int, bytes]]:
+        """
+        記録したメッセージを取得
+
+        Returns:
+            List[Tuple[int, bytes]]: (送信時刻ナノ秒, メッセージ) のリスト
+        """
+        size = self.MESSAGE_SIZE
+        return [
+            (self.timestamps_ns[i], bytes(self.buffer[i * size:(i + 1) * size]))
+            for i in range(self.count)
+        ]
+
+    def clear(self) -> None:
+        """記録をクリア"""
+        self.count = 0
+        self.dropped = 0
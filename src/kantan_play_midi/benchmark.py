@@ -0,0 +1,217 @@
+"""
+演奏タイミング精度のベンチマークモジュール
+"""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import click
+
+from .config import MIDIConfig
+from .models import Note, Performance
+from .processor import PerformanceProcessor
+from .compiled import CompiledSequence
+from .player import MIDIPlayer
+from .backends import LoopbackBackend
+
+
+DEGREES = ["1", "2b", "2", "3b", "3", "4", "5b", "5", "6b", "6", "7b", "7"]
+
+
+def generate_performance(
+    tempo: int,
+    note_count: int,
+    modifier_density: float,
+    slot: int = 1,
+    seed: int = 0
+) -> Performance:
+    """
+    ベンチマーク用の演奏データを生成
+
+    Args:
+        tempo: テンポ (BPM)
+        note_count: 音符の数
+        modifier_density: 各モディファイアが有効になる確率 (0.0-1.0)
+        slot: スロット番号
+        seed: 乱数シード
+
+    Returns:
+        Performance: 生成した演奏データ
+    """
+    rng = random.Random(seed)
+    notes = []
+    for _ in range(note_count):
+        modifiers = [
+            rng.randint(1, 8) if rng.random() < modifier_density else 0
+            for _ in range(3)
+        ]
+        notes.append(Note(rng.choice(DEGREES), *modifiers))
+    return Performance(slot=slot, tempo=tempo, notes=notes)
+
+
+def _percentile(ordered: Sequence[int], fraction: float) -> float:
+    """ソート済みのナノ秒値から百分位数を秒で取得"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] / 1e9
+
+
+def measure_playback(
+    compiled: CompiledSequence,
+    spin_window: float = 0.002
+) -> Dict[str, Any]:
+    """
+    コンパイル済みシーケンスをループバックバックエンドで演奏して計測
+
+    Args:
+        compiled: 演奏するシーケンス
+        spin_window: スケジューラのスピン幅（秒）
+
+    Returns:
+        Dict[str, Any]: 遅延の百分位数、演奏スレッドのCPU時間、終端のドリフト
+    """
+    message_count = sum(len(burst) for burst in compiled.bursts)
+    backend = LoopbackBackend(capacity=max(message_count, 1))
+    player = MIDIPlayer(spin_window=spin_window, backend=backend)
+    player.connect()
+
+    start_wall = time.perf_counter_ns()
+    player.play_sequence(compiled)
+    player.wait()
+    elapsed_ns = time.perf_counter_ns() - start_wall
+    start_ns = player.start_ns
+
+    # 実際の送信時刻と締め切りの差（メッセージ単位）
+    lateness = []
+    index = 0
+    for offset_ns, burst in zip(compiled.deadlines_ns, compiled.bursts):
+        for _ in burst:
+            lateness.append(backend.timestamps_ns[index] - (start_ns + offset_ns))
+            index += 1
+    drift_ns = lateness[-1] if lateness else 0
+    lateness.sort()
+
+    player.disconnect()
+
+    return {
+        "messages": message_count,
+        "lateness": {
+            "p50": _percentile(lateness, 0.50),
+            "p99": _percentile(lateness, 0.99),
+            "max": lateness[-1] / 1e9 if lateness else 0.0,
+        },
+        "cpu_time": player.playback_cpu_time,
+        "elapsed": elapsed_ns / 1e9,
+        "drift": drift_ns / 1e9,
+    }
+
+
+def run_benchmark_suite(
+    config: MIDIConfig,
+    tempos: Sequence[int],
+    note_counts: Sequence[int],
+    modifier_densities: Sequence[float],
+    spin_window: float = 0.002,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    テンポ・音符数・モディファイア密度の組み合わせごとにベンチマークを実行
+
+    Args:
+        config: MIDI設定
+        tempos: 計測するテンポのリスト
+        note_counts: 計測する音符数のリスト
+        modifier_densities: 計測するモディファイア密度のリスト
+        spin_window: スケジューラのスピン幅（秒）
+        seed: 乱数シード
+
+    Returns:
+        Dict[str, Any]: 計測条件と結果のリスト
+    """
+    processor = PerformanceProcessor(config)
+    results: List[Dict[str, Any]] = []
+
+    for tempo in tempos:
+        for note_count in note_counts:
+            for density in modifier_densities:
+                performance = generate_performance(tempo, note_count, density, seed=seed)
+                compiled = CompiledSequence.from_sequence(
+                    processor.process_performance(performance)
+                )
+                result = measure_playback(compiled, spin_window)
+                result.update({
+                    "tempo": tempo,
+                    "notes": note_count,
+                    "modifier_density": density,
+                    "duration": compiled.total_duration_ns / 1e9,
+                })
+                results.append(result)
+
+    return {
+        "spin_window": spin_window,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+
+
+def _parse_list(value: str, cast: Any) -> List[Any]:
+    """カンマ区切りの値を解析"""
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+@click.command()
+@click.option(
+    '--config',
+    type=click.Path(exists=True, path_type=Path),
+    default='MIDI.json',
+    help='MIDI設定ファイルのパス (デフォルト: MIDI.json)'
+)
+@click.option('--tempos', default='120,300,600', help='計測するテンポ（カンマ区切り）')
+@click.option('--notes', 'note_counts', default='2', help='計測する音符数（カンマ区切り）')
+@click.option(
+    '--modifier-densities',
+    default='0,1',
+    help='モディファイアが有効になる確率（カンマ区切り, 0.0-1.0）'
+)
+@click.option('--spin-window', type=float, default=0.002, help='スピン幅（秒）')
+@click.option('--seed', type=int, default=0, help='乱数シード')
+@click.option(
+    '--output', '-o',
+    type=click.Path(path_type=Path),
+    help='結果のJSONを書き出すファイル（指定しない場合は標準出力）'
+)
+def main(
+    config: Path,
+    tempos: str,
+    note_counts: str,
+    modifier_densities: str,
+    spin_window: float,
+    seed: int,
+    output: Optional[Path]
+) -> None:
+    """
+    MIDIPlayerのタイミング精度ベンチマーク
+
+    合成した演奏データをループバックバックエンドで実時間演奏し、
+    結果をJSONで出力する。
+    """
+    report = run_benchmark_suite(
+        MIDIConfig(config),
+        _parse_list(tempos, int),
+        _parse_list(note_counts, int),
+        _parse_list(modifier_densities, float),
+        spin_window=spin_window,
+        seed=seed,
+    )
+    text = json.dumps(report, indent=2)
+    if output:
+        output.write_text(text + "\n", encoding='utf-8')
+    else:
+        click.echo(text)
+
+
+if __name__ == '__main__':
+    main()
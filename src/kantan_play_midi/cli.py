@@ -15,6 +15,7 @@ from .config import MIDIConfig
 from .converter import MIDIConverter
 from .processor import PerformanceProcessor
 from .player import MIDIPlayer, PlaybackState
+from .smf import export_smf
 from .exceptions import KantanPlayMIDIError, MIDIDeviceError
 
 
@@ -49,6 +50,11 @@ console = Console()
     type=str,
     help='使用するMIDIポート名'
 )
+@click.option(
+    '--export-midi',
+    type=click.Path(dir_okay=False, path_type=Path),
+    help='演奏シーケンスをスタンダードMIDIファイルに書き出す'
+)
 @click.option(
     '--list-ports',
     is_flag=True,
@@ -66,6 +72,7 @@ def main(
     show_conversion: bool,
     play: bool,
     midi_port: Optional[str],
+    export_midi: Optional[Path],
     list_ports: bool,
     verbose: bool
 ) -> None:
@@ -107,7 +114,8 @@ def main(
         # MIDI設定の読み込み
         console.print("[yellow]🎵 MIDI設定を読み込み中...[/yellow]")
         midi_config = MIDIConfig(config)
-        processor = PerformanceProcessor(midi_config)
+        # イベントの説明は詳細表示の場合だけ生成する
+        processor = PerformanceProcessor(midi_config, descriptions=verbose)
         
         console.print("[green]✅ MIDI設定の読み込みが完了しました[/green]")
 
@@ -118,6 +126,10 @@ def main(
             _display_conversion_results(performance, processor.converter)
             _display_sequence_info(sequence)
 
+        if export_midi:
+            export_smf(sequence, export_midi)
+            console.print(f"[green]💾 MIDIファイルを書き出しました: {export_midi}[/green]")
+
         # MIDI演奏の実行
         if play:
             _execute_midi_playback(sequence, midi_port)
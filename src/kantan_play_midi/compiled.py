@@ -0,0 +1,431 @@
+"""
+コンパイル済み演奏シーケンスモジュール
+"""
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+import heapq
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple
+import warnings
+
+from .sequence import (
+    RowSequence, MIDIEvent, MIDIEventType, EventRow, EVENT_TYPE_CODES, SLOT_PRESS_DURATION,
+    event_row
+)
+
+
+# (締め切りナノ秒, 送出メッセージ, (押下マスク, 解放マスク))
+Burst = Tuple[int, Tuple[bytes, ...], Tuple[int, int]]
+
+MIDI_BAUD_RATE = 31250  # DIN MIDIの伝送速度（ボー）
+
+
+def byte_time_ns(baud_rate: int) -> int:
+    """
+    1バイトの伝送時間を取得（スタートビット・ストップビットを含む10ビット）
+
+    Args:
+        baud_rate: 伝送速度（ボー）
+
+    Returns:
+        int: 1バイトの伝送時間（ナノ秒）
+    """
+    if baud_rate <= 0:
+        raise ValueError(f"baud_rate must be positive, got {baud_rate}")
+    return 10 * 1_000_000_000 // baud_rate
+
+
+def iter_bursts(events: Iterable[MIDIEvent], channel: int = 0) -> Iterator[Burst]:
+    """
+    時刻順のイベント列を送出用のバーストに逐次エンコード
+
+    同じ時刻のイベントは1つのバーストにまとめられ、バースト内ではノートオフが
+    ノートオンより先に並べられる（伝送帯域が限られる場合に解放を優先するため）。
+    スロット押下（SLOT_PRESS）はノートオンと、押下時間後のノートオフの組として
+    タイムライン上に展開される。
+    イベント列は必要な分だけ読み進められるため、遅延生成されたイベント列にも使用できる。
+
+    Args:
+        events: 時刻順にソート済みのイベント列
+        channel: 送出するMIDIチャンネル (0-15)
+
+    Yields:
+        Burst: (締め切りナノ秒, 送出メッセージ, (押下マスク, 解放マスク))
+    """
+    return iter_row_bursts(map(event_row, events), channel)
+
+
+def iter_row_bursts(rows: Iterable[EventRow], channel: int = 0) -> Iterator[Burst]:
+    """
+    時刻順のイベントの固定幅表現を送出用のバーストに逐次エンコード（iter_burstsの本体）
+
+    MIDIEventを経由しないため、配列やファイルから読み出したイベントをそのまま使用できる。
+
+    Args:
+        rows: 時刻順にソート済みのイベントの固定幅表現
+        channel: 送出するMIDIチャンネル (0-15)
+
+    Yields:
+        Burst: (締め切りナノ秒, 送出メッセージ, (押下マスク, 解放マスク))
+    """
+    note_on_status = 0x90 + channel
+    note_off_status = 0x80 + channel
+    note_on = EVENT_TYPE_CODES[MIDIEventType.NOTE_ON]
+    note_off = EVENT_TYPE_CODES[MIDIEventType.NOTE_OFF]
+    slot_press = EVENT_TYPE_CODES[MIDIEventType.SLOT_PRESS]
+    slot_press_ns = round(SLOT_PRESS_DURATION * 1_000_000_000)
+
+    # スロット押下の解放待ち (締め切り, 登録順, メッセージ)
+    releases: List[Tuple[int, int, bytes]] = []
+    release_order = itertools.count()
+
+    def encoded(row: EventRow) -> Iterator[Tuple[int, bytes]]:
+        deadline, event_type, note, velocity, duration_ns = row
+
+        # 到達済みの解放を先に送出（同時刻ではノートオフを優先）
+        while releases and releases[0][0] <= deadline:
+            release_deadline, _, message = heapq.heappop(releases)
+            yield release_deadline, message
+
+        if event_type == note_on:
+            yield deadline, bytes((note_on_status, note & 0x7F, velocity & 0x7F))
+        elif event_type == note_off:
+            yield deadline, bytes((note_off_status, note & 0x7F, 0))
+        elif event_type == slot_press:
+            yield deadline, bytes((note_on_status, note & 0x7F, velocity & 0x7F))
+            heapq.heappush(releases, (
+                deadline + (duration_ns if duration_ns > 0 else slot_press_ns),
+                next(release_order),
+                bytes((note_off_status, note & 0x7F, 0)),
+            ))
+
+    def remaining_releases() -> Iterator[Tuple[int, bytes]]:
+        while releases:
+            release_deadline, _, message = heapq.heappop(releases)
+            yield release_deadline, message
+
+    messages = itertools.chain(
+        itertools.chain.from_iterable(map(encoded, rows)),
+        remaining_releases(),
+    )
+
+    def flush(deadline: int, offs: List[bytes], ons: List[bytes]) -> Burst:
+        # ノートオフを先に送出するため、押下状態はノートオンで上書きされる
+        off_mask = 0
+        for message in offs:
+            off_mask |= 1 << message[1]
+        on_mask = 0
+        for message in ons:
+            on_mask |= 1 << message[1]
+        return deadline, tuple(offs + ons), (on_mask, off_mask & ~on_mask)
+
+    current_deadline = None
+    offs: List[bytes] = []
+    ons: List[bytes] = []
+
+    for deadline, message in messages:
+        if deadline != current_deadline:
+            if current_deadline is not None:
+                yield flush(current_deadline, offs, ons)
+            current_deadline = deadline
+            offs = []
+            ons = []
+
+        if message[0] == note_on_status and message[2]:
+            ons.append(message)
+        else:
+            offs.append(message)
+
+    if current_deadline is not None:
+        yield flush(current_deadline, offs, ons)
+
+
+def held_transition(current: int, target: int, channel: int = 0) -> Tuple[bytes, ...]:
+    """
+    押下状態をcurrentからtargetに移すメッセージを生成（解放を先に送信）
+
+    Args:
+        current: 現在押下中のノートのビットマップ
+        target: 押下されているべきノートのビットマップ
+        channel: 送出するMIDIチャンネル (0-15)
+
+    Returns:
+        Tuple[bytes, ...]: 差分のノートオフ・ノートオンメッセージ
+    """
+    messages: List[bytes] = []
+    releases = current & ~target
+    while releases:
+        lowest = releases & -releases
+        messages.append(bytes((0x80 + channel, lowest.bit_length() - 1, 0)))
+        releases ^= lowest
+    presses = target & ~current
+    while presses:
+        lowest = presses & -presses
+        messages.append(bytes((0x90 + channel, lowest.bit_length() - 1, 127)))
+        presses ^= lowest
+    return tuple(messages)
+
+
+@dataclass(frozen=True)
+class CompiledSequence:
+    """送出用にエンコード済みの演奏シーケンス
+
+    同じ時刻のイベントを1つのバースト（MIDIメッセージのバイト列のタプル）にまとめ、
+    バーストごとの締め切り（演奏開始からのナノ秒）を整数配列で保持する。
+    演奏スレッドはインデックスを進めるだけでよく、イベントごとの分岐や
+    メッセージ生成を行わない。
+
+    バーストごとに押下状態の変化（押下されるノート、解放されるノートの128ビットマスク）も
+    保持しており、演奏スレッドは押下中のノートをビット演算だけで追跡できる。
+
+    スロット押下（SLOT_PRESS）はノートオンと、押下時間後のノートオフの組として
+    タイムライン上に展開されるため、演奏スレッドが押下中に待機することはない。
+
+    締め切りは基準テンポ（tempo）での時刻であり、拍位置に比例する。演奏時のテンポが
+    異なる場合、プレイヤーは締め切りを基準テンポとの比で伸縮して実時間に対応付ける。
+
+    途中から演奏を始められるよう、CHECKPOINT_INTERVALバーストごとに押下状態の
+    チェックポイントを保持する。任意の時刻の位置と押下状態は、締め切り配列の二分探索と
+    直前のチェックポイントからの高々CHECKPOINT_INTERVAL回のマスク適用で求められる。
+    """
+    CHECKPOINT_INTERVAL = 64
+
+    deadlines_ns: array  # バーストごとの締め切り（演奏開始からのナノ秒, 'q'）
+    bursts: Tuple[Tuple[bytes, ...], ...]  # バーストごとの送出メッセージ
+    note_masks: Tuple[Tuple[int, int], ...]  # バーストごとの (押下マスク, 解放マスク)
+    total_duration_ns: int
+    event_count: int
+    held_checkpoints: Tuple[int, ...] = ()  # バーストk*CHECKPOINT_INTERVALの直前の押下状態
+    channel: int = 0
+    tempo: float = 120.0  # 締め切りの基準テンポ (BPM)
+
+    @classmethod
+    def from_sequence(
+        cls,
+        sequence: RowSequence,
+        channel: int = 0,
+        baud_rate: Optional[int] = MIDI_BAUD_RATE
+    ) -> "CompiledSequence":
+        """
+        演奏シーケンスをコンパイル
+
+        Args:
+            sequence: コンパイルする演奏シーケンス（PlaybackSequence、ColumnarSequence、
+                MappedSequenceなど。時刻順にソート済みであること）
+            channel: 送出するMIDIチャンネル (0-15)
+            baud_rate: 伝送帯域の検査に使う伝送速度（ボー）、Noneの場合は検査しない
+
+        Returns:
+            CompiledSequence: コンパイル済みシーケンス
+
+        Warns:
+            UserWarning: 伝送速度に対してイベントが密すぎ、後続のバーストが
+                締め切りまでに送出しきれない場合
+        """
+        deadlines_ns = array('q')
+        bursts: List[Tuple[bytes, ...]] = []
+        note_masks: List[Tuple[int, int]] = []
+        held_checkpoints: List[int] = []
+        held = 0
+
+        for index, (deadline, burst, masks) in enumerate(iter_row_bursts(sequence.iter_rows(), channel)):
+            if index % cls.CHECKPOINT_INTERVAL == 0:
+                held_checkpoints.append(held)
+            deadlines_ns.append(deadline)
+            bursts.append(burst)
+            note_masks.append(masks)
+            held = (held & ~masks[1]) | masks[0]
+
+        compiled = cls(
+            deadlines_ns=deadlines_ns,
+            bursts=tuple(bursts),
+            note_masks=tuple(note_masks),
+            total_duration_ns=round(sequence.total_duration * 1_000_000_000),
+            event_count=len(sequence.events),
+            held_checkpoints=tuple(held_checkpoints),
+            channel=channel,
+            tempo=sequence.tempo,
+        )
+
+        if baud_rate is not None:
+            delay_ns, at_ns = compiled.max_link_delay(baud_rate)
+            if delay_ns > 0:
+                warnings.warn(
+                    f"Sequence exceeds the sustainable MIDI message rate at {baud_rate} baud: "
+                    f"events are delayed by up to {delay_ns / 1e6:.2f} ms "
+                    f"(at {at_ns / 1e9:.3f}s)"
+                )
+
+        return compiled
+
+    def __len__(self) -> int:
+        """バースト数"""
+        return len(self.deadlines_ns)
+
+    def iter_bursts(self, start: int = 0) -> Iterator[Burst]:
+        """
+        バーストを締め切り順に列挙
+
+        Args:
+            start: 列挙を始めるバースト番号
+        """
+        deadlines_ns = self.deadlines_ns
+        bursts = self.bursts
+        note_masks = self.note_masks
+        return (
+            (deadlines_ns[i], bursts[i], note_masks[i])
+            for i in range(start, len(deadlines_ns))
+        )
+
+    def max_link_delay(self, baud_rate: int = MIDI_BAUD_RATE) -> Tuple[int, int]:
+        """
+        指定の伝送速度で送出した場合に、バーストの送出開始が締め切りから遅れる最大時間を取得
+
+        バースト内のメッセージは伝送時間の分だけ順に送出されるものとし、前のバーストを
+        送出しきる前に次の締め切りが来た場合、その差を遅れとする。
+
+        Args:
+            baud_rate: 伝送速度（ボー）
+
+        Returns:
+            Tuple[int, int]: (最大の遅れ, その締め切り)（ナノ秒）
+        """
+        per_byte_ns = byte_time_ns(baud_rate)
+        link_free_ns = 0
+        max_delay_ns = 0
+        max_delay_at_ns = 0
+
+        for deadline_ns, burst in zip(self.deadlines_ns, self.bursts):
+            delay_ns = link_free_ns - deadline_ns
+            if delay_ns > max_delay_ns:
+                max_delay_ns = delay_ns
+                max_delay_at_ns = deadline_ns
+            link_free_ns = max(link_free_ns, deadline_ns) + 3 * len(burst) * per_byte_ns
+
+        return max_delay_ns, max_delay_at_ns
+
+    def index_at(self, offset_ns: int) -> int:
+        """
+        指定時刻以降で最初のバースト番号を二分探索で取得
+
+        Args:
+            offset_ns: 演奏開始からの時刻（ナノ秒）
+
+        Returns:
+            int: バースト番号（該当がない場合はバースト数）
+        """
+        return bisect_left(self.deadlines_ns, offset_ns)
+
+    def held_before(self, index: int) -> int:
+        """
+        指定バーストの送出直前に押下されているノートのビットマップを取得
+
+        Args:
+            index: バースト番号
+
+        Returns:
+            int: 押下中ノートのビットマップ（ビットn = ノートn）
+        """
+        checkpoint = index // self.CHECKPOINT_INTERVAL
+        if checkpoint >= len(self.held_checkpoints):
+            checkpoint = len(self.held_checkpoints) - 1
+        if checkpoint < 0:
+            return 0
+
+        held = self.held_checkpoints[checkpoint]
+        for on_mask, off_mask in self.note_masks[checkpoint * self.CHECKPOINT_INTERVAL:index]:
+            held = (held & ~off_mask) | on_mask
+        return held
+
+    def start_state(self, offset_ns: int) -> Tuple[int, int]:
+        """
+        指定時刻から演奏を始める場合の最初のバースト番号と、演奏前に押下しておくノートを取得
+
+        指定時刻ちょうどのバーストはそこから送出されるため、そのバーストで解放される
+        ノートは押下しない（押下した直後に解放されるのを避ける）。
+
+        Args:
+            offset_ns: 演奏開始からの時刻（ナノ秒）
+
+        Returns:
+            Tuple[int, int]: (バースト番号, 押下中ノートのビットマップ)
+        """
+        index = self.index_at(offset_ns)
+        held = self.held_before(index)
+        if index < len(self.deadlines_ns) and self.deadlines_ns[index] == offset_ns:
+            held &= ~self.note_masks[index][1]
+        return index, held
+
+    def iter_loop(
+        self,
+        start_ns: int,
+        end_ns: int,
+        count: Optional[int] = None
+    ) -> Iterator[Burst]:
+        """
+        区間 [start_ns, end_ns) のバーストを繰り返し列挙
+
+        n周目（0始まり）の締め切りは元の締め切りに n * (end_ns - start_ns) を加えたもので、
+        シーケンスを再生成せずに拍の格子上で途切れなく繰り返される。
+        周回の境界では区間終端の押下状態を区間始端の押下状態に合わせるバーストを、
+        最後の周回の後には区間終端で押下中のノートを解放するバーストを挿入する。
+
+        Args:
+            start_ns: 区間の始端（演奏開始からのナノ秒）
+            end_ns: 区間の終端（演奏開始からのナノ秒）
+            count: 繰り返し回数（Noneの場合は無限）
+
+        Returns:
+            Iterator[Burst]: 締め切りを周回分ずらしたバースト
+
+        Raises:
+            ValueError: 区間や繰り返し回数が不正な場合、または区間にイベントがない場合
+        """
+        if start_ns < 0 or end_ns <= start_ns:
+            raise ValueError(f"Invalid loop region: {start_ns / 1e9}s - {end_ns / 1e9}s")
+        if count is not None and count < 1:
+            raise ValueError(f"Loop count must be at least 1, got {count}")
+
+        first, held_start = self.start_state(start_ns)
+        last = self.index_at(end_ns)
+        if first == last:
+            raise ValueError("Loop region contains no events")
+
+        held_end = self.held_before(last)
+        wrap = held_transition(held_end, held_start, self.channel)
+        wrap_masks = (held_start & ~held_end, held_end & ~held_start)
+        finish = held_transition(held_end, 0, self.channel)
+
+        return self._iter_loop(
+            first, last, start_ns, end_ns - start_ns, count,
+            (wrap, wrap_masks),
+            (finish, (0, held_end)),
+        )
+
+    def _iter_loop(
+        self,
+        first: int,
+        last: int,
+        start_ns: int,
+        length_ns: int,
+        count: Optional[int],
+        wrap: Tuple[Tuple[bytes, ...], Tuple[int, int]],
+        finish: Tuple[Tuple[bytes, ...], Tuple[int, int]]
+    ) -> Iterator[Burst]:
+        """iter_loopの本体（検証済みの引数で列挙）"""
+        deadlines_ns = self.deadlines_ns
+        bursts = self.bursts
+        note_masks = self.note_masks
+        cycles = itertools.count() if count is None else range(count)
+
+        base_ns = 0
+        for cycle in cycles:
+            if cycle and wrap[0]:
+                yield start_ns + base_ns, wrap[0], wrap[1]
+            for i in range(first, last):
+                yield deadlines_ns[i] + base_ns, bursts[i], note_masks[i]
+            base_ns += length_ns
+
+        if finish[0]:
+            yield start_ns + base_ns, finish[0], finish[1]
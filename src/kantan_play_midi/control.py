@@ -0,0 +1,127 @@
+"""
+演奏スレッドの制御コマンドモジュール
+"""
+from abc import ABC, abstractmethod
+from enum import Enum
+import queue
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from .scheduler import PrecisionScheduler
+
+
+class PlaybackState(Enum):
+    """演奏状態"""
+    STOPPED = "stopped"
+    PLAYING = "playing"
+    PAUSED = "paused"
+
+
+# (処理関数, 引数, 完了通知)
+_Command = Tuple[Callable[..., None], Tuple[Any, ...], threading.Event]
+
+
+class PlaybackController(ABC):
+    """制御コマンドを演奏スレッドで処理するプレイヤーの基底クラス
+
+    演奏中の制御はコマンドキューに積まれ、演奏スレッドが締め切り待ちの合間に処理する。
+    演奏状態を変更するのは演奏スレッドのみで、呼び出し元はコマンドの処理完了まで待機する。
+    演奏スレッドがない場合、コマンドは呼び出し元のスレッドで処理される。
+
+    サブクラスは _apply_pause / _apply_resume と、演奏が異常終了した場合に押下中の
+    ノートを解放する _abort_playback を実装し、演奏スレッドから _run_dispatch を呼び出す。
+    """
+
+    COMMAND_TIMEOUT = 1.0  # コマンドの処理完了を待つ最大時間（秒）
+
+    def __init__(self, spin_window: float = 0.002):
+        """
+        Args:
+            spin_window: イベント送出直前にスピン待機する時間幅（秒）
+        """
+        self._scheduler = PrecisionScheduler(spin_window)
+        self._playback_thread: Optional[threading.Thread] = None
+        self._state = PlaybackState.STOPPED
+        self._commands: "queue.SimpleQueue[_Command]" = queue.SimpleQueue()
+        self._control_lock = threading.Lock()
+        self._accepting_commands = False  # 演奏スレッドがコマンドを処理できる間True
+
+    @property
+    def scheduler(self) -> PrecisionScheduler:
+        """演奏スレッドが使用するスケジューラ（遅延記録を含む）"""
+        return self._scheduler
+
+    def get_state(self) -> PlaybackState:
+        """現在の演奏状態を取得"""
+        return self._state
+
+    def pause(self) -> None:
+        """演奏を一時停止"""
+        self._control(self._apply_pause)
+
+    def resume(self) -> None:
+        """演奏を再開"""
+        self._control(self._apply_resume)
+
+    def _control(self, handler: Callable[..., None], *args: Any) -> None:
+        """
+        制御コマンドを演奏スレッドで処理し、完了まで待機
+
+        演奏スレッドがない場合は呼び出し元のスレッドで処理する。
+        """
+        done = threading.Event()
+        with self._control_lock:
+            if not self._accepting_commands:
+                handler(*args)
+                return
+            self._commands.put((handler, args, done))
+            self._scheduler.wake()
+        done.wait(self.COMMAND_TIMEOUT)
+
+    def _service_commands(self) -> None:
+        """キューに積まれた制御コマンドを処理（演奏スレッドから呼び出す）"""
+        commands = self._commands
+        while not commands.empty():
+            handler, args, done = commands.get()
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"Error executing playback command: {e}")
+            finally:
+                done.set()
+
+    def _run_dispatch(self, dispatch: Callable[[], bool]) -> None:
+        """
+        送出処理を実行し、終了後のコマンドを呼び出し元で処理させる（演奏スレッドから呼び出す）
+
+        送出処理が例外で終了した場合は演奏を停止し、押下中のノートを解放する。
+
+        Args:
+            dispatch: 最後まで送出した場合にTrue、停止要求で中断した場合にFalseを返す送出処理
+        """
+        try:
+            if dispatch():
+                # 演奏完了
+                self._state = PlaybackState.STOPPED
+        except Exception as e:
+            # バーストの生成に失敗した場合などは演奏を停止し、押下中のノートを解放する
+            print(f"Error during playback: {e}")
+            self._state = PlaybackState.STOPPED
+            self._abort_playback()
+        finally:
+            # 以降のコマンドは呼び出し元で処理させる
+            with self._control_lock:
+                self._accepting_commands = False
+                self._service_commands()
+
+    @abstractmethod
+    def _apply_pause(self) -> None:
+        """一時停止コマンドの処理"""
+
+    @abstractmethod
+    def _apply_resume(self) -> None:
+        """再開コマンドの処理"""
+
+    @abstractmethod
+    def _abort_playback(self) -> None:
+        """演奏の異常終了時に押下中のノートを解放"""
@@ -0,0 +1,140 @@
+"""
+演奏メトリクスモジュール
+"""
+from bisect import bisect_left
+import json
+from typing import Any, Dict, List, Sequence
+
+
+# 遅延ヒストグラムのバケット上限（ナノ秒）
+DEFAULT_LATENESS_BUCKETS_NS = (
+    50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000,
+    25_000_000, 50_000_000, 100_000_000,
+)
+
+
+class PlaybackMetrics:
+    """演奏スレッドが更新する軽量なカウンタとヒストグラム
+
+    更新するのは演奏スレッドのみで、読み出し側は :meth:`snapshot` でロックを取らずに
+    その時点の値のコピーを得る。更新はバーストごとに整数加算と1回の二分探索のみで行う。
+    """
+
+    def __init__(self, lateness_buckets_ns: Sequence[int] = DEFAULT_LATENESS_BUCKETS_NS):
+        """
+        Args:
+            lateness_buckets_ns: 遅延ヒストグラムのバケット上限（ナノ秒, 昇順）
+        """
+        self.lateness_buckets_ns = tuple(lateness_buckets_ns)
+        self.reset()
+
+    def reset(self) -> None:
+        """すべての値をクリア"""
+        self.events_sent = 0
+        self.bytes_sent = 0
+        self.send_errors = 0
+        self.messages_failed = 0  # 送信に失敗したメッセージ数（送出したメッセージには含まない）
+        self.messages_missed = 0  # 出力の切断中に送出できなかったメッセージ数
+        self.reconnects = 0
+        self.max_loop_stall_ns = 0  # 締め切りからの最大遅延
+        self.pause_time_ns = 0
+        self.lateness_sum_ns = 0
+        # 最後の要素は上限を超えた遅延（+Inf）
+        self.lateness_counts: List[int] = [0] * (len(self.lateness_buckets_ns) + 1)
+
+    def observe_burst(self, lateness_ns: int, message_count: int, byte_count: int) -> None:
+        """
+        送出したバーストを記録（送信に失敗したメッセージは含めない）
+
+        Args:
+            lateness_ns: バースト送出開始時の締め切りからの遅延（ナノ秒）
+            message_count: 送出したメッセージ数
+            byte_count: 送出したバイト数
+        """
+        self.events_sent += message_count
+        self.bytes_sent += byte_count
+        self.lateness_counts[bisect_left(self.lateness_buckets_ns, lateness_ns)] += message_count
+        self.lateness_sum_ns += lateness_ns * message_count
+        if lateness_ns > self.max_loop_stall_ns:
+            self.max_loop_stall_ns = lateness_ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の値のスナップショットを取得（ロックなし）
+
+        Returns:
+            Dict[str, Any]: カウンタと遅延ヒストグラム（時間は秒単位）
+        """
+        counts = list(self.lateness_counts)
+        buckets = [bound / 1e9 for bound in self.lateness_buckets_ns] + [float("inf")]
+        return {
+            "events_sent": self.events_sent,
+            "bytes_sent": self.bytes_sent,
+            "send_errors": self.send_errors,
+            "messages_failed": self.messages_failed,
+            "messages_missed": self.messages_missed,
+            "reconnects": self.reconnects,
+            "max_loop_stall": self.max_loop_stall_ns / 1e9,
+            "pause_time": self.pause_time_ns / 1e9,
+            "lateness": {
+                "buckets": list(zip(buckets, counts)),
+                "sum": self.lateness_sum_ns / 1e9,
+                "count": sum(counts),
+            },
+        }
+
+    def to_json(self) -> str:
+        """スナップショットをJSON形式で出力"""
+        snapshot = self.snapshot()
+        snapshot["lateness"]["buckets"] = [
+            {"le": "+Inf" if bound == float("inf") else bound, "count": count}
+            for bound, count in snapshot["lateness"]["buckets"]
+        ]
+        return json.dumps(snapshot)
+
+    def to_prometheus(self, prefix: str = "kantan_play_midi") -> str:
+        """
+        スナップショットをPrometheusのテキスト形式で出力
+
+        Args:
+            prefix: メトリクス名の接頭辞
+
+        Returns:
+            str: Prometheusテキスト形式のメトリクス
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = [
+            ("events_sent_total", "MIDI messages sent", snapshot["events_sent"]),
+            ("bytes_sent_total", "MIDI bytes sent", snapshot["bytes_sent"]),
+            ("send_errors_total", "MIDI send errors", snapshot["send_errors"]),
+            ("messages_failed_total", "MIDI messages that failed to send",
+             snapshot["messages_failed"]),
+            ("messages_missed_total", "MIDI messages not sent while the output was lost",
+             snapshot["messages_missed"]),
+            ("reconnects_total", "Successful output reconnects", snapshot["reconnects"]),
+            ("pause_seconds_total", "Time spent paused", snapshot["pause_time"]),
+        ]
+        for name, help_text, value in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+
+        lines.append(f"# HELP {prefix}_max_loop_stall_seconds Largest dispatch lateness")
+        lines.append(f"# TYPE {prefix}_max_loop_stall_seconds gauge")
+        lines.append(f"{prefix}_max_loop_stall_seconds {snapshot['max_loop_stall']}")
+
+        name = f"{prefix}_lateness_seconds"
+        lines.append(f"# HELP {name} Dispatch lateness per MIDI message")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in snapshot["lateness"]["buckets"]:
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {snapshot['lateness']['sum']}")
+        lines.append(f"{name}_count {snapshot['lateness']['count']}")
+
+        return "\n".join(lines) + "\n"
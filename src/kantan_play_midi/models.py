@@ -2,7 +2,7 @@
 データモデルの定義
 """
 from dataclasses import dataclass
-from typing import List
+from typing import List, Union
 
 
 @dataclass
@@ -30,7 +30,7 @@ class Note:
 class Performance:
     """演奏データ全体を表すクラス"""
     slot: int
-    tempo: int
+    tempo: Union[int, float]
     notes: List[Note]
 
     def __post_init__(self) -> None:
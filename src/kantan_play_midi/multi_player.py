@@ -0,0 +1,218 @@
+"""
+複数ガジェットの同期演奏制御モジュール
+"""
+import heapq
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+from .exceptions import MIDIDeviceError
+from .backends import MIDIOutputBackend, RtMidiBackend
+from .sequence import RowSequence
+from .compiled import CompiledSequence
+from .control import PlaybackController, PlaybackState
+from .player import MIDIPlayer
+
+
+class MultiPortPlayer(PlaybackController):
+    """複数のMIDIポートを1つのクロックで同期演奏するクラス
+
+    ポートごとのシーケンスを締め切り順にマージし（ポートごとのカーソルをヒープで管理）、
+    1つの演奏スレッドと1つの単調クロックから全ポートへ送出する。
+    同じ締め切りのバーストは接続順のポートから送出される。
+    一時停止・再開・停止はMIDIPlayerと同じくコマンドキュー経由で演奏スレッドが処理する
+    （PlaybackController）。
+    """
+
+    def __init__(
+        self,
+        spin_window: float = 0.002,
+        fast_panic: bool = False,
+        backend_factory: Callable[[], MIDIOutputBackend] = RtMidiBackend
+    ):
+        """
+        Args:
+            spin_window: イベント送出直前にスピン待機する時間幅（秒）
+            fast_panic: 停止時にCC 123/CC 120で全ノートを解放する
+            backend_factory: ポートごとのMIDI出力バックエンドを生成する関数
+        """
+        super().__init__(spin_window)
+        self.fast_panic = fast_panic
+        self.backend_factory = backend_factory
+        self._outputs: Dict[str, MIDIPlayer] = {}
+        self._tracks: List[Tuple[MIDIPlayer, CompiledSequence]] = []
+        self._start_ns: int = 0
+        self._pause_ns: int = 0
+
+    @property
+    def ports(self) -> List[str]:
+        """接続中のMIDIポート名のリスト（接続順）"""
+        return list(self._outputs)
+
+    def connect(self, port_name: str) -> None:
+        """
+        MIDIポートを出力先として追加する
+
+        Args:
+            port_name: 接続するポート名
+
+        Raises:
+            MIDIDeviceError: 接続に失敗した場合
+        """
+        if port_name in self._outputs:
+            return
+
+        output = MIDIPlayer(port_name, fast_panic=self.fast_panic, backend=self.backend_factory())
+        output.connect(port_name)
+        self._outputs[port_name] = output
+
+    def disconnect(self) -> None:
+        """演奏を停止してすべてのMIDIポートから切断する"""
+        self.stop()
+        for output in self._outputs.values():
+            output.disconnect()
+        self._outputs.clear()
+
+    def play_sequences(
+        self,
+        assignments: Sequence[Tuple[str, Union[RowSequence, CompiledSequence]]]
+    ) -> None:
+        """
+        ポートごとのシーケンスの同期演奏を開始
+
+        Args:
+            assignments: (ポート名, 演奏するシーケンス) の組のリスト
+
+        Raises:
+            MIDIDeviceError: ポートが接続されていない場合、または既に演奏中の場合
+        """
+        if self._state == PlaybackState.PLAYING:
+            raise MIDIDeviceError("Already playing. Stop current playback first.")
+
+        tracks = []
+        for port_name, sequence in assignments:
+            output = self._outputs.get(port_name)
+            if output is None or not output.is_connected():
+                raise MIDIDeviceError(f"MIDI port '{port_name}' not connected")
+            if not isinstance(sequence, CompiledSequence):
+                sequence = CompiledSequence.from_sequence(sequence, output.channel, output.baud_rate)
+            tracks.append((output, sequence))
+
+        # 一時停止中の演奏は停止してから置き換え、停止済みの演奏スレッドの終了処理を待つ
+        if self._state == PlaybackState.PAUSED:
+            self.stop()
+        if self._playback_thread is not None:
+            self._playback_thread.join()
+
+        self._tracks = tracks
+        self._scheduler.reset()
+        self._state = PlaybackState.PLAYING
+        self._start_ns = self._scheduler.now_ns()
+        self._accepting_commands = True
+
+        self._playback_thread = threading.Thread(target=self._playback_worker)
+        self._playback_thread.daemon = True
+        self._playback_thread.start()
+
+    def stop(self) -> None:
+        """演奏を停止し、全ポートの押下中ノートを解放"""
+        self._control(self._apply_stop)
+
+        thread = self._playback_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self.COMMAND_TIMEOUT)
+
+        self._release_held_notes()
+
+    def _release_held_notes(self) -> None:
+        """全ポートの押下中ノートを解放"""
+        for output in self._outputs.values():
+            output.release_held_notes()
+
+    def _apply_pause(self) -> None:
+        """一時停止コマンドの処理"""
+        if self._state == PlaybackState.PLAYING:
+            self._pause_ns = self._scheduler.now_ns()
+            self._state = PlaybackState.PAUSED
+
+    def _apply_resume(self) -> None:
+        """再開コマンドの処理"""
+        if self._state == PlaybackState.PAUSED:
+            self._start_ns += self._scheduler.now_ns() - self._pause_ns
+            self._state = PlaybackState.PLAYING
+
+    def _apply_stop(self) -> None:
+        """停止コマンドの処理"""
+        self._state = PlaybackState.STOPPED
+
+    def get_current_time(self) -> float:
+        """現在の演奏時刻を取得（秒）"""
+        if self._state == PlaybackState.STOPPED:
+            return 0.0
+        elif self._state == PlaybackState.PAUSED:
+            return (self._pause_ns - self._start_ns) / 1e9
+        else:
+            return (self._scheduler.now_ns() - self._start_ns) / 1e9
+
+    def _playback_worker(self) -> None:
+        """演奏ワーカースレッド"""
+        self._run_dispatch(self._dispatch)
+
+    def _abort_playback(self) -> None:
+        """演奏の異常終了時に全ポートの押下中ノートを解放"""
+        self._release_held_notes()
+
+    def _dispatch(self) -> bool:
+        """
+        全トラックのバーストを締め切り順に送出
+
+        Returns:
+            bool: 最後まで送出した場合はTrue、停止要求で中断した場合はFalse
+        """
+        scheduler = self._scheduler
+        record_lateness = scheduler.record_lateness
+        service_commands = self._service_commands
+        commands = self._commands
+        tracks = self._tracks
+
+        # (締め切り, トラック番号, バースト番号) のヒープ
+        heap = [
+            (compiled.deadlines_ns[0], track_index, 0)
+            for track_index, (_, compiled) in enumerate(tracks)
+            if len(compiled)
+        ]
+        heapq.heapify(heap)
+
+        while heap:
+            offset_ns, track_index, burst_index = heap[0]
+            output, compiled = tracks[track_index]
+
+            # 締め切りまで待機（コマンドが積まれると起こされる）
+            while True:
+                if not commands.empty():
+                    service_commands()
+                if self._state == PlaybackState.STOPPED:
+                    return False
+                if self._state == PlaybackState.PAUSED:
+                    scheduler.idle(None)
+                    continue
+                deadline_ns = self._start_ns + offset_ns
+                if scheduler.wait_until(deadline_ns) and commands.empty():
+                    break
+
+            burst = compiled.bursts[burst_index]
+            try:
+                for _ in burst:
+                    record_lateness(deadline_ns)
+                output.send_burst(burst, compiled.note_masks[burst_index])
+            except Exception as e:
+                print(f"Error executing MIDI event on '{output.midi_port}': {e}")
+
+            # 同じトラックの次のバーストでカーソルを進める
+            burst_index += 1
+            if burst_index < len(compiled):
+                heapq.heapreplace(heap, (compiled.deadlines_ns[burst_index], track_index, burst_index))
+            else:
+                heapq.heappop(heap)
+
+        service_commands()
+        return self._state != PlaybackState.STOPPED
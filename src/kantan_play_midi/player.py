@@ -1,49 +1,112 @@
 """
 MIDI演奏制御モジュール
 """
-from typing import List, Optional, Dict, Any
+from collections import deque
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 import time
 import threading
-from enum import Enum
-
-import rtmidi
 
 from .exceptions import MIDIDeviceError
-from .sequence import PlaybackSequence, MIDIEvent, MIDIEventType
-
-
-class PlaybackState(Enum):
-    """演奏状態"""
-    STOPPED = "stopped"
-    PLAYING = "playing"
-    PAUSED = "paused"
-
-
-class MIDIPlayer:
-    """MIDI演奏を制御するクラス"""
-
-    def __init__(self, midi_port: Optional[str] = None):
+from .backends import MIDIOutputBackend, RtMidiBackend
+from .sequence import RowSequence, EventStream
+from .control import PlaybackController, PlaybackState
+from .compiled import (
+    CompiledSequence, Burst, byte_time_ns, held_transition, iter_bursts, iter_row_bursts
+)
+from .playlist import Playlist
+from .realtime import RealtimeConfig, RealtimeReport, apply_realtime
+from .metrics import PlaybackMetrics
+
+
+# 出力の切断中に送出できなかったイベントの扱い
+RECONNECT_POLICIES = ("drop", "catch_up")
+
+
+class MIDIPlayer(PlaybackController):
+    """MIDI演奏を制御するクラス
+
+    演奏中の制御（一時停止・再開・停止・位置移動・テンポ変更）はコマンドキューに積まれ、
+    演奏スレッドが締め切り待ちの合間に処理する（PlaybackController）。
+    制御の遅延は最大でスピン幅程度に収まる。
+    """
+
+    def __init__(
+        self,
+        midi_port: Optional[str] = None,
+        spin_window: float = 0.002,
+        fast_panic: bool = False,
+        backend: Optional[MIDIOutputBackend] = None,
+        release_on_pause: bool = False,
+        realtime: Optional[RealtimeConfig] = None,
+        baud_rate: Optional[int] = None,
+        reconnect: Optional[str] = None,
+        reconnect_backoff: Tuple[float, float] = (0.1, 5.0)
+    ):
         """
         Args:
             midi_port: 使用するMIDIポート名
+            spin_window: イベント送出直前にスピン待機する時間幅（秒）
+            fast_panic: 停止時に押下中ノートの個別解放の代わりに
+                CC 123 (All Notes Off) / CC 120 (All Sound Off) を送信する
+            backend: MIDI出力バックエンド（指定しない場合はrtmidiを使用）
+            release_on_pause: 一時停止中は押下中のノートを解放し、再開時に押下し直す
+            realtime: 演奏スレッドに適用するリアルタイム優先度・CPUアフィニティの設定
+            baud_rate: 出力先の伝送速度（ボー）。指定するとバースト内のメッセージを
+                伝送時間の間隔で送出する（DIN MIDIは31250）。Noneの場合は制限しない
+            reconnect: 演奏中に送信が失敗した場合の再接続方針。Noneの場合は再接続しない
+                "drop": 切断中のイベントは破棄し、切断前から押下中のノートだけを押下し直す
+                "catch_up": 切断中の押下状態の変化を反映し、現在押下中のノートをすべて押下する
+            reconnect_backoff: 再接続を試みる間隔の (初期値, 最大値)（秒、失敗ごとに倍増）
         """
+        super().__init__(spin_window)
         self.midi_port = midi_port
         self.channel = 0  # チャンネル1 (0-indexed)
-        self._midi_out: Optional[rtmidi.MidiOut] = None
-        self._playback_thread: Optional[threading.Thread] = None
-        self._state = PlaybackState.STOPPED
-        self._current_sequence: Optional[PlaybackSequence] = None
-        self._start_time: float = 0.0
-        self._pause_time: float = 0.0
-        self._stop_event = threading.Event()
+        self.fast_panic = fast_panic
+        self.release_on_pause = release_on_pause
+        self.realtime = realtime
+        self.baud_rate = baud_rate
+        self.reconnect = reconnect
+        self.reconnect_backoff = reconnect_backoff
+        self._byte_time_ns = byte_time_ns(baud_rate) if baud_rate is not None else 0
+        self.realtime_report: Optional[RealtimeReport] = None  # 直近の演奏スレッドへの適用結果
+        self._backend = backend if backend is not None else RtMidiBackend()
+        self._current_sequence: Optional[CompiledSequence] = None
+        self._start_ns: int = 0  # 演奏位置0に対応する単調時刻（ナノ秒）
+        self._pause_ns: int = 0
+        self._base_tempo: float = 0.0  # 演奏中のシーケンスの基準テンポ (BPM)
+        self._tempo_scale: float = 1.0  # 基準テンポでの時間を実時間に換算する倍率
+        self._held_notes = 0  # 押下中ノートのビットマップ（ビットn = ノートn）
+        self._paused_held = 0  # release_on_pauseで一時停止中に解放したノート
+        self._bursts: Iterator[Burst] = iter(())  # 演奏スレッドが送出中のバースト
+        self._output_lost = False  # 送信失敗から再接続までの間True
+        self._held_at_loss = 0  # 送信に失敗した時点で押下中だったノート
+        self._reconnect_thread: Optional[threading.Thread] = None
+        self._reconnect_cancel = threading.Event()
+        self.playback_cpu_time: float = 0.0  # 直近の演奏で演奏スレッドが消費したCPU時間（秒）
+        self.metrics = PlaybackMetrics()  # プレイヤーの生存期間を通して累積
+
+        # 属性をすべて初期化してから検証する（失敗時もデストラクタが動作するように）
+        if reconnect is not None and reconnect not in RECONNECT_POLICIES:
+            raise ValueError(f"reconnect must be one of {RECONNECT_POLICIES}, got {reconnect!r}")
+
+    @property
+    def backend(self) -> MIDIOutputBackend:
+        """MIDI出力バックエンド"""
+        return self._backend
+
+    @property
+    def start_ns(self) -> int:
+        """
+        演奏位置0に対応するスケジューラの単調時刻（ナノ秒）
+
+        締め切りはこの時刻からの相対時間で決まる。再開・位置移動・テンポ変更で付け替えられる。
+        """
+        return self._start_ns
 
     def get_available_ports(self) -> List[str]:
         """利用可能なMIDIポートのリストを取得"""
-        midi_out = rtmidi.MidiOut()
-        try:
-            return midi_out.get_ports()
-        finally:
-            midi_out.delete()
+        return self._backend.get_ports()
 
     def connect(self, port_name: Optional[str] = None) -> None:
         """
@@ -55,42 +118,19 @@ class MIDIPlayer:
         Raises:
             MIDIDeviceError: 接続に失敗した場合
         """
-        if self._midi_out is not None:
+        if self.is_connected():
             self.disconnect()
 
-        self._midi_out = rtmidi.MidiOut()
-        available_ports = self._midi_out.get_ports()
-
-        if not available_ports:
-            raise MIDIDeviceError("No MIDI output ports available")
-
-        # ポート選択
-        if port_name:
-            if port_name not in available_ports:
-                raise MIDIDeviceError(f"MIDI port '{port_name}' not found. Available: {available_ports}")
-            port_index = available_ports.index(port_name)
-            self.midi_port = port_name
-        else:
-            # 最初の利用可能ポートを使用
-            port_index = 0
-            self.midi_port = available_ports[0]
-
-        try:
-            self._midi_out.open_port(port_index)
-        except Exception as e:
-            raise MIDIDeviceError(f"Failed to open MIDI port: {e}")
+        self.midi_port = self._backend.open(port_name)
 
     def disconnect(self) -> None:
         """MIDIポートから切断する"""
         self.stop()
-        if self._midi_out is not None:
-            self._midi_out.close_port()
-            self._midi_out.delete()
-            self._midi_out = None
+        self._backend.close()
 
     def is_connected(self) -> bool:
         """MIDI接続状態を確認"""
-        return self._midi_out is not None and self._midi_out.is_port_open()
+        return self._backend.is_open()
 
     def send_note_on(self, note: int, velocity: int = 127) -> None:
         """
@@ -107,7 +147,11 @@ class MIDIPlayer:
             raise MIDIDeviceError("MIDI device not connected")
 
         note_on = [0x90 + self.channel, note & 0x7F, velocity & 0x7F]
-        self._midi_out.send_message(note_on)
+        self._backend.send_message(note_on)
+        if velocity & 0x7F:
+            self._held_notes |= 1 << (note & 0x7F)
+        else:
+            self._held_notes &= ~(1 << (note & 0x7F))
 
     def send_note_off(self, note: int) -> None:
         """
@@ -123,7 +167,8 @@ class MIDIPlayer:
             raise MIDIDeviceError("MIDI device not connected")
 
         note_off = [0x80 + self.channel, note & 0x7F, 0]
-        self._midi_out.send_message(note_off)
+        self._backend.send_message(note_off)
+        self._held_notes &= ~(1 << (note & 0x7F))
 
     def press_button(self, note: int, duration_ms: int = 50) -> None:
         """
@@ -137,128 +182,586 @@ class MIDIPlayer:
         time.sleep(duration_ms / 1000.0)
         self.send_note_off(note)
 
-    def play_sequence(self, sequence: PlaybackSequence) -> None:
+    def play_sequence(
+        self,
+        sequence: Union[RowSequence, CompiledSequence],
+        start_at: float = 0.0
+    ) -> None:
         """
         シーケンスの演奏を開始
         
+        コンパイル済みのシーケンスは位置の移動（seek）に使用される。コンパイルせずに
+        即座に演奏を始める場合（シーケンスファイルから読み込んだMappedSequenceなど）は
+        play_streamを使用する。
+
         Args:
-            sequence: 演奏するシーケンス
+            sequence: 演奏するシーケンス（CompiledSequence以外は演奏前にコンパイルされる）
+            start_at: 演奏を開始する位置（秒）。その時点で押下中のノートは
+                演奏開始前に押下される
             
         Raises:
             MIDIDeviceError: MIDI接続がない場合、または既に演奏中の場合
+            ValueError: start_atが負の場合
+        """
+        if start_at < 0:
+            raise ValueError(f"start_at must not be negative, got {start_at}")
+        self._check_can_play()
+
+        if not isinstance(sequence, CompiledSequence):
+            sequence = CompiledSequence.from_sequence(sequence, self.channel, self.baud_rate)
+
+        self._current_sequence = sequence
+        self._reset_clock(sequence.tempo)
+        self._start_compiled(sequence, int(start_at * 1_000_000_000))
+
+    def play_loop(
+        self,
+        sequence: Union[RowSequence, CompiledSequence],
+        loop_start: float = 0.0,
+        loop_end: Optional[float] = None,
+        count: Optional[int] = None
+    ) -> None:
+        """
+        シーケンスの区間を繰り返し演奏
+
+        コンパイル済みのシーケンスを再利用し、周回ごとに締め切りを区間長だけずらして
+        送出するため、周回の境界で間が空いたり再生成が発生したりしない。
+        演奏はloop_startの位置から始まり、演奏時刻は周回をまたいで増え続ける。
+
+        Args:
+            sequence: 演奏するシーケンス（CompiledSequence以外は演奏前にコンパイルされる）
+            loop_start: 区間の始端（秒）
+            loop_end: 区間の終端（秒）、Noneの場合はシーケンスの終端
+            count: 繰り返し回数、Noneの場合は停止するまで繰り返す
+
+        Raises:
+            MIDIDeviceError: MIDI接続がない場合、または既に演奏中の場合
+            ValueError: 区間や繰り返し回数が不正な場合、または区間にイベントがない場合
+        """
+        self._check_can_play()
+
+        if not isinstance(sequence, CompiledSequence):
+            sequence = CompiledSequence.from_sequence(sequence, self.channel, self.baud_rate)
+
+        start_ns = int(loop_start * 1_000_000_000)
+        end_ns = sequence.total_duration_ns if loop_end is None else int(loop_end * 1_000_000_000)
+        bursts = sequence.iter_loop(start_ns, end_ns, count)
+
+        # 繰り返し演奏中は位置の移動に対応しない
+        self._current_sequence = None
+        self._reset_clock(sequence.tempo)
+        self._start_playback(bursts, start_ns, sequence.start_state(start_ns)[1])
+
+    def seek(self, position: float) -> None:
+        """
+        演奏中のシーケンスの演奏位置を移動
+
+        移動先の位置は締め切り配列の二分探索で求め、移動先で押下されているべきノートとの
+        差分だけを送信してガジェットの状態を合わせる。一時停止中の場合は一時停止したまま
+        位置だけを移動する。
+
+        Args:
+            position: 移動先の位置（秒）
+
+        Raises:
+            MIDIDeviceError: play_sequenceで開始した演奏中でない場合
+            ValueError: positionが負の場合
         """
+        if position < 0:
+            raise ValueError(f"position must not be negative, got {position}")
+        if self._state == PlaybackState.STOPPED or self._current_sequence is None:
+            raise MIDIDeviceError("No seekable sequence is playing")
+
+        self._control(self._apply_seek, int(position * 1_000_000_000))
+
+    def play_stream(
+        self,
+        stream: Union[EventStream, RowSequence],
+        lookahead: int = 256
+    ) -> None:
+        """
+        遅延生成されるシーケンス、またはシーケンスをコンパイルせずに演奏を開始
+
+        イベントは演奏スレッドが先読みバッファ（最大lookaheadバースト）を満たす分だけ
+        逐次エンコードされるため、曲の長さにかかわらず演奏開始までの時間と
+        メモリ使用量は一定になる。EventStream以外のシーケンスはiter_rows()の行から
+        エンコードするため、MappedSequenceはマップしたイベント表から直接演奏される。
+
+        Args:
+            stream: 演奏するイベントストリームまたはシーケンス
+            lookahead: 先読みするバースト数
+
+        Raises:
+            MIDIDeviceError: MIDI接続がない場合、または既に演奏中の場合
+        """
+        if lookahead < 1:
+            raise ValueError(f"lookahead must be at least 1, got {lookahead}")
+        self._check_can_play()
+
+        if isinstance(stream, EventStream):
+            bursts = iter_bursts(stream.events, self.channel)
+        else:
+            bursts = iter_row_bursts(stream.iter_rows(), self.channel)
+
+        self._current_sequence = None
+        self._reset_clock(stream.tempo)
+        self._start_playback(_lookahead(bursts, lookahead))
+
+    def play_playlist(self, playlist: Playlist) -> None:
+        """
+        プレイリストの全曲を途切れなく連続演奏
+
+        最初の曲はここでコンパイルし、以降の曲は演奏中にバックグラウンドで
+        コンパイルされて同じクロック上に連結される。テンポ変更はプレイリスト全体に
+        最初の曲のテンポとの比で適用される。
+
+        Args:
+            playlist: 演奏するプレイリスト
+
+        Raises:
+            MIDIDeviceError: MIDI接続がない場合、または既に演奏中の場合
+            ValueError: プレイリストが空の場合
+        """
+        self._check_can_play()
+        if not len(playlist):
+            raise ValueError("Playlist is empty")
+
+        first = playlist.compile(0, self.channel, self.baud_rate)
+        bursts = playlist.iter_bursts(self.channel, first, self.baud_rate)
+
+        self._current_sequence = None
+        self._reset_clock(first.tempo)
+        self._start_playback(bursts)
+
+    def _check_can_play(self) -> None:
+        """演奏を開始できる状態かを確認"""
         if not self.is_connected():
             raise MIDIDeviceError("MIDI device not connected")
 
         if self._state == PlaybackState.PLAYING:
             raise MIDIDeviceError("Already playing. Stop current playback first.")
 
-        self._current_sequence = sequence
+        # 一時停止中の演奏は停止してから置き換える
+        if self._state == PlaybackState.PAUSED:
+            self.stop()
+
+        # 停止済みの演奏スレッドの終了処理を待つ
+        if self._playback_thread is not None:
+            self._playback_thread.join()
+
+    def set_tempo(self, tempo: float) -> None:
+        """
+        演奏中のテンポを変更
+
+        シーケンスを再コンパイルせず、現在の演奏位置を基準に演奏位置と実時間の
+        対応だけを付け替える（O(1)）。変更は次のイベントの締め切りから反映される。
+
+        コンパイル済みのバーストは拍位置に固定されたノートオフと押下時間後のノートオフを
+        区別しないため、ボタンの押下時間（SLOT_PRESS_DURATION、DEGREE_PRESS_DURATION）も
+        テンポの比で伸縮する（基準テンポ120のシーケンスを600で演奏すると50msの押下は10ms）。
+        押下時間を保つ必要がある場合は、新しいテンポで生成し直したシーケンスを演奏する。
+
+        Args:
+            tempo: 新しいテンポ (BPM)
+
+        Raises:
+            MIDIDeviceError: 演奏中でない場合
+            ValueError: テンポが正でない場合
+        """
+        if tempo <= 0:
+            raise ValueError(f"Tempo must be positive, got {tempo}")
+        if self._state == PlaybackState.STOPPED:
+            raise MIDIDeviceError("No sequence is playing")
+
+        self._control(self._apply_tempo, tempo)
+
+    def get_tempo(self) -> float:
+        """現在の演奏テンポを取得 (BPM)"""
+        if not self._base_tempo:
+            return 0.0
+        return self._base_tempo / self._tempo_scale
+
+    def _reset_clock(self, tempo: float) -> None:
+        """演奏開始前にスケジューラとテンポを初期化"""
+        self._scheduler.reset()
+        self._base_tempo = tempo
+        self._tempo_scale = 1.0
+
+    def _start_compiled(self, compiled: CompiledSequence, offset_ns: int) -> None:
+        """コンパイル済みシーケンスを指定位置から演奏"""
+        index, held = compiled.start_state(offset_ns)
+        self._start_playback(compiled.iter_bursts(index), offset_ns, held)
+
+    def _start_playback(
+        self,
+        bursts: Iterable[Burst],
+        offset_ns: int = 0,
+        held: Optional[int] = None
+    ) -> None:
+        """
+        演奏スレッドを開始
+
+        Args:
+            bursts: 送出するバースト
+            offset_ns: 演奏開始位置（ナノ秒）
+            held: 演奏開始前に押下状態を合わせるノートのビットマップ
+        """
+        self._start_ns = self._scheduler.now_ns() - int(offset_ns * self._tempo_scale)
         self._state = PlaybackState.PLAYING
-        self._start_time = time.time()
-        self._stop_event.clear()
+        self._bursts = iter(bursts)
+        self._accepting_commands = True
+        self._output_lost = False
+        self._reconnect_cancel.clear()
 
         # 演奏スレッドを開始
-        self._playback_thread = threading.Thread(target=self._playback_worker)
+        self._playback_thread = threading.Thread(target=self._playback_worker, args=(held,))
         self._playback_thread.daemon = True
         self._playback_thread.start()
 
-    def pause(self) -> None:
-        """演奏を一時停止"""
-        if self._state == PlaybackState.PLAYING:
-            self._state = PlaybackState.PAUSED
-            self._pause_time = time.time()
+    def stop(self) -> None:
+        """演奏を停止し、押下中のノートを解放"""
+        self._control(self._apply_stop)
+        self._reconnect_cancel.set()
 
-    def resume(self) -> None:
-        """演奏を再開"""
-        if self._state == PlaybackState.PAUSED:
-            # 一時停止していた時間分だけ開始時刻を調整
-            pause_duration = time.time() - self._pause_time
-            self._start_time += pause_duration
-            self._state = PlaybackState.PLAYING
+        thread = self._playback_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self.COMMAND_TIMEOUT)
 
-    def stop(self) -> None:
-        """演奏を停止"""
-        if self._state != PlaybackState.STOPPED:
-            self._state = PlaybackState.STOPPED
-            self._stop_event.set()
-            
-            if self._playback_thread and self._playback_thread.is_alive():
-                self._playback_thread.join(timeout=1.0)
+        self.release_held_notes()
 
-            # 全ノートオフ
-            self._send_all_notes_off()
+    def _apply_pause(self) -> None:
+        """一時停止コマンドの処理"""
+        if self._state != PlaybackState.PLAYING:
+            return
+        self._pause_ns = self._scheduler.now_ns()
+        self._state = PlaybackState.PAUSED
+        if self.release_on_pause:
+            self._paused_held = self._held_notes
+            self._restore_held_notes(0)
+
+    def _apply_resume(self) -> None:
+        """再開コマンドの処理"""
+        if self._state != PlaybackState.PAUSED:
+            return
+        if self.release_on_pause:
+            self._restore_held_notes(self._paused_held)
+            self._paused_held = 0
+        # 一時停止していた時間分だけ開始時刻を調整
+        pause_duration = self._scheduler.now_ns() - self._pause_ns
+        self._start_ns += pause_duration
+        self.metrics.pause_time_ns += pause_duration
+        self._state = PlaybackState.PLAYING
 
-    def get_state(self) -> PlaybackState:
-        """現在の演奏状態を取得"""
-        return self._state
+    def _apply_stop(self) -> None:
+        """停止コマンドの処理"""
+        self._state = PlaybackState.STOPPED
+        self._paused_held = 0
+
+    def _apply_seek(self, offset_ns: int) -> None:
+        """位置移動コマンドの処理"""
+        compiled = self._current_sequence
+        if self._state == PlaybackState.STOPPED or compiled is None:
+            return
+
+        index, held = compiled.start_state(offset_ns)
+        paused = self._state == PlaybackState.PAUSED
+
+        # 一時停止中は一時停止した時点を基準にする
+        now_ns = self._pause_ns if paused else self._scheduler.now_ns()
+        self._start_ns = now_ns - int(offset_ns * self._tempo_scale)
+        if paused and self.release_on_pause:
+            self._paused_held = held
+        else:
+            self._restore_held_notes(held)
+        self._bursts = compiled.iter_bursts(index)
+
+    def _apply_tempo(self, tempo: float) -> None:
+        """テンポ変更コマンドの処理"""
+        if self._state == PlaybackState.STOPPED:
+            return
+
+        now_ns = self._pause_ns if self._state == PlaybackState.PAUSED else self._scheduler.now_ns()
+        position_ns = (now_ns - self._start_ns) / self._tempo_scale
+        self._tempo_scale = self._base_tempo / tempo
+        self._start_ns = now_ns - int(position_ns * self._tempo_scale)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        演奏の完了（または停止）まで待機
+
+        Args:
+            timeout: 最大待機時間（秒）、Noneの場合は無制限
+
+        Returns:
+            bool: 演奏スレッドが終了している場合はTrue
+        """
+        thread = self._playback_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def get_held_notes(self) -> List[int]:
+        """現在押下中のMIDIノートナンバーのリストを取得"""
+        held = self._held_notes
+        return [note for note in range(128) if held >> note & 1]
 
     def get_current_time(self) -> float:
-        """現在の演奏時刻を取得（秒）"""
+        """現在の演奏位置を取得（シーケンスの基準テンポでの秒）"""
         if self._state == PlaybackState.STOPPED:
             return 0.0
         elif self._state == PlaybackState.PAUSED:
-            return self._pause_time - self._start_time
+            return (self._pause_ns - self._start_ns) / self._tempo_scale / 1e9
         else:
-            return time.time() - self._start_time
+            return (self._scheduler.now_ns() - self._start_ns) / self._tempo_scale / 1e9
 
-    def _playback_worker(self) -> None:
+    def _playback_worker(self, held: Optional[int] = None) -> None:
         """演奏ワーカースレッド"""
-        if not self._current_sequence:
-            return
+        if self.realtime is not None:
+            self.realtime_report = apply_realtime(self.realtime)
+
+        def dispatch() -> bool:
+            if held is not None:
+                self._restore_held_notes(held)
+            return self._dispatch()
+
+        cpu_start_ns = time.thread_time_ns()
+        try:
+            self._run_dispatch(dispatch)
+        finally:
+            self.playback_cpu_time = (time.thread_time_ns() - cpu_start_ns) / 1e9
+
+    def _abort_playback(self) -> None:
+        """演奏の異常終了時に押下中のノートを解放"""
+        self._paused_held = 0
+        self.release_held_notes()
 
-        event_index = 0
-        events = self._current_sequence.events
+    def _dispatch(self) -> bool:
+        """
+        バーストを締め切りに合わせて送出
 
-        while (event_index < len(events) and 
-               not self._stop_event.is_set() and 
-               self._state != PlaybackState.STOPPED):
+        締め切りを待つ間に制御コマンドを処理する。一時停止中はwake()まで
+        スピンせずに眠る。位置移動コマンドは送出中のバースト列を差し替える。
 
-            # 一時停止中は待機
-            if self._state == PlaybackState.PAUSED:
-                time.sleep(0.01)
+        baud_rateが指定されている場合、各メッセージは伝送路が空く時刻（前のメッセージの
+        送出予定時刻に伝送時間を加えた時刻）と締め切りの遅い方で送出する。送出予定は
+        締め切りだけから決まるため、到着時刻は実行時の揺らぎによらず一定になる。
+
+        Returns:
+            bool: 最後まで送出した場合はTrue、停止要求で中断した場合はFalse
+        """
+        scheduler = self._scheduler
+        now_ns = scheduler.now_ns
+        record_lateness = scheduler.record_lateness
+        send_message = self._backend.send_message
+        service_commands = self._service_commands
+        commands = self._commands
+        metrics = self.metrics
+        per_byte_ns = self._byte_time_ns
+        link_free_ns = 0  # 伝送路が空く予定時刻（帯域制限時のみ使用）
+
+        while True:
+            bursts = self._bursts
+            entry = next(bursts, None)
+            if entry is None:
+                service_commands()
+                if self._bursts is bursts:
+                    return self._state != PlaybackState.STOPPED
+                continue
+            offset_ns, burst, (on_mask, off_mask) = entry
+
+            # バーストの締め切りまで待機（コマンドが積まれると起こされる）
+            while True:
+                if not commands.empty():
+                    service_commands()
+                if self._state == PlaybackState.STOPPED:
+                    return False
+                if self._bursts is not bursts:
+                    break
+                if self._state == PlaybackState.PAUSED:
+                    scheduler.idle(None)
+                    continue
+                deadline_ns = self._start_ns + int(offset_ns * self._tempo_scale)
+                if scheduler.wait_until(deadline_ns) and commands.empty():
+                    break
+
+            if self._bursts is not bursts:
+                # 位置移動で差し替えられたバースト列から続ける
                 continue
 
-            event = events[event_index]
-            current_time = self.get_current_time()
+            if self._output_lost:
+                # 再接続まではクロックだけを進め、押下状態は論理的に追跡する
+                metrics.messages_missed += len(burst)
+                self._held_notes = (self._held_notes & ~off_mask) | on_mask
+                continue
 
-            # イベントの時刻になったら実行
-            if current_time >= event.timestamp:
-                try:
-                    self._execute_event(event)
-                except Exception as e:
+            lateness_ns = now_ns() - deadline_ns
+            sent = 0
+            try:
+                if per_byte_ns:
+                    for message in burst:
+                        send_ns = deadline_ns if deadline_ns > link_free_ns else link_free_ns
+                        while not scheduler.wait_until(send_ns):
+                            pass
+                        record_lateness(send_ns)
+                        send_message(message)
+                        sent += 1
+                        link_free_ns = send_ns + len(message) * per_byte_ns
+                else:
+                    for message in burst:
+                        record_lateness(deadline_ns)
+                        send_message(message)
+                        sent += 1
+                self._held_notes = (self._held_notes & ~off_mask) | on_mask
+            except Exception as e:
+                metrics.send_errors += 1
+                metrics.messages_failed += len(burst) - sent
+                if self.reconnect is None:
                     print(f"Error executing MIDI event: {e}")
-                
-                event_index += 1
-            else:
-                # 少し待機してから再チェック
-                time.sleep(0.001)
+                else:
+                    self._on_output_lost(e)
+                    self._held_notes = (self._held_notes & ~off_mask) | on_mask
 
-        # 演奏完了
-        self._state = PlaybackState.STOPPED
+            # 送出できたメッセージだけを記録する（コンパイル済みのメッセージはすべて3バイト）
+            if sent:
+                metrics.observe_burst(lateness_ns, sent, 3 * sent)
 
-    def _execute_event(self, event: MIDIEvent) -> None:
-        """MIDIイベントを実行"""
-        if event.event_type == MIDIEventType.NOTE_ON:
-            self.send_note_on(event.note, event.velocity)
-        elif event.event_type == MIDIEventType.NOTE_OFF:
-            self.send_note_off(event.note)
-        elif event.event_type == MIDIEventType.SLOT_PRESS:
-            # スロット選択は短時間の押下
-            self.press_button(event.note, int(event.duration * 1000) if event.duration else 50)
-
-    def _send_all_notes_off(self) -> None:
-        """全ノートオフメッセージを送信"""
-        if not self.is_connected():
+    def _on_output_lost(self, error: Exception) -> None:
+        """送信の失敗を検出し、バックグラウンドでの再接続を開始（演奏スレッドから呼び出す）"""
+        if self._output_lost:
             return
+        print(f"MIDI output lost, reconnecting: {error}")
+        self._output_lost = True
+        self._held_at_loss = self._held_notes
+        self._reconnect_thread = threading.Thread(target=self._reconnect_worker)
+        self._reconnect_thread.daemon = True
+        self._reconnect_thread.start()
+
+    def _reconnect_worker(self) -> None:
+        """失敗した接続を破棄し、バックオフしながらポートを開き直す"""
+        delay, max_delay = self.reconnect_backoff
+        try:
+            self._backend.discard()
+        except Exception as e:
+            print(f"Error discarding MIDI output: {e}")
 
-        # すべてのノートをオフ
-        for note in range(128):
+        while not self._reconnect_cancel.is_set():
             try:
-                self.send_note_off(note)
-            except:
-                pass  # エラーは無視
+                self.midi_port = self._backend.open(self.midi_port)
+            except Exception:
+                if self._reconnect_cancel.wait(delay):
+                    return
+                delay = min(delay * 2, max_delay)
+                continue
+
+            if self._reconnect_cancel.is_set():
+                # 開いている間に停止された場合は、開き直したポートを使わずに閉じる
+                self._backend.close()
+                return
+            self._control(self._apply_reconnected)
+            return
+
+    def _apply_reconnected(self) -> None:
+        """再接続コマンドの処理（方針に従って押下状態を戻し、送出を再開）"""
+        if not self._output_lost:
+            return
+        self._output_lost = False
+        self.metrics.reconnects += 1
+
+        # 開き直したポートでは何も押下されていないものとして扱う
+        if self._state == PlaybackState.STOPPED:
+            self._held_notes = 0
+            return
+        if self.reconnect == "catch_up":
+            held = self._held_notes
+        else:
+            held = self._held_notes & self._held_at_loss
+        self._held_notes = 0
+        if self._state == PlaybackState.PAUSED and self.release_on_pause:
+            self._paused_held = held
+            return
+        self._restore_held_notes(held)
+
+    def _restore_held_notes(self, held: int) -> None:
+        """
+        押下中のノートを指定のビットマップに合わせる
+
+        現在の押下状態との差分だけを送信する（解放を先に送信）。
+        """
+        send_message = self._backend.send_message
+        try:
+            for message in held_transition(self._held_notes, held, self.channel):
+                send_message(message)
+            self._held_notes = held
+        except Exception as e:
+            self.metrics.send_errors += 1
+            print(f"Error restoring held notes: {e}")
+
+    def send_burst(self, burst: Tuple[bytes, ...], masks: Tuple[int, int]) -> None:
+        """
+        コンパイル済みのバーストを即座に送出し、押下状態を更新
+
+        他のプレイヤーが締め切りを管理してこのポートへ送出する場合に使用する。
+
+        Args:
+            burst: 送出するメッセージ
+            masks: バーストで押下・解放されるノートのビットマップ (on_mask, off_mask)
+
+        Raises:
+            Exception: 送信に失敗した場合（押下状態は更新されない）
+        """
+        send_message = self._backend.send_message
+        for message in burst:
+            send_message(message)
+        on_mask, off_mask = masks
+        self._held_notes = (self._held_notes & ~off_mask) | on_mask
+
+    def release_held_notes(self) -> None:
+        """
+        押下中のノートを解放
+
+        押下中のノートだけにノートオフを送信する。fast_panicが有効な場合は
+        CC 123 (All Notes Off) と CC 120 (All Sound Off) の2メッセージのみを送信する。
+        """
+        held = self._held_notes
+        self._held_notes = 0
+
+        if not self.is_connected():
+            return
+
+        send_message = self._backend.send_message
+        try:
+            if self.fast_panic:
+                send_message([0xB0 + self.channel, 123, 0])
+                send_message([0xB0 + self.channel, 120, 0])
+                return
+
+            note_off_status = 0x80 + self.channel
+            while held:
+                lowest = held & -held
+                send_message([note_off_status, lowest.bit_length() - 1, 0])
+                held ^= lowest
+        except Exception as e:
+            print(f"Error releasing held notes: {e}")
 
     def __del__(self):
         """デストラクタ"""
-        self.disconnect()
\ No newline at end of file
+        self.disconnect()
+
+
+def _lookahead(bursts: Iterator[Burst], size: int) -> Iterator[Burst]:
+    """
+    バーストを先読みバッファ経由で出力
+
+    バッファは呼び出した時点で満たすため、最初のバーストのエンコードは演奏開始時刻を
+    決める前に終わる。以降はバーストを1つ渡すたびに（送出後、次の締め切りを待つ前に）
+    バッファを補充するため、エンコード処理は送出の合間の待ち時間に行われる。
+    """
+    buffer = deque(itertools.islice(bursts, size))
+
+    def drain() -> Iterator[Burst]:
+        while buffer:
+            yield buffer.popleft()
+            buffer.extend(itertools.islice(bursts, size - len(buffer)))
+
+    return drain()
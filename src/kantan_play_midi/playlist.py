@@ -0,0 +1,178 @@
+"""
+プレイリスト（連続演奏）モジュール
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from .models import Performance
+from .input_handler import InputHandler
+from .processor import PerformanceProcessor
+from .sequence import PlaybackSequence, ColumnarSequence
+from .compiled import Burst, CompiledSequence, held_transition
+from .sequence_file import SEQUENCE_FILE_SUFFIX, load_sequence
+
+
+PlaylistItem = Union[Path, Performance, PlaybackSequence, ColumnarSequence, CompiledSequence]
+
+
+class Playlist:
+    """複数の演奏を同じクロック上で途切れなく連続演奏するためのプレイリスト
+
+    演奏中の曲を送出している間に、次の曲の読み込み（JSON解析）・シーケンス生成・
+    コンパイルをバックグラウンドのスレッドで行う。次の曲のバーストは現在の曲の
+    total_duration（と曲間のgap）の位置に締め切りをずらして連結されるため、
+    曲の切り替わりで演奏スレッドが停止したり、クロックが途切れたりしない。
+
+    演奏中に add() で曲を追加することもできる。読み込みやコンパイルに失敗した曲は
+    飛ばして次の曲を同じ位置から連結し、その番号を skipped に記録する。
+    """
+
+    def __init__(self, processor: Optional[PerformanceProcessor] = None, gap: float = 0.0):
+        """
+        Args:
+            processor: 演奏データ（JSONファイル、Performance）のシーケンス生成に使用するプロセッサ
+            gap: 曲間の無音時間（秒）
+        """
+        if gap < 0:
+            raise ValueError(f"gap must not be negative, got {gap}")
+        self.processor = processor
+        self.gap = gap
+        self.items: List[PlaylistItem] = []
+        self.current_index: int = -1  # 演奏中の曲の番号（演奏前は-1）
+        self.skipped: List[int] = []  # 直近の演奏で読み込み・コンパイルに失敗して飛ばした曲の番号
+        self._input_handler = InputHandler()
+
+    def __len__(self) -> int:
+        """曲数"""
+        return len(self.items)
+
+    def add(self, item: PlaylistItem) -> None:
+        """
+        曲を末尾に追加
+
+        Args:
+            item: JSONファイルまたはシーケンスファイル（.kpseq）のパス、演奏データ、
+                またはシーケンス
+
+        Raises:
+            ValueError: 演奏データの追加にプロセッサが指定されていない場合
+        """
+        needs_processor = isinstance(item, Performance) or (
+            isinstance(item, Path) and item.suffix != SEQUENCE_FILE_SUFFIX
+        )
+        if needs_processor and self.processor is None:
+            raise ValueError("A PerformanceProcessor is required to add performances")
+        self.items.append(item)
+
+    def compile(
+        self,
+        index: int,
+        channel: int = 0,
+        baud_rate: Optional[int] = None
+    ) -> CompiledSequence:
+        """
+        指定した曲を読み込んでコンパイル
+
+        Args:
+            index: 曲の番号
+            channel: 送出するMIDIチャンネル (0-15)
+            baud_rate: 伝送帯域の検査に使う伝送速度（ボー）、Noneの場合は検査しない
+
+        Returns:
+            CompiledSequence: コンパイル済みシーケンス
+        """
+        item = self.items[index]
+
+        if isinstance(item, CompiledSequence):
+            return item
+        if isinstance(item, Path) and item.suffix == SEQUENCE_FILE_SUFFIX:
+            with load_sequence(item) as sequence:
+                return CompiledSequence.from_sequence(sequence, channel, baud_rate)
+        if isinstance(item, Path):
+            item = self._input_handler.load_from_file(item)
+            self._input_handler.validate_performance(item)
+        if isinstance(item, Performance):
+            if self.processor is None:
+                raise ValueError("A PerformanceProcessor is required to add performances")
+            item = self.processor.process_performance(item)
+        return CompiledSequence.from_sequence(item, channel, baud_rate)
+
+    def iter_bursts(
+        self,
+        channel: int = 0,
+        first: Optional[CompiledSequence] = None,
+        baud_rate: Optional[int] = None
+    ) -> Iterator[Burst]:
+        """
+        全曲のバーストを1つのタイムラインに連結して列挙
+
+        各曲の締め切りは、それまでの曲のtotal_durationとgapの合計だけずらされる。
+        曲の終端で押下中のノートは次の曲の前に解放する。2曲目以降で読み込みや
+        コンパイルに失敗した曲は飛ばす（skippedに記録する）。
+
+        Args:
+            channel: 送出するMIDIチャンネル (0-15)
+            first: コンパイル済みの最初の曲（指定しない場合はここでコンパイルする）
+            baud_rate: 伝送帯域の検査に使う伝送速度（ボー）、Noneの場合は検査しない
+
+        Returns:
+            Iterator[Burst]: 連結したバースト
+
+        Raises:
+            ValueError: プレイリストが空の場合
+        """
+        if not self.items:
+            raise ValueError("Playlist is empty")
+        if first is None:
+            first = self.compile(0, channel, baud_rate)
+        return self._iter_bursts(first, channel, baud_rate)
+
+    def _iter_bursts(
+        self,
+        compiled: CompiledSequence,
+        channel: int,
+        baud_rate: Optional[int]
+    ) -> Iterator[Burst]:
+        """iter_burstsの本体（次の曲をバックグラウンドでコンパイルしながら列挙）"""
+        executor = ThreadPoolExecutor(max_workers=1)
+        gap_ns = int(self.gap * 1_000_000_000)
+        base_ns = 0
+        index = 0
+        self.skipped = []
+
+        try:
+            while True:
+                self.current_index = index
+                pending: Optional[Future] = None
+                if index + 1 < len(self.items):
+                    pending = executor.submit(self.compile, index + 1, channel, baud_rate)
+
+                for deadline_ns, burst, masks in compiled.iter_bursts():
+                    yield deadline_ns + base_ns, burst, masks
+
+                end_ns = base_ns + compiled.total_duration_ns
+                held = compiled.held_before(len(compiled))
+                if held:
+                    yield end_ns, held_transition(held, 0, channel), (0, held)
+                base_ns = end_ns + gap_ns
+
+                index += 1
+                next_compiled: Optional[CompiledSequence] = None
+                while next_compiled is None and index < len(self.items):
+                    try:
+                        if pending is not None:
+                            next_compiled = pending.result()
+                        else:
+                            # 演奏中に追加された曲、または失敗した曲の次の曲
+                            next_compiled = self.compile(index, channel, baud_rate)
+                    except Exception as e:
+                        print(f"Skipping playlist item {index}: {e}")
+                        self.skipped.append(index)
+                        index += 1
+                    pending = None
+                if next_compiled is None:
+                    return
+                compiled = next_compiled
+        finally:
+            executor.shutdown(wait=False)
@@ -0,0 +1,197 @@
+"""
+MIDI出力ポート管理モジュール
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import rtmidi
+
+from .exceptions import MIDIDeviceError
+
+
+class PortManager:
+    """プロセス全体で共有するMIDI出力ポートの管理
+
+    ポートの列挙結果はcache_ttl秒の間キャッシュし、列挙のたびにMidiOutを生成・破棄しない。
+    再列挙で結果が変わった場合はgenerationを進め、消えたポートの未使用ハンドルを閉じる。
+
+    開いたMidiOutハンドルはポート名ごとに参照カウント付きでプールされ、複数のプレイヤーや
+    繰り返しの演奏で共有される。参照がなくなったハンドルもkeep_idleが有効な間は開いたまま
+    保持されるため、同じガジェットへの再接続ではポートを開く処理が発生しない。
+    """
+
+    def __init__(self, cache_ttl: float = 1.0, keep_idle: bool = True):
+        """
+        Args:
+            cache_ttl: ポート列挙結果をキャッシュする時間（秒）
+            keep_idle: 参照がなくなったハンドルを閉じずにプールしておく
+        """
+        self.cache_ttl = cache_ttl
+        self.keep_idle = keep_idle
+        self.generation = 0  # ポート構成の変化を検出するたびに増える
+        self._lock = threading.RLock()
+        self._probe: Optional[rtmidi.MidiOut] = None  # 列挙専用のMidiOut
+        self._ports: Optional[List[str]] = None
+        self._enumerated_at = 0.0
+        self._handles: Dict[str, List] = {}  # ポート名 -> [MidiOut, 参照数]
+
+    def get_ports(self, refresh: bool = False) -> List[str]:
+        """
+        利用可能なMIDI出力ポートのリストを取得
+
+        Args:
+            refresh: キャッシュを使わずに再列挙する
+
+        Returns:
+            List[str]: ポート名のリスト
+        """
+        with self._lock:
+            now = time.monotonic()
+            ports = self._ports
+            if refresh or ports is None or now - self._enumerated_at >= self.cache_ttl:
+                if self._probe is None:
+                    self._probe = rtmidi.MidiOut()
+                ports = list(self._probe.get_ports())
+                self._enumerated_at = now
+                if ports != self._ports:
+                    self._on_ports_changed(ports)
+            return list(ports)
+
+    def acquire(self, port_name: Optional[str] = None) -> Tuple[str, rtmidi.MidiOut]:
+        """
+        MIDI出力ポートのハンドルを取得（参照数を1増やす）
+
+        Args:
+            port_name: ポート名（指定しない場合は最初の利用可能ポート）
+
+        Returns:
+            Tuple[str, rtmidi.MidiOut]: (実際のポート名, 開いているハンドル)
+
+        Raises:
+            MIDIDeviceError: ポートが見つからない場合、または開けなかった場合
+        """
+        with self._lock:
+            if port_name is not None:
+                entry = self._handles.get(port_name)
+                if entry is not None and entry[0].is_port_open():
+                    entry[1] += 1
+                    return port_name, entry[0]
+
+            available_ports = self.get_ports()
+            if port_name is not None and port_name not in available_ports:
+                # キャッシュが古い可能性があるため再列挙して確認
+                available_ports = self.get_ports(refresh=True)
+
+            if not available_ports:
+                raise MIDIDeviceError("No MIDI output ports available")
+
+            # ポート選択
+            if port_name:
+                if port_name not in available_ports:
+                    raise MIDIDeviceError(
+                        f"MIDI port '{port_name}' not found. Available: {available_ports}"
+                    )
+                port_index = available_ports.index(port_name)
+            else:
+                # 最初の利用可能ポートを使用
+                port_index = 0
+                port_name = available_ports[0]
+
+            entry = self._handles.get(port_name)
+            if entry is not None and entry[0].is_port_open():
+                entry[1] += 1
+                return port_name, entry[0]
+
+            midi_out = rtmidi.MidiOut()
+            try:
+                midi_out.open_port(port_index)
+            except Exception as e:
+                midi_out.delete()
+                raise MIDIDeviceError(f"Failed to open MIDI port: {e}")
+
+            self._handles[port_name] = [midi_out, 1]
+            return port_name, midi_out
+
+    def release(self, port_name: str, handle: rtmidi.MidiOut) -> None:
+        """
+        ハンドルの参照を返す（参照数を1減らす）
+
+        invalidate()で破棄された後のハンドルはプールのものではないため、返却しても
+        同じポートで新しく開いたハンドルの参照数は変わらない。
+
+        Args:
+            port_name: acquire()で取得したポート名
+            handle: acquire()で取得したハンドル
+        """
+        with self._lock:
+            entry = self._handles.get(port_name)
+            if entry is None or entry[0] is not handle:
+                return
+            entry[1] = max(entry[1] - 1, 0)
+            if entry[1] == 0 and not self.keep_idle:
+                self._close_handle(port_name)
+
+    def invalidate(self, port_name: str, handle: Optional[rtmidi.MidiOut] = None) -> None:
+        """
+        ポートのハンドルを閉じてプールから取り除く（デバイスが失われた場合など）
+
+        Args:
+            port_name: ポート名
+            handle: 破棄するハンドル。プールのハンドルが既に別のものに置き換わっている
+                場合は何もしない（Noneの場合はプールのハンドルを破棄する）
+        """
+        with self._lock:
+            entry = self._handles.get(port_name)
+            if handle is not None and (entry is None or entry[0] is not handle):
+                return
+            self._close_handle(port_name)
+            self._ports = None
+
+    def pooled_ports(self) -> Dict[str, int]:
+        """プールされているポート名と参照数の辞書を取得"""
+        with self._lock:
+            return {name: entry[1] for name, entry in self._handles.items()}
+
+    def reset(self) -> None:
+        """すべてのハンドルを閉じ、列挙結果のキャッシュを破棄"""
+        with self._lock:
+            for port_name in list(self._handles):
+                self._close_handle(port_name)
+            if self._probe is not None:
+                self._probe.delete()
+                self._probe = None
+            self._ports = None
+
+    def _on_ports_changed(self, ports: List[str]) -> None:
+        """ポート構成の変化を反映（消えたポートの未使用ハンドルを閉じる）"""
+        if self._ports is not None:
+            self.generation += 1
+        self._ports = ports
+        for port_name, (_, refcount) in list(self._handles.items()):
+            if port_name not in ports and refcount == 0:
+                self._close_handle(port_name)
+
+    def _close_handle(self, port_name: str) -> None:
+        """ハンドルを閉じてプールから取り除く"""
+        entry = self._handles.pop(port_name, None)
+        if entry is None:
+            return
+        try:
+            entry[0].close_port()
+            entry[0].delete()
+        except Exception as e:
+            print(f"Error closing MIDI port '{port_name}': {e}")
+
+
+_port_manager: Optional[PortManager] = None
+_port_manager_lock = threading.Lock()
+
+
+def get_port_manager() -> PortManager:
+    """プロセス全体で共有するPortManagerを取得"""
+    global _port_manager
+    with _port_manager_lock:
+        if _port_manager is None:
+            _port_manager = PortManager()
+        return _port_manager
@@ -1,24 +1,52 @@
 """
 パフォーマンス処理モジュール
 """
-from typing import List
+import heapq
+import itertools
+from typing import Iterator, List, Tuple
 
 from .models import Performance, Note
 from .config import MIDIConfig
 from .converter import MIDIConverter
-from .timing import TimingCalculator
-from .sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from .timing import TimingCalculator, DEFAULT_PPQ
+from .sequence import (
+    PlaybackSequence, EventStream, MIDIEvent, MIDIEventType, EVENT_TYPE_CODES,
+    event_time_ns, SLOT_PRESS_DURATION, DEGREE_PRESS_DURATION
+)
+
+
+DEGREE_PRESS_NS = round(DEGREE_PRESS_DURATION * 1_000_000_000)
+
+
+def _event(time_ns: int, event_type: MIDIEventType, note: int, description: str) -> MIDIEvent:
+    """ナノ秒の時刻からイベントを作成（timestampはtime_nsから換算する）"""
+    return MIDIEvent(
+        timestamp=time_ns / 1_000_000_000,
+        event_type=event_type,
+        note=note,
+        description=description,
+        time_ns=time_ns
+    )
 
 
 class PerformanceProcessor:
-    """演奏データを処理してMIDIシーケンスを生成するクラス"""
+    """演奏データを処理してMIDIシーケンスを生成するクラス
+
+    イベントの時刻は整数ティックのタイムラインからナノ秒（MIDIEvent.time_ns）として
+    求めるため、演奏の長さにかかわらず正確で、同時刻のイベントの順序も変わらない。
+    """
 
-    def __init__(self, config: MIDIConfig):
+    def __init__(self, config: MIDIConfig, descriptions: bool = True, ppq: int = DEFAULT_PPQ):
         """
         Args:
             config: MIDI設定オブジェクト
+            descriptions: イベントにデバッグ用の説明を付ける。Falseの場合は説明の文字列を
+                生成しない（演奏では参照されないため、本番のシーケンス生成ではFalseでよい）
+            ppq: タイムラインの1拍あたりのティック数
         """
         self.config = config
+        self.descriptions = descriptions
+        self.ppq = ppq
         self.converter = MIDIConverter(config)
 
     def process_performance(self, performance: Performance) -> PlaybackSequence:
@@ -29,73 +57,136 @@ class PerformanceProcessor:
             performance: 演奏データ
             
         Returns:
-            PlaybackSequence: 再生シーケンス
+            PlaybackSequence: 再生シーケンス（時刻順）
         """
-        timing_calc = TimingCalculator(performance.tempo)
-        events: List[MIDIEvent] = []
+        timing_calc = TimingCalculator(performance.tempo, self.ppq)
 
         # 1. スロット選択イベント
         slot_event = self._create_slot_event(performance.slot, timing_calc)
-        events.append(slot_event)
 
-        # 2. 各音符の処理
-        note_timings = timing_calc.calculate_note_timings(len(performance.notes))
-        
-        for i, note in enumerate(performance.notes):
-            note_start_time = note_timings[i]
-            note_events = self._process_note(note, note_start_time, timing_calc, i + 1)
-            events.extend(note_events)
+        # 2. 各音符のイベントを時刻順にマージ（全体のソートは行わない）
+        events = list(self._iter_events(performance, slot_event, timing_calc))
 
         # 3. 演奏時間の計算
         total_duration = timing_calc.get_total_duration(len(performance.notes))
 
-        # 4. シーケンスの作成とソート
-        sequence = PlaybackSequence(
+        return PlaybackSequence(
             events=events,
             total_duration=total_duration,
             slot=performance.slot,
             tempo=performance.tempo
         )
-        sequence.sort_events()
 
-        return sequence
+    def stream_performance(self, performance: Performance) -> EventStream:
+        """
+        演奏データを時刻順のイベントとして遅延生成する
+        
+        process_performanceと同じ順序のイベントを音符ごとに生成するため、
+        演奏時間にかかわらず最初のイベントまでの時間と保持するイベント数は一定になる。
+        
+        Args:
+            performance: 演奏データ
+            
+        Returns:
+            EventStream: 遅延生成される演奏シーケンス
+        """
+        timing_calc = TimingCalculator(performance.tempo, self.ppq)
+        # スロットの変換エラーは生成開始前に検出する
+        slot_event = self._create_slot_event(performance.slot, timing_calc)
+
+        return EventStream(
+            events=self._iter_events(performance, slot_event, timing_calc),
+            total_duration=timing_calc.get_total_duration(len(performance.notes)),
+            slot=performance.slot,
+            tempo=performance.tempo
+        )
+
+    def _iter_events(
+        self,
+        performance: Performance,
+        slot_event: MIDIEvent,
+        timing_calc: TimingCalculator
+    ) -> Iterator[MIDIEvent]:
+        """
+        音符ごとにイベントを生成し、確定した時刻のものから順に出力
+
+        各音符のイベントは音符の開始以降に限られ、音符どうしは境界でしか重ならないため、
+        未確定のイベントだけを保持するヒープで時刻順にマージできる。順序は
+        (時刻, イベント種類の優先度, 生成順) で決まり、同時刻ではノートオフ・ノートオン・
+        スロット押下の順、同じ種類では生成順（スロット選択、音符の順）になる。
+        これはsort_events()の順序と同じである。
+        """
+        # (時刻ナノ秒, イベント種類の優先度, 生成順, イベント) のヒープ
+        pending: List[Tuple[int, int, int, MIDIEvent]] = []
+        order = itertools.count()
+        priority = EVENT_TYPE_CODES
+
+        def push(event: MIDIEvent) -> None:
+            heapq.heappush(
+                pending, (event_time_ns(event), priority[event.event_type], next(order), event)
+            )
+
+        push(slot_event)
+
+        note_ticks = timing_calc.iter_note_ticks(len(performance.notes))
+        for i, (note, note_start_tick) in enumerate(zip(performance.notes, note_ticks)):
+            # 以降の音符のイベントはすべて音符の開始以降なので、それより前は確定
+            note_start_ns = timing_calc.ticks_to_ns(note_start_tick)
+            while pending and pending[0][0] < note_start_ns:
+                yield heapq.heappop(pending)[3]
+
+            for event in self._process_note(note, note_start_tick, timing_calc, i + 1):
+                push(event)
+
+        while pending:
+            yield heapq.heappop(pending)[3]
 
     def _create_slot_event(self, slot: int, timing_calc: TimingCalculator) -> MIDIEvent:
-        """スロット選択イベントを作成"""
+        """
+        スロット選択イベントを作成
+
+        押下と解放はコンパイル時にタイムライン上のノートオン/ノートオフの組へ展開されるため、
+        演奏中にスロット押下で待機することはない。
+        """
         slot_note = self.converter.convert_slot(slot)
         if slot_note is None:
             raise ValueError(f"Invalid slot: {slot}")
 
+        slot_ns = round(timing_calc.calculate_slot_timing() * 1_000_000_000)
         return MIDIEvent(
-            timestamp=timing_calc.calculate_slot_timing(),
+            timestamp=slot_ns / 1_000_000_000,
             event_type=MIDIEventType.SLOT_PRESS,
             note=slot_note,
-            duration=0.05,  # 50ms
-            description=f"Slot {slot} selection"
+            duration=SLOT_PRESS_DURATION,
+            description=f"Slot {slot} selection" if self.descriptions else "",
+            time_ns=slot_ns
         )
 
     def _process_note(
         self, 
         note: Note, 
-        note_start_time: float, 
+        note_start_tick: int,
         timing_calc: TimingCalculator,
         note_index: int
     ) -> List[MIDIEvent]:
         """1つの音符を処理してMIDIイベントリストを生成"""
         events: List[MIDIEvent] = []
+        describe = self.descriptions
 
-        # 1. モディファイアの処理
+        # 1. モディファイアの処理（押下は音符の開始、解放は次の音符の開始と同じティック）
         modifier_notes = self._get_active_modifiers(note)
-        modifier_start_time = timing_calc.calculate_modifier_timing(note_start_time)
-        modifier_end_time = timing_calc.calculate_modifier_release_timing(note_start_time)
+        modifier_start_ns = timing_calc.ticks_to_ns(note_start_tick)
+        modifier_end_ns = timing_calc.ticks_to_ns(
+            timing_calc.calculate_modifier_release_tick(note_start_tick)
+        )
 
         # モディファイア押下
         for mod_num, mod_note in modifier_notes:
-            events.append(MIDIEvent(
-                timestamp=modifier_start_time,
-                event_type=MIDIEventType.NOTE_ON,
-                note=mod_note,
-                description=f"Note {note_index}: Modifier{mod_num} press"
+            events.append(_event(
+                modifier_start_ns,
+                MIDIEventType.NOTE_ON,
+                mod_note,
+                f"Note {note_index}: Modifier{mod_num} press" if describe else ""
             ))
 
         # 2. degree ボタンの8回押下
@@ -103,31 +194,32 @@ class PerformanceProcessor:
         if degree_note is None:
             raise ValueError(f"Invalid degree: {note.degree}")
 
-        degree_timings = timing_calc.calculate_degree_press_timings(note_start_time)
-        for i, press_time in enumerate(degree_timings, 1):
+        degree_ticks = timing_calc.calculate_degree_press_ticks(note_start_tick)
+        for i, press_tick in enumerate(degree_ticks, 1):
+            press_ns = timing_calc.ticks_to_ns(press_tick)
             # ノートオン
-            events.append(MIDIEvent(
-                timestamp=press_time,
-                event_type=MIDIEventType.NOTE_ON,
-                note=degree_note,
-                description=f"Note {note_index}: Degree '{note.degree}' press {i}/8"
+            events.append(_event(
+                press_ns,
+                MIDIEventType.NOTE_ON,
+                degree_note,
+                f"Note {note_index}: Degree '{note.degree}' press {i}/8" if describe else ""
             ))
-            
-            # ノートオフ（短い間隔で）
-            events.append(MIDIEvent(
-                timestamp=press_time + 0.05,  # 50ms後
-                event_type=MIDIEventType.NOTE_OFF,
-                note=degree_note,
-                description=f"Note {note_index}: Degree '{note.degree}' release {i}/8"
+
+            # ノートオフ（テンポによらず押下時間後）
+            events.append(_event(
+                press_ns + DEGREE_PRESS_NS,
+                MIDIEventType.NOTE_OFF,
+                degree_note,
+                f"Note {note_index}: Degree '{note.degree}' release {i}/8" if describe else ""
             ))
 
         # 3. モディファイア解放
         for mod_num, mod_note in modifier_notes:
-            events.append(MIDIEvent(
-                timestamp=modifier_end_time,
-                event_type=MIDIEventType.NOTE_OFF,
-                note=mod_note,
-                description=f"Note {note_index}: Modifier{mod_num} release"
+            events.append(_event(
+                modifier_end_ns,
+                MIDIEventType.NOTE_OFF,
+                mod_note,
+                f"Note {note_index}: Modifier{mod_num} release" if describe else ""
             ))
 
         return events
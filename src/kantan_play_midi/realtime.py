@@ -0,0 +1,106 @@
+"""
+演奏スレッドのリアルタイム優先度設定モジュール
+"""
+from dataclasses import dataclass, field
+import os
+from typing import List, Optional, Sequence, Tuple
+
+
+# 指定できるリアルタイムスケジューリングポリシー
+POLICIES = ("fifo", "rr")
+
+
+@dataclass(frozen=True)
+class RealtimeConfig:
+    """演奏スレッドに適用するスケジューリング設定
+
+    リアルタイムポリシー（SCHED_FIFO / SCHED_RR）を要求し、権限がない場合や
+    対応していないOSではnice値の変更にフォールバックする。
+    """
+    policy: str = "fifo"  # "fifo" または "rr"
+    priority: int = 50  # リアルタイム優先度 (1-99)
+    nice: int = -10  # フォールバック時のnice値
+    cpus: Optional[Sequence[int]] = None  # 演奏スレッドを固定するCPU番号
+
+    def __post_init__(self) -> None:
+        """設定値の検証"""
+        if self.policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {self.policy!r}")
+        if not 1 <= self.priority <= 99:
+            raise ValueError(f"priority must be between 1 and 99, got {self.priority}")
+        if not -20 <= self.nice <= 19:
+            raise ValueError(f"nice must be between -20 and 19, got {self.nice}")
+
+
+@dataclass
+class RealtimeReport:
+    """実際に適用されたスケジューリング設定"""
+    policy: str = "default"  # "SCHED_FIFO", "SCHED_RR", "nice" または "default"
+    priority: int = 0  # 適用されたリアルタイム優先度
+    nice: Optional[int] = None  # 適用されたnice値
+    affinity: Optional[Tuple[int, ...]] = None  # 適用されたCPUアフィニティ
+    errors: List[str] = field(default_factory=list)  # 適用できなかった設定の理由
+
+    @property
+    def is_realtime(self) -> bool:
+        """リアルタイムポリシーが適用されているか"""
+        return self.policy in ("SCHED_FIFO", "SCHED_RR")
+
+    def describe(self) -> str:
+        """適用結果を1行で表す"""
+        if self.is_realtime:
+            text = f"{self.policy} priority {self.priority}"
+        elif self.policy == "nice":
+            text = f"nice {self.nice}"
+        else:
+            text = "default scheduling"
+        if self.affinity is not None:
+            text += f", CPUs {list(self.affinity)}"
+        return text
+
+
+def apply_realtime(config: RealtimeConfig) -> RealtimeReport:
+    """
+    呼び出し元のスレッドにスケジューリング設定を適用
+
+    Linuxではスケジューリングポリシー、nice値、CPUアフィニティはスレッド単位で
+    適用されるため、演奏スレッドの中から呼び出す。
+
+    Args:
+        config: 適用する設定
+
+    Returns:
+        RealtimeReport: 実際に適用された設定と、適用できなかった設定の理由
+    """
+    report = RealtimeReport()
+
+    if hasattr(os, "sched_setscheduler"):
+        policy = os.SCHED_FIFO if config.policy == "fifo" else os.SCHED_RR
+        try:
+            os.sched_setscheduler(0, policy, os.sched_param(config.priority))
+            report.policy = "SCHED_FIFO" if config.policy == "fifo" else "SCHED_RR"
+            report.priority = config.priority
+        except (OSError, ValueError) as e:
+            report.errors.append(f"sched_setscheduler: {e}")
+    else:
+        report.errors.append("sched_setscheduler: not supported on this platform")
+
+    if not report.is_realtime:
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, config.nice)
+            report.policy = "nice"
+            report.nice = os.getpriority(os.PRIO_PROCESS, 0)
+        except (AttributeError, OSError) as e:
+            report.errors.append(f"setpriority: {e}")
+
+    if config.cpus is not None:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, config.cpus)
+                report.affinity = tuple(sorted(os.sched_getaffinity(0)))
+            except (OSError, ValueError) as e:
+                report.errors.append(f"sched_setaffinity: {e}")
+        else:
+            report.errors.append("sched_setaffinity: not supported on this platform")
+
+    return report
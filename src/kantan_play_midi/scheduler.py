@@ -0,0 +1,152 @@
+"""
+高精度イベントスケジューラモジュール
+"""
+from array import array
+import threading
+import time
+from typing import Dict, Optional
+
+
+LATENESS_CAPACITY = 1 << 16  # 遅延を記録する直近のイベント数の既定値
+
+
+class PrecisionScheduler:
+    """粗いスリープと短いスピンを組み合わせた高精度スケジューラ
+
+    時刻はすべて ``time.perf_counter_ns()`` （単調増加クロック）のナノ秒値で扱う。
+    締め切りの ``spin_window`` 秒前まではスレッドを眠らせ、残りをスピンで詰めることで
+    CPU使用率を抑えつつサブミリ秒の精度でイベントを送出する。
+
+    送出したイベントごとの遅延は固定長のリングバッファに直近lateness_capacity件だけ
+    記録されるため、長時間の演奏でもメモリ使用量は一定で、記録時に再確保も発生しない。
+    演奏全体の遅延分布にはPlaybackMetricsのヒストグラムを使用する。
+    """
+
+    def __init__(self, spin_window: float = 0.002, lateness_capacity: int = LATENESS_CAPACITY):
+        """
+        Args:
+            spin_window: 締め切り直前にスピン待機する時間幅（秒）
+            lateness_capacity: 遅延を記録する直近のイベント数
+        """
+        if spin_window < 0:
+            raise ValueError(f"spin_window must be non-negative, got {spin_window}")
+        if lateness_capacity < 1:
+            raise ValueError(f"lateness_capacity must be at least 1, got {lateness_capacity}")
+        self.spin_window_ns = int(spin_window * 1_000_000_000)
+        self._lateness = array('q', bytes(8 * lateness_capacity))  # 遅延のリングバッファ
+        self._lateness_count = 0  # reset()以降に記録した遅延の数
+        self._wakeup = threading.Event()
+
+    @property
+    def lateness_ns(self) -> array:
+        """
+        直近に送出したイベントごとの遅延（ナノ秒, 古い順, 最大lateness_capacity件）
+
+        記録を読み出した時点のコピーを返す。
+        """
+        lateness = self._lateness
+        count = self._lateness_count
+        if count <= len(lateness):
+            return lateness[:count]
+        start = count % len(lateness)
+        return lateness[start:] + lateness[:start]
+
+    @property
+    def lateness_count(self) -> int:
+        """reset()以降に遅延を記録したイベント数（リングバッファから溢れた分を含む）"""
+        return self._lateness_count
+
+    @staticmethod
+    def now_ns() -> int:
+        """現在の単調時刻を取得（ナノ秒）"""
+        return time.perf_counter_ns()
+
+    def wait_until(self, deadline_ns: int) -> bool:
+        """
+        指定した単調時刻まで待機する
+
+        Args:
+            deadline_ns: 待機する締め切り時刻（ナノ秒）
+
+        Returns:
+            bool: 締め切りに到達した場合はTrue、wake()で起こされた場合はFalse
+        """
+        perf_counter_ns = time.perf_counter_ns
+        spin_window_ns = self.spin_window_ns
+
+        while True:
+            remaining = deadline_ns - perf_counter_ns()
+            if remaining <= 0:
+                return True
+
+            if remaining > spin_window_ns:
+                # スピン幅の手前まで眠る（wake()で即座に起きられるようにEventで待つ）
+                if self._wakeup.wait((remaining - spin_window_ns) / 1_000_000_000):
+                    self._wakeup.clear()
+                    return False
+            else:
+                # 残りはスピンで詰める
+                while perf_counter_ns() < deadline_ns:
+                    pass
+                return True
+
+    def idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        wake()が呼ばれるまでスピンせずに待機する（一時停止中などに使用）
+
+        Args:
+            timeout: 最大待機時間（秒）、Noneの場合は無制限
+
+        Returns:
+            bool: wake()で起こされた場合はTrue
+        """
+        if self._wakeup.wait(timeout):
+            self._wakeup.clear()
+            return True
+        return False
+
+    def wake(self) -> None:
+        """待機中のwait_until()を中断させる"""
+        self._wakeup.set()
+
+    def record_lateness(self, deadline_ns: int) -> int:
+        """
+        イベント送出時の遅延を記録
+
+        Args:
+            deadline_ns: イベントの締め切り時刻（ナノ秒）
+
+        Returns:
+            int: 記録した遅延（ナノ秒）
+        """
+        lateness = time.perf_counter_ns() - deadline_ns
+        count = self._lateness_count
+        self._lateness[count % len(self._lateness)] = lateness
+        self._lateness_count = count + 1
+        return lateness
+
+    def reset(self) -> None:
+        """記録した遅延と起床要求をクリア"""
+        self._lateness_count = 0
+        self._wakeup.clear()
+
+    def get_lateness_stats(self) -> Dict[str, float]:
+        """
+        記録されている直近の遅延の統計を取得
+
+        Returns:
+            Dict[str, float]: count, mean, p50, p99, max（遅延は秒単位）
+        """
+        recorded = self.lateness_ns
+        count = len(recorded)
+        if count == 0:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+
+        ordered = sorted(recorded)
+        return {
+            "count": count,
+            "mean": sum(ordered) / count / 1e9,
+            "p50": ordered[(count - 1) // 2] / 1e9,
+            "p99": ordered[min(count - 1, int(count * 0.99))] / 1e9,
+            "max": ordered[-1] / 1e9,
+        }
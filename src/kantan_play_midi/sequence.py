@@ -1,11 +1,18 @@
 """
 演奏シーケンス管理モジュール
 """
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+import math
+from typing import Iterator, List, Optional, Protocol, Sequence, Tuple, Union, overload
 from enum import Enum
 
 
+SLOT_PRESS_DURATION = 0.05  # スロットボタンの押下時間（秒）
+DEGREE_PRESS_DURATION = 0.05  # degreeボタンの押下時間（秒）
+
+
 class MIDIEventType(Enum):
     """MIDIイベントの種類"""
     NOTE_ON = "note_on"
@@ -13,6 +20,19 @@ class MIDIEventType(Enum):
     SLOT_PRESS = "slot_press"
 
 
+# イベント種類の符号。同時刻のイベントの並び順（優先度）でもある
+EVENT_TYPE_CODES = {
+    MIDIEventType.NOTE_OFF: 0,
+    MIDIEventType.NOTE_ON: 1,
+    MIDIEventType.SLOT_PRESS: 2,
+}
+EVENT_TYPES = tuple(EVENT_TYPE_CODES)
+
+# イベントの固定幅表現 (時刻ナノ秒, イベント種類の符号, ノート番号, ベロシティ, 継続時間ナノ秒)
+# 継続時間がない場合は-1
+EventRow = Tuple[int, int, int, int, int]
+
+
 @dataclass
 class MIDIEvent:
     """個別のMIDIイベント"""
@@ -22,6 +42,43 @@ class MIDIEvent:
     velocity: int = 127
     duration: Optional[float] = None  # イベントの継続時間（秒）
     description: str = ""  # デバッグ用の説明
+    time_ns: Optional[int] = None  # ナノ秒単位の正確な絶対時刻（timestampの元になった値）
+
+
+def event_time_ns(event: MIDIEvent) -> int:
+    """
+    イベントの絶対時刻をナノ秒で取得
+
+    time_nsがある場合はその値を、ない場合はtimestampを丸めた値を返す。
+
+    Args:
+        event: MIDIイベント
+
+    Returns:
+        int: ナノ秒単位の絶対時刻
+    """
+    if event.time_ns is not None:
+        return event.time_ns
+    return round(event.timestamp * 1_000_000_000)
+
+
+def event_row(event: MIDIEvent) -> EventRow:
+    """
+    イベントを固定幅表現に変換
+
+    Args:
+        event: MIDIイベント
+
+    Returns:
+        EventRow: (時刻ナノ秒, イベント種類の符号, ノート番号, ベロシティ, 継続時間ナノ秒)
+    """
+    return (
+        event_time_ns(event),
+        EVENT_TYPE_CODES[event.event_type],
+        event.note,
+        event.velocity,
+        -1 if event.duration is None else round(event.duration * 1_000_000_000),
+    )
 
 
 @dataclass
@@ -30,7 +87,7 @@ class PlaybackSequence:
     events: List[MIDIEvent]
     total_duration: float  # 全体の演奏時間（秒）
     slot: int
-    tempo: int
+    tempo: Union[int, float]
 
     def get_events_at_time(self, timestamp: float, tolerance: float = 0.001) -> List[MIDIEvent]:
         """指定時刻のイベントを取得"""
@@ -47,5 +104,256 @@ class PlaybackSequence:
         ]
 
     def sort_events(self) -> None:
-        """イベントを時刻順にソート"""
-        self.events.sort(key=lambda event: (event.timestamp, event.event_type.value))
\ No newline at end of file
+        """
+        イベントを時刻順にソート
+
+        同時刻のイベントはノートオフ・ノートオン・スロット押下の順（EVENT_TYPE_CODESの順）、
+        同じ種類ではソート前の順序のまま並ぶ。
+        """
+        priority = EVENT_TYPE_CODES
+        self.events.sort(key=lambda event: (event_time_ns(event), priority[event.event_type]))
+
+    def iter_rows(self) -> Iterator[EventRow]:
+        """イベントを固定幅表現で列挙"""
+        return map(event_row, self.events)
+
+
+@dataclass
+class EventStream:
+    """時刻順のイベントを遅延生成する演奏シーケンス"""
+    events: Iterator[MIDIEvent]  # 時刻順に生成されるイベント（一度だけ読み出せる）
+    total_duration: float  # 全体の演奏時間（秒）
+    slot: int
+    tempo: Union[int, float]
+
+
+class RowSequence(Protocol):
+    """コンパイルや書き出しに渡せる演奏シーケンスのインターフェース
+
+    PlaybackSequence、ColumnarSequence、MappedSequenceがこの形を満たす。
+    """
+
+    @property
+    def events(self) -> Sequence[MIDIEvent]:
+        """全イベント"""
+
+    @property
+    def total_duration(self) -> float:
+        """全体の演奏時間（秒）"""
+
+    @property
+    def slot(self) -> int:
+        """スロット番号"""
+
+    @property
+    def tempo(self) -> float:
+        """テンポ（BPM）"""
+
+    def iter_rows(self) -> Iterator[EventRow]:
+        """イベントを時刻順に固定幅表現で列挙"""
+
+
+class _EventSource(Protocol):
+    """番号でMIDIEventを生成できるシーケンス（EventViewの参照先）"""
+
+    def __len__(self) -> int:
+        """イベント数"""
+
+    def event(self, index: int) -> MIDIEvent:
+        """指定番号のイベントを生成"""
+
+
+class EventView(Sequence[MIDIEvent]):
+    """ColumnarSequence・MappedSequenceのイベントをMIDIEventとして参照するビュー
+
+    MIDIEventは参照されたときにだけ生成される（descriptionは常に空）。
+    """
+
+    def __init__(self, sequence: _EventSource, start: int = 0, stop: Optional[int] = None):
+        self._sequence = sequence
+        self._start = start
+        self._stop = len(sequence) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> MIDIEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[MIDIEvent]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MIDIEvent, Sequence[MIDIEvent]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return EventView(self._sequence, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        return self._sequence.event(self._start + index)
+
+    def __iter__(self) -> Iterator[MIDIEvent]:
+        event = self._sequence.event
+        for index in range(self._start, self._stop):
+            yield event(index)
+
+
+class ColumnarSequence:
+    """型付き配列で保持する演奏シーケンス
+
+    PlaybackSequenceと同じ内容を、時刻・イベント種類・ノート番号・ベロシティ・継続時間の
+    並列な配列で保持する。1イベントあたり19バイトで、MIDIEventのリストよりも
+    メモリ使用量が1桁以上少ない。時刻順に保持するため、時刻による検索は二分探索で行う。
+
+    eventsはMIDIEventのビューで、PlaybackSequenceの代わりにコンパイルや演奏に渡せる。
+    """
+
+    def __init__(
+        self,
+        timestamps: array,
+        event_types: array,
+        notes: array,
+        velocities: array,
+        durations: array,
+        total_duration: float,
+        slot: int,
+        tempo: Union[int, float]
+    ):
+        """
+        Args:
+            timestamps: 秒単位の絶対時刻（array('d')、時刻順）
+            event_types: EVENT_TYPE_CODESの符号（array('B')）
+            notes: MIDIノートナンバー（array('B')）
+            velocities: ベロシティ（array('B')）
+            durations: 継続時間（array('d')、継続時間がない場合はNaN）
+            total_duration: 全体の演奏時間（秒）
+            slot: スロット番号
+            tempo: テンポ（BPM）
+
+        Raises:
+            ValueError: 配列の長さが揃っていない場合
+        """
+        if not len(timestamps) == len(event_types) == len(notes) == len(velocities) == len(durations):
+            raise ValueError("Column arrays must have the same length")
+        self.timestamps = timestamps
+        self.event_types = event_types
+        self.notes = notes
+        self.velocities = velocities
+        self.durations = durations
+        self.total_duration = total_duration
+        self.slot = slot
+        self.tempo = tempo
+
+    @classmethod
+    def from_sequence(cls, sequence: PlaybackSequence) -> "ColumnarSequence":
+        """
+        PlaybackSequenceを列指向に変換
+
+        イベントはsort_events()と同じ順序（時刻、同時刻ではノートオフ・ノートオン・
+        スロット押下の順）に並べ替えて保持する。
+
+        Args:
+            sequence: 変換する演奏シーケンス
+
+        Returns:
+            ColumnarSequence: 列指向のシーケンス
+        """
+        events = sorted(
+            sequence.events,
+            key=lambda event: (event_time_ns(event), EVENT_TYPE_CODES[event.event_type])
+        )
+        return cls(
+            timestamps=array('d', (event.timestamp for event in events)),
+            event_types=array('B', (EVENT_TYPE_CODES[event.event_type] for event in events)),
+            notes=array('B', (event.note for event in events)),
+            velocities=array('B', (event.velocity for event in events)),
+            durations=array('d', (
+                math.nan if event.duration is None else event.duration for event in events
+            )),
+            total_duration=sequence.total_duration,
+            slot=sequence.slot,
+            tempo=sequence.tempo,
+        )
+
+    def to_sequence(self) -> PlaybackSequence:
+        """MIDIEventのリストを持つPlaybackSequenceに戻す"""
+        return PlaybackSequence(
+            events=list(self.events),
+            total_duration=self.total_duration,
+            slot=self.slot,
+            tempo=self.tempo,
+        )
+
+    def __len__(self) -> int:
+        """イベント数"""
+        return len(self.timestamps)
+
+    @property
+    def events(self) -> EventView:
+        """全イベントのMIDIEventビュー"""
+        return EventView(self)
+
+    @property
+    def nbytes(self) -> int:
+        """イベント配列が使用するバイト数"""
+        return sum(
+            len(column) * column.itemsize
+            for column in (self.timestamps, self.event_types, self.notes, self.velocities, self.durations)
+        )
+
+    def iter_rows(self) -> Iterator[EventRow]:
+        """イベントを固定幅表現で列挙（MIDIEventを生成しない）"""
+        for timestamp, event_type, note, velocity, duration in zip(
+            self.timestamps, self.event_types, self.notes, self.velocities, self.durations
+        ):
+            yield (
+                round(timestamp * 1_000_000_000),
+                event_type,
+                note,
+                velocity,
+                -1 if math.isnan(duration) else round(duration * 1_000_000_000),
+            )
+
+    def event(self, index: int) -> MIDIEvent:
+        """
+        指定番号のイベントをMIDIEventとして取得
+
+        Args:
+            index: イベント番号
+
+        Returns:
+            MIDIEvent: 生成したイベント
+        """
+        duration = self.durations[index]
+        return MIDIEvent(
+            timestamp=self.timestamps[index],
+            event_type=EVENT_TYPES[self.event_types[index]],
+            note=self.notes[index],
+            velocity=self.velocities[index],
+            duration=None if math.isnan(duration) else duration,
+        )
+
+    def index_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """
+        指定時間範囲（両端を含む）のイベント番号の範囲を取得
+
+        Args:
+            start_time: 開始時刻（秒）
+            end_time: 終了時刻（秒）
+
+        Returns:
+            Tuple[int, int]: (最初のイベント番号, 最後のイベント番号 + 1)
+        """
+        start = bisect_left(self.timestamps, start_time)
+        return start, max(start, bisect_right(self.timestamps, end_time))
+
+    def get_events_at_time(self, timestamp: float, tolerance: float = 0.001) -> EventView:
+        """指定時刻のイベントを取得"""
+        return EventView(self, *self.index_range(timestamp - tolerance, timestamp + tolerance))
+
+    def get_events_in_range(self, start_time: float, end_time: float) -> EventView:
+        """指定時間範囲のイベントを取得"""
+        return EventView(self, *self.index_range(start_time, end_time))
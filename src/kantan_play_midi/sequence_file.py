@@ -0,0 +1,233 @@
+"""
+演奏シーケンスのバイナリファイルモジュール
+"""
+import mmap
+import os
+from pathlib import Path
+import struct
+from types import TracebackType
+from typing import Iterator, Optional, Type, Union
+import zlib
+
+from .exceptions import InvalidInputError
+from .sequence import (
+    PlaybackSequence, RowSequence, EventView, MIDIEvent, EventRow, EVENT_TYPES
+)
+
+
+SEQUENCE_FILE_SUFFIX = ".kpseq"
+MAGIC = b"KPSQ"
+FORMAT_VERSION = 2
+FLAG_ZLIB = 0x0001  # イベント表がzlibで圧縮されている
+
+# ヘッダ: マジック, 形式バージョン, フラグ, イベント数, スロット, (予約), テンポ, 演奏時間ナノ秒
+# テンポは小数のテンポも正確に保存できるよう倍精度浮動小数点数で保持する
+_HEADER = struct.Struct("<4sHHIHxxdq")
+# イベント表の1行: 時刻ナノ秒, イベント種類の符号, ノート番号, ベロシティ, (予約), 継続時間ナノ秒
+# 並びはEventRowと同じで、読み出した行をそのままエンコードに使用できる
+_EVENT = struct.Struct("<qBBBxq")
+
+
+def save_sequence(
+    sequence: RowSequence,
+    path: Union[str, Path],
+    compress: bool = False
+) -> None:
+    """
+    演奏シーケンスをバイナリファイルに保存
+
+    ファイルはヘッダ（32バイト）と固定幅（1イベント20バイト）のイベント表からなる。
+    compressを指定するとイベント表をzlibで圧縮する（保管用。読み込み時は展開が必要になり、
+    メモリマップでの共有はできない）。
+
+    Args:
+        sequence: 保存する演奏シーケンス（時刻順にソート済みであること）
+        path: 保存先のパス
+        compress: イベント表をzlibで圧縮する
+    """
+    table = b"".join(_EVENT.pack(*row) for row in sequence.iter_rows())
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        FLAG_ZLIB if compress else 0,
+        len(table) // _EVENT.size,
+        sequence.slot,
+        sequence.tempo,
+        round(sequence.total_duration * 1_000_000_000),
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(zlib.compress(table, 9) if compress else table)
+
+
+def load_sequence(path: Union[str, Path]) -> "MappedSequence":
+    """
+    バイナリファイルから演奏シーケンスを読み込む
+
+    非圧縮のファイルはメモリマップで読み込むため、ファイルの大きさにかかわらず即座に
+    読み込みが完了し、複数のプロセスでページキャッシュ上の同じ内容を共有できる。
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        MappedSequence: 読み込んだ演奏シーケンス
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        InvalidInputError: ファイルの形式が不正な場合
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise InvalidInputError(f"Truncated sequence file: {path}")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        magic, version, flags, event_count, slot, tempo, total_duration_ns = \
+            _HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            raise InvalidInputError(f"Not a sequence file: {path}")
+        if version != FORMAT_VERSION:
+            raise InvalidInputError(f"Unsupported sequence file version: {version}")
+        if tempo.is_integer():
+            tempo = int(tempo)
+
+        if flags & FLAG_ZLIB:
+            try:
+                table = memoryview(zlib.decompress(mapped[_HEADER.size:]))
+            except zlib.error as e:
+                raise InvalidInputError(f"Corrupted sequence file: {e}")
+        else:
+            table = memoryview(mapped)[_HEADER.size:]
+
+        if len(table) != event_count * _EVENT.size:
+            table.release()
+            raise InvalidInputError(f"Truncated sequence file: {path}")
+    except BaseException:
+        mapped.close()
+        raise
+
+    # 展開したイベント表はメモリマップを参照しないため、ここで閉じる
+    owner: Optional[mmap.mmap] = mapped
+    if flags & FLAG_ZLIB:
+        mapped.close()
+        owner = None
+
+    return MappedSequence(
+        table, event_count, total_duration_ns / 1_000_000_000, slot, tempo, owner
+    )
+
+
+class MappedSequence:
+    """バイナリファイルから読み込んだ演奏シーケンス
+
+    イベント表のバッファ（メモリマップ）を直接参照し、コンパイルや演奏では
+    iter_rows()で行を読み出すだけでMIDIEventを生成しない。
+    eventsはMIDIEventのビューで、参照されたイベントだけが生成される。
+
+    使用後はclose()でメモリマップを閉じる（withブロックでも使用できる）。
+    """
+
+    def __init__(
+        self,
+        table: memoryview,
+        event_count: int,
+        total_duration: float,
+        slot: int,
+        tempo: Union[int, float],
+        mapped: Optional[mmap.mmap] = None
+    ):
+        """
+        Args:
+            table: イベント表のバッファ
+            event_count: イベント数
+            total_duration: 全体の演奏時間（秒）
+            slot: スロット番号
+            tempo: テンポ（BPM）
+            mapped: イベント表を保持しているメモリマップ（close()で閉じる）
+        """
+        self._table = table
+        self._event_count = event_count
+        self._mapped = mapped
+        self.total_duration = total_duration
+        self.slot = slot
+        self.tempo = tempo
+
+    def __len__(self) -> int:
+        """イベント数"""
+        return self._event_count
+
+    def __enter__(self) -> "MappedSequence":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    @property
+    def is_mapped(self) -> bool:
+        """イベント表をメモリマップで参照しているか"""
+        return self._mapped is not None
+
+    @property
+    def events(self) -> EventView:
+        """全イベントのMIDIEventビュー"""
+        return EventView(self)
+
+    def iter_rows(self) -> Iterator[EventRow]:
+        """
+        イベント表の行を順に読み出す（MIDIEventを生成しない）
+
+        読み出しはイベント表の別のビューから行うため、読み出し中でもclose()できる。
+        """
+        return _EVENT.iter_unpack(self._table[:])
+
+    def event(self, index: int) -> MIDIEvent:
+        """
+        指定番号のイベントをMIDIEventとして取得
+
+        Args:
+            index: イベント番号
+
+        Returns:
+            MIDIEvent: 生成したイベント
+        """
+        time_ns, event_type, note, velocity, duration_ns = _EVENT.unpack_from(
+            self._table, index * _EVENT.size
+        )
+        return MIDIEvent(
+            timestamp=time_ns / 1_000_000_000,
+            event_type=EVENT_TYPES[event_type],
+            note=note,
+            velocity=velocity,
+            duration=None if duration_ns < 0 else duration_ns / 1_000_000_000,
+            time_ns=time_ns,
+        )
+
+    def to_sequence(self) -> PlaybackSequence:
+        """MIDIEventのリストを持つPlaybackSequenceに変換"""
+        return PlaybackSequence(
+            events=list(self.events),
+            total_duration=self.total_duration,
+            slot=self.slot,
+            tempo=self.tempo,
+        )
+
+    def close(self) -> None:
+        """
+        メモリマップを閉じる
+
+        iter_rows()の読み出しが残っている場合、メモリマップはその読み出しが
+        破棄されたときに閉じられる。
+        """
+        self._table.release()
+        mapped, self._mapped = self._mapped, None
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
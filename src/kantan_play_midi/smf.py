@@ -0,0 +1,113 @@
+"""
+スタンダードMIDIファイル（SMF）書き出しモジュール
+"""
+import os
+from pathlib import Path
+import struct
+from typing import Iterator, Union
+
+import mido
+
+from .compiled import Burst, CompiledSequence, iter_row_bursts
+from .sequence import RowSequence
+from .timing import DEFAULT_PPQ
+
+
+_FLUSH_SIZE = 1 << 16  # 書き込みバッファをファイルに書き出す大きさ
+_MAX_DELTA = 0x0FFFFFFF  # 可変長数値（4バイト）で表せる最大のデルタタイム
+
+
+def _vlq(value: int) -> bytes:
+    """可変長数値にエンコード"""
+    data = bytearray((value & 0x7F,))
+    value >>= 7
+    while value:
+        data.append(0x80 | (value & 0x7F))
+        value >>= 7
+    data.reverse()
+    return bytes(data)
+
+
+def export_smf(
+    sequence: Union[RowSequence, CompiledSequence],
+    path: Union[str, Path],
+    channel: int = 0,
+    ppq: int = DEFAULT_PPQ
+) -> None:
+    """
+    演奏シーケンスをフォーマット0のスタンダードMIDIファイルとして書き出す
+
+    演奏と同じバースト（スロット押下の展開、同時刻ではノートオフが先）を先頭から1回だけ
+    走査し、デルタタイムを付けたメッセージを書き込みバッファ経由で順に書き出す。
+    トラックの長さは書き出し後に埋めるため、長い演奏でもイベント列を保持しない。
+    先頭にはシーケンスのテンポのテンポ設定メタイベントを置く。
+    書き出しは同じディレクトリの一時ファイルに行い、完了してから置き換えるため、
+    失敗した場合に書きかけのファイルが残らない。
+
+    Args:
+        sequence: 書き出す演奏シーケンス
+        path: 書き出し先のパス
+        channel: 送出するMIDIチャンネル (0-15)（CompiledSequenceではコンパイル時のチャンネル）
+        ppq: 1拍あたりのティック数
+
+    Raises:
+        ValueError: ppqが範囲外の場合、またはデルタタイムが表せないほど長い場合
+    """
+    if not 0 < ppq < 0x8000:
+        raise ValueError(f"ppq must be between 1 and 32767, got {ppq}")
+
+    if isinstance(sequence, CompiledSequence):
+        bursts: Iterator[Burst] = sequence.iter_bursts()
+        total_duration_ns = sequence.total_duration_ns
+    else:
+        bursts = iter_row_bursts(sequence.iter_rows(), channel)
+        total_duration_ns = round(sequence.total_duration * 1_000_000_000)
+
+    # ティックはテンポ設定メタイベントの値（1拍のマイクロ秒）から換算し、再生側の解釈と一致させる
+    tempo_us = mido.bpm2tempo(sequence.tempo)
+    beat_ns = tempo_us * 1000
+
+    def to_tick(time_ns: int) -> int:
+        return int((time_ns * ppq * 2 + beat_ns) // (beat_ns * 2))
+
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(b"MThd" + struct.pack(">IHHH", 6, 0, 1, ppq))
+            f.write(b"MTrk")
+            length_position = f.tell()
+            f.write(bytes(4))
+
+            buffer = bytearray(b"\x00")
+            buffer += bytes(mido.MetaMessage("set_tempo", tempo=tempo_us).bytes())
+            length = 0
+            last_tick = 0
+
+            for deadline_ns, messages, _ in bursts:
+                tick = to_tick(deadline_ns)
+                delta = tick - last_tick
+                if delta > _MAX_DELTA:
+                    raise ValueError(f"Delta time too large for a MIDI file: {delta} ticks")
+                last_tick = tick
+                for message in messages:
+                    buffer += _vlq(delta)
+                    buffer += message
+                    delta = 0
+                if len(buffer) >= _FLUSH_SIZE:
+                    f.write(buffer)
+                    length += len(buffer)
+                    buffer.clear()
+
+            # 終端は演奏時間の位置（最後のイベントより前の場合は最後のイベントと同じ位置）
+            buffer += _vlq(min(max(to_tick(total_duration_ns) - last_tick, 0), _MAX_DELTA))
+            buffer += bytes(mido.MetaMessage("end_of_track").bytes())
+            f.write(buffer)
+            length += len(buffer)
+
+            f.seek(length_position)
+            f.write(struct.pack(">I", length))
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
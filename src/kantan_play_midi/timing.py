@@ -1,19 +1,114 @@
 """
 タイミング計算モジュール
 """
-from typing import List
+from fractions import Fraction
+from typing import Iterator, List, Union
+
+
+DEFAULT_PPQ = 480  # 1拍あたりのティック数（Pulses Per Quarter note）
+BEATS_PER_NOTE = 8  # 各音符はdegreeボタンを8回押すため8拍分
 
 
 class TimingCalculator:
-    """BPMベースのタイミング計算"""
+    """BPMベースのタイミング計算
 
-    def __init__(self, tempo: int):
+    タイムラインは整数のティック（1拍 = ppqティック）で表し、時刻への変換は
+    ティックからの1回の整数演算で行う。秒の加算を繰り返さないため、演奏が長くなっても
+    誤差が蓄積せず、同じティックのイベントは必ず同じ時刻になる。
+    """
+
+    def __init__(self, tempo: Union[int, float], ppq: int = DEFAULT_PPQ):
         """
         Args:
-            tempo: BPM（Beats Per Minute）
+            tempo: BPM（Beats Per Minute）。小数のテンポも正確に扱う
+            ppq: 1拍あたりのティック数
+
+        Raises:
+            ValueError: ppqが正でない場合
         """
+        if ppq <= 0:
+            raise ValueError(f"ppq must be positive, got {ppq}")
         self.tempo = tempo
+        self.ppq = ppq
         self.seconds_per_beat = 60.0 / tempo
+        self.ticks_per_note = BEATS_PER_NOTE * ppq
+        # 1ティックのナノ秒を既約分数で保持し、小数のテンポでも整数演算で変換する
+        ticks_per_minute = Fraction(tempo) * ppq
+        self._ns_numerator = 60_000_000_000 * ticks_per_minute.denominator
+        self._ns_denominator = ticks_per_minute.numerator
+
+    def ticks_to_ns(self, ticks: int) -> int:
+        """
+        ティックを開始からのナノ秒に変換
+
+        Args:
+            ticks: ティック
+
+        Returns:
+            int: ナノ秒（切り捨て）
+        """
+        return ticks * self._ns_numerator // self._ns_denominator
+
+    def ticks_to_seconds(self, ticks: int) -> float:
+        """
+        ティックを開始からの秒に変換
+
+        Args:
+            ticks: ティック
+
+        Returns:
+            float: 秒（ticks_to_nsの値を秒に換算したもの）
+        """
+        return self.ticks_to_ns(ticks) / 1_000_000_000
+
+    def iter_note_ticks(self, note_count: int) -> Iterator[int]:
+        """
+        各音符の開始ティックを順に生成
+
+        Args:
+            note_count: 音符の数
+
+        Yields:
+            int: 各音符の開始ティック
+        """
+        for i in range(note_count):
+            yield i * self.ticks_per_note
+
+    def calculate_degree_press_ticks(self, note_start_tick: int) -> List[int]:
+        """
+        1つの音符内でのdegreeボタン押下ティックを計算
+
+        Args:
+            note_start_tick: 音符の開始ティック
+
+        Returns:
+            List[int]: 8回のdegreeボタン押下ティック
+        """
+        return [note_start_tick + i * self.ppq for i in range(BEATS_PER_NOTE)]
+
+    def calculate_modifier_release_tick(self, note_start_tick: int) -> int:
+        """
+        モディファイア解放のティック（8拍後、次の音符の開始と同じ）
+
+        Args:
+            note_start_tick: 音符の開始ティック
+
+        Returns:
+            int: モディファイア解放のティック
+        """
+        return note_start_tick + self.ticks_per_note
+
+    def get_total_ticks(self, note_count: int) -> int:
+        """
+        全体の演奏時間をティックで計算
+
+        Args:
+            note_count: 音符の数
+
+        Returns:
+            int: 演奏時間（ティック）
+        """
+        return note_count * self.ticks_per_note
 
     def calculate_note_timings(self, note_count: int) -> List[float]:
         """
@@ -25,16 +120,20 @@ class TimingCalculator:
         Returns:
             List[float]: 各音符の開始時刻（秒）
         """
-        timings = []
-        current_time = 0.0
+        return list(self.iter_note_timings(note_count))
+
+    def iter_note_timings(self, note_count: int) -> Iterator[float]:
+        """
+        音符の演奏タイミングを順に生成（calculate_note_timingsの遅延版）
         
-        for i in range(note_count):
-            timings.append(current_time)
-            # 各音符は8回degreeボタンを押すため、8拍分の時間
-            note_duration = self.seconds_per_beat * 8
-            current_time += note_duration
+        Args:
+            note_count: 音符の数
             
-        return timings
+        Yields:
+            float: 各音符の開始時刻（秒）
+        """
+        for tick in self.iter_note_ticks(note_count):
+            yield self.ticks_to_seconds(tick)
 
     def calculate_degree_press_timings(self, note_start_time: float) -> List[float]:
         """
@@ -95,4 +194,4 @@ class TimingCalculator:
         Returns:
             float: 演奏時間（秒）
         """
-        return note_count * self.seconds_per_beat * 8
\ No newline at end of file
+        return self.ticks_to_seconds(self.get_total_ticks(note_count))
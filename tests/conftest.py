@@ -58,4 +58,13 @@ def sample_input_json():
                 "modifier3": 1
             }
         ]
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture(autouse=True)
+def reset_port_manager():
+    """テストごとに共有のPortManagerのハンドルとキャッシュを破棄"""
+    from kantan_play_midi.ports import get_port_manager
+
+    get_port_manager().reset()
+    yield
+    get_port_manager().reset()
@@ -0,0 +1,154 @@
+"""
+asyncio対応MIDI演奏機能のテスト
+"""
+import asyncio
+import time
+import warnings
+
+import pytest
+from unittest.mock import Mock, patch
+
+from kantan_play_midi.async_player import AsyncMIDIPlayer
+from kantan_play_midi.player import PlaybackState
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from kantan_play_midi.exceptions import MIDIDeviceError
+
+
+class TestAsyncMIDIPlayer:
+    """AsyncMIDIPlayerクラスのテスト"""
+
+    @pytest.fixture
+    def mock_instance(self):
+        """接続済みポートを模したMidiOut"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        with patch('rtmidi.MidiOut', return_value=mock_instance):
+            yield mock_instance
+
+    @pytest.fixture
+    def simple_sequence(self):
+        """シンプルなテストシーケンス"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.1, MIDIEventType.NOTE_ON, 64),
+            MIDIEvent(0.15, MIDIEventType.NOTE_OFF, 64),
+        ]
+        return PlaybackSequence(events=events, total_duration=0.2, slot=1, tempo=120)
+
+    def test_invalid_spin_window(self):
+        """負のスピン幅はエラー"""
+        with pytest.raises(ValueError, match="spin_window"):
+            AsyncMIDIPlayer(spin_window=-1)
+
+    def test_play_without_connection(self, simple_sequence):
+        """接続なしでの演奏開始エラー"""
+        player = AsyncMIDIPlayer()
+
+        async def scenario():
+            with pytest.raises(MIDIDeviceError, match="MIDI device not connected"):
+                await player.play_sequence(simple_sequence)
+
+        asyncio.run(scenario())
+
+    def test_play_to_completion(self, mock_instance, simple_sequence):
+        """完了Futureを待つと全イベントが送出されている"""
+        player = AsyncMIDIPlayer()
+        player.connect()
+
+        async def scenario():
+            done = await player.play_sequence(simple_sequence)
+            assert player.get_state() == PlaybackState.PLAYING
+            await asyncio.wait_for(done, timeout=2.0)
+            assert player.get_state() == PlaybackState.STOPPED
+
+        asyncio.run(scenario())
+
+        sent = [bytes(call.args[0]) for call in mock_instance.send_message.call_args_list]
+        assert sent == [
+            bytes([0x90, 60, 127]),
+            bytes([0x80, 60, 0]),
+            bytes([0x90, 64, 127]),
+            bytes([0x80, 64, 0]),
+        ]
+        assert min(player.scheduler.lateness_ns) >= 0
+
+    def test_shares_loop_with_other_tasks(self, mock_instance, simple_sequence):
+        """演奏中も他のタスクが実行される"""
+        player = AsyncMIDIPlayer()
+        player.connect()
+        ticks = []
+
+        async def ticker():
+            while player.get_state() != PlaybackState.STOPPED:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            done = await player.play_sequence(simple_sequence)
+            await asyncio.gather(ticker(), done)
+
+        asyncio.run(scenario())
+        assert len(ticks) >= 5
+
+    def test_pause_resume_stop(self, mock_instance):
+        """一時停止・再開・停止"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        player = AsyncMIDIPlayer()
+        player.connect()
+
+        async def scenario():
+            done = await player.play_sequence(sequence)
+            await asyncio.sleep(0.05)
+
+            await player.pause()
+            assert player.get_state() == PlaybackState.PAUSED
+            paused_at = player.get_current_time()
+            await asyncio.sleep(0.05)
+            assert player.get_current_time() == paused_at
+
+            await player.resume()
+            assert player.get_state() == PlaybackState.PLAYING
+
+            await player.stop()
+            assert player.get_state() == PlaybackState.STOPPED
+            assert done.done()
+
+        asyncio.run(scenario())
+
+        # 停止時に押下中のモディファイアが解放される
+        assert mock_instance.send_message.call_args_list[-1].args[0] == [0x80, 52, 0]
+
+    def test_already_playing_error(self, mock_instance, simple_sequence):
+        """既に演奏中の場合のエラー"""
+        player = AsyncMIDIPlayer()
+        player.connect()
+
+        async def scenario():
+            await player.play_sequence(simple_sequence)
+            with pytest.raises(MIDIDeviceError, match="Already playing"):
+                await player.play_sequence(simple_sequence)
+            await player.disconnect()
+
+        asyncio.run(scenario())
+
+    def test_does_not_check_bandwidth(self, mock_instance):
+        """出力を帯域制限しないため、演奏時のコンパイルで伝送帯域を検査しない"""
+        events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note) for note in range(52, 60)]
+        events.append(MIDIEvent(0.001, MIDIEventType.NOTE_OFF, 52))
+        sequence = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+        player = AsyncMIDIPlayer()
+        player.connect()
+
+        async def scenario():
+            await player.play_sequence(sequence)
+            await player.disconnect()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            asyncio.run(scenario())
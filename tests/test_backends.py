@@ -0,0 +1,137 @@
+"""
+MIDI出力バックエンドのテスト
+"""
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from kantan_play_midi.backends import LoopbackBackend, RtMidiBackend
+from kantan_play_midi.player import MIDIPlayer, PlaybackState
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from kantan_play_midi.exceptions import MIDIDeviceError
+
+
+class TestRtMidiBackend:
+    """RtMidiBackendクラスのテスト"""
+
+    @patch('rtmidi.MidiOut')
+    def test_open_and_close(self, mock_midi_out):
+        """ポートの接続と切断"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["Port1", "Port2"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        backend = RtMidiBackend()
+        assert backend.open("Port2") == "Port2"
+        mock_instance.open_port.assert_called_once_with(1)
+        assert backend.is_open()
+
+        backend.send_message([0x90, 60, 127])
+        mock_instance.send_message.assert_called_once_with([0x90, 60, 127])
+
+        backend.close()
+        assert not backend.is_open()
+        # ハンドルは閉じずにプールされ、再接続ではポートを開き直さない
+        mock_instance.close_port.assert_not_called()
+        assert backend.open("Port2") == "Port2"
+        mock_instance.open_port.assert_called_once_with(1)
+
+        backend.close()
+        backend.port_manager.reset()
+        mock_instance.close_port.assert_called_once()
+
+    @patch('rtmidi.MidiOut')
+    def test_discard(self, mock_midi_out):
+        """破棄した接続のハンドルはプールに残らない"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["Port1"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        backend = RtMidiBackend()
+        backend.open("Port1")
+        backend.discard()
+
+        assert not backend.is_open()
+        assert backend.port_manager.pooled_ports() == {}
+        mock_instance.close_port.assert_called_once()
+
+    def test_send_without_open(self):
+        """未接続での送信エラー"""
+        with pytest.raises(MIDIDeviceError, match="MIDI device not connected"):
+            RtMidiBackend().send_message([0x90, 60, 127])
+
+
+class TestLoopbackBackend:
+    """LoopbackBackendクラスのテスト"""
+
+    def test_ports(self):
+        """ポートの列挙と接続"""
+        backend = LoopbackBackend(port_names=["A", "B"])
+        assert backend.get_ports() == ["A", "B"]
+        assert backend.open() == "A"
+        assert backend.open("B") == "B"
+
+        with pytest.raises(MIDIDeviceError, match="MIDI port 'C' not found"):
+            backend.open("C")
+
+    def test_records_messages(self):
+        """送信したメッセージが送信時刻とともに記録される"""
+        backend = LoopbackBackend()
+        backend.open()
+
+        before = time.perf_counter_ns()
+        backend.send_message([0x90, 60, 127])
+        backend.send_message(bytes([0x80, 60, 0]))
+        after = time.perf_counter_ns()
+
+        messages = backend.get_messages()
+        assert [message for _, message in messages] == [
+            bytes([0x90, 60, 127]),
+            bytes([0x80, 60, 0]),
+        ]
+        assert all(before <= timestamp <= after for timestamp, _ in messages)
+
+        backend.clear()
+        assert backend.get_messages() == []
+
+    def test_capacity(self):
+        """容量を超えたメッセージは記録されない"""
+        backend = LoopbackBackend(capacity=2)
+        backend.open()
+        for note in range(5):
+            backend.send_message([0x90, note, 127])
+
+        assert backend.count == 2
+        assert backend.dropped == 3
+
+    def test_send_without_open(self):
+        """未接続での送信エラー"""
+        with pytest.raises(MIDIDeviceError, match="MIDI device not connected"):
+            LoopbackBackend().send_message([0x90, 60, 127])
+
+    def test_player_with_loopback(self):
+        """MIDIPlayerをハードウェアなしで演奏できる"""
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+        assert player.midi_port == "Loopback"
+
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.1, slot=1, tempo=120)
+        player.play_sequence(sequence)
+        time.sleep(0.2)
+        assert player.get_state() == PlaybackState.STOPPED
+
+        (on_time, on), (off_time, off) = backend.get_messages()
+        assert on == bytes([0x90, 60, 127])
+        assert off == bytes([0x80, 60, 0])
+        assert off_time - on_time > 45_000_000
+
+        player.disconnect()
+        assert not player.is_connected()
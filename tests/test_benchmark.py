@@ -0,0 +1,60 @@
+"""
+タイミングベンチマークのテスト
+"""
+import json
+
+from click.testing import CliRunner
+
+from kantan_play_midi.benchmark import generate_performance, run_benchmark_suite, main
+from kantan_play_midi.config import MIDIConfig
+
+
+class TestBenchmark:
+    """ベンチマークのテスト"""
+
+    def test_generate_performance(self):
+        """合成演奏データの生成"""
+        performance = generate_performance(tempo=300, note_count=10, modifier_density=1.0)
+
+        assert performance.tempo == 300
+        assert len(performance.notes) == 10
+        assert all(note.modifier1 > 0 for note in performance.notes)
+
+        # 同じシードなら同じデータ
+        assert generate_performance(300, 10, 0.5, seed=1) == generate_performance(300, 10, 0.5, seed=1)
+
+        no_modifiers = generate_performance(tempo=300, note_count=10, modifier_density=0.0)
+        assert all(note.modifier1 == 0 for note in no_modifiers.notes)
+
+    def test_run_benchmark_suite(self, temp_midi_config_file):
+        """ベンチマークの実行結果"""
+        report = run_benchmark_suite(
+            MIDIConfig(temp_midi_config_file),
+            tempos=[600],
+            note_counts=[1],
+            modifier_densities=[1.0],
+        )
+
+        assert len(report["results"]) == 1
+        result = report["results"][0]
+        assert result["tempo"] == 600
+        # スロット押下(2) + モディファイア3つ(6) + degree 8回押下(16)
+        assert result["messages"] == 24
+        assert 0.0 <= result["lateness"]["p50"] <= result["lateness"]["p99"] <= result["lateness"]["max"]
+        assert result["cpu_time"] >= 0.0
+        assert result["elapsed"] >= result["duration"]
+
+    def test_cli_json_output(self, temp_midi_config_file, tmp_path):
+        """CLIの結果がJSONで書き出される"""
+        output = tmp_path / "bench.json"
+        result = CliRunner().invoke(main, [
+            '--config', str(temp_midi_config_file),
+            '--tempos', '600',
+            '--notes', '1',
+            '--modifier-densities', '0',
+            '--output', str(output),
+        ])
+
+        assert result.exit_code == 0, result.output
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert report["results"][0]["modifier_density"] == 0.0
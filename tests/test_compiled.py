@@ -0,0 +1,244 @@
+"""
+コンパイル済みシーケンスのテスト
+"""
+import warnings
+
+import pytest
+
+from kantan_play_midi.compiled import CompiledSequence, byte_time_ns
+from kantan_play_midi.sequence import MIDIEvent, MIDIEventType, PlaybackSequence
+
+
+class TestCompiledSequence:
+    """CompiledSequenceクラスのテスト"""
+
+    @pytest.fixture
+    def sequence(self):
+        """同時刻のイベントを含むシーケンス"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60, velocity=100),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.5, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.55, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(1.0, MIDIEventType.NOTE_OFF, 52),
+        ]
+        return PlaybackSequence(events=events, total_duration=1.0, slot=1, tempo=120)
+
+    def test_groups_simultaneous_events(self, sequence):
+        """同時刻のイベントは1つのバーストにまとめられる"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert len(compiled) == 5
+        assert list(compiled.deadlines_ns) == [
+            0, 50_000_000, 500_000_000, 550_000_000, 1_000_000_000
+        ]
+        assert compiled.bursts[0] == (bytes([0x90, 52, 127]), bytes([0x90, 60, 100]))
+        assert compiled.bursts[1] == (bytes([0x80, 60, 0]),)
+        assert compiled.event_count == 6
+        assert compiled.total_duration_ns == 1_000_000_000
+
+    def test_note_masks(self, sequence):
+        """バーストごとの押下・解放マスク"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert compiled.note_masks[0] == ((1 << 52) | (1 << 60), 0)
+        assert compiled.note_masks[1] == (0, 1 << 60)
+        assert compiled.note_masks[4] == (0, 1 << 52)
+
+    def test_channel_encoding(self, sequence):
+        """チャンネルがステータスバイトに反映される"""
+        compiled = CompiledSequence.from_sequence(sequence, channel=3)
+
+        assert compiled.bursts[0][0][0] == 0x93
+        assert compiled.bursts[1][0][0] == 0x83
+
+    def test_slot_press_expanded_to_note_pair(self):
+        """スロット押下はノートオンと押下時間後のノートオフに展開される"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.0, MIDIEventType.SLOT_PRESS, 24, duration=0.05),
+            MIDIEvent(0.02, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_ON, 61),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=1.0, slot=1, tempo=120)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert list(compiled.deadlines_ns) == [0, 20_000_000, 50_000_000]
+        assert compiled.bursts[0] == (bytes([0x90, 60, 127]), bytes([0x90, 24, 127]))
+        assert compiled.bursts[1] == (bytes([0x80, 60, 0]),)
+        # 同時刻ではスロットの解放が先に送出される
+        assert compiled.bursts[2] == (bytes([0x80, 24, 0]), bytes([0x90, 61, 127]))
+
+    def test_slot_press_default_duration(self):
+        """押下時間が未指定の場合は既定の押下時間を使用"""
+        events = [MIDIEvent(1.0, MIDIEventType.SLOT_PRESS, 24)]
+        sequence = PlaybackSequence(events=events, total_duration=2.0, slot=1, tempo=120)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert list(compiled.deadlines_ns) == [1_000_000_000, 1_050_000_000]
+
+    def test_index_at(self, sequence):
+        """指定時刻以降で最初のバーストを二分探索で求める"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert compiled.index_at(0) == 0
+        assert compiled.index_at(50_000_000) == 1
+        assert compiled.index_at(60_000_000) == 2
+        assert compiled.index_at(2_000_000_000) == len(compiled)
+
+    def test_held_before(self, sequence):
+        """指定バーストの直前に押下中のノートを再構成する"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert compiled.held_before(0) == 0
+        assert compiled.held_before(1) == (1 << 52) | (1 << 60)
+        assert compiled.held_before(2) == 1 << 52
+        assert compiled.held_before(3) == (1 << 52) | (1 << 60)
+        assert compiled.held_before(len(compiled)) == 0
+
+    def test_start_state(self, sequence):
+        """指定時刻ちょうどのバーストで解放されるノートは演奏前に押下しない"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert compiled.start_state(0) == (0, 0)
+        assert compiled.start_state(30_000_000) == (1, (1 << 52) | (1 << 60))
+        assert compiled.start_state(50_000_000) == (1, 1 << 52)
+        assert compiled.start_state(1_000_000_000) == (4, 0)
+        assert compiled.start_state(2_000_000_000) == (len(compiled), 0)
+
+    def test_held_before_across_checkpoints(self):
+        """チェックポイントをまたいでも逐次適用と同じ押下状態になる"""
+        events = []
+        for i in range(300):
+            events.append(MIDIEvent(i * 0.01, MIDIEventType.NOTE_ON, i % 7))
+            if i % 3 == 0:
+                events.append(MIDIEvent(i * 0.01 + 0.005, MIDIEventType.NOTE_OFF, (i + 2) % 7))
+        sequence = PlaybackSequence(events=events, total_duration=3.0, slot=1, tempo=120)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        held = 0
+        for index, (on_mask, off_mask) in enumerate(compiled.note_masks):
+            assert compiled.held_before(index) == held
+            held = (held & ~off_mask) | on_mask
+        assert compiled.held_before(len(compiled)) == held
+
+    def test_iter_bursts_from_index(self, sequence):
+        """途中のバーストから列挙する"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert list(compiled.iter_bursts(3)) == list(compiled.iter_bursts())[3:]
+
+    def test_iter_loop(self, sequence):
+        """区間を締め切りをずらして繰り返す"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        bursts = list(compiled.iter_loop(0, 1_000_000_000, count=2))
+
+        # 区間の終端ちょうどのノートオフ（1.0秒）は区間に含まれず、周回の境界で送信される
+        deadlines = [deadline for deadline, _, _ in bursts]
+        assert deadlines == [
+            0, 50_000_000, 500_000_000, 550_000_000,
+            1_000_000_000, 1_000_000_000, 1_050_000_000, 1_500_000_000, 1_550_000_000,
+            2_000_000_000,
+        ]
+        assert bursts[4][1] == (bytes([0x80, 52, 0]),)
+        # 最後の周回の後に区間終端で押下中のノートを解放
+        assert bursts[-1][1] == (bytes([0x80, 52, 0]),)
+        assert bursts[-1][2] == (0, 1 << 52)
+
+    def test_iter_loop_wrap_reconciles_held_notes(self, sequence):
+        """周回の境界で区間終端の押下状態を始端の状態に合わせる"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        # 0.5秒から0.52秒: 始端では52のみ、終端では52と60が押下中
+        bursts = list(compiled.iter_loop(500_000_000, 520_000_000, count=2))
+
+        assert bursts[0] == (500_000_000, (bytes([0x90, 60, 127]),), (1 << 60, 0))
+        assert bursts[1] == (520_000_000, (bytes([0x80, 60, 0]),), (0, 1 << 60))
+        assert bursts[2] == (520_000_000, (bytes([0x90, 60, 127]),), (1 << 60, 0))
+        assert bursts[3][0] == 540_000_000
+        assert bursts[3][1] == (bytes([0x80, 52, 0]), bytes([0x80, 60, 0]))
+
+    def test_iter_loop_start_on_release(self, sequence):
+        """区間の始端ちょうどで解放されるノートは始端の押下状態に含めない"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        # 0.05秒から0.52秒: 始端のバーストで60が解放されるため、始端では52のみが押下中
+        bursts = list(compiled.iter_loop(50_000_000, 520_000_000, count=2))
+
+        assert bursts[0] == (50_000_000, (bytes([0x80, 60, 0]),), (0, 1 << 60))
+        assert bursts[2] == (520_000_000, (bytes([0x80, 60, 0]),), (0, 1 << 60))
+        assert bursts[-1][2] == (0, 1 << 52 | 1 << 60)
+        assert all(bytes([0x90, 52, 127]) not in burst for _, burst, _ in bursts)
+
+    def test_iter_loop_infinite(self, sequence):
+        """繰り返し回数を指定しない場合は無限に繰り返す"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        bursts = compiled.iter_loop(0, 1_000_000_000)
+        deadlines = [next(bursts)[0] for _ in range(39)]
+
+        # 1周目は4バースト、2周目以降は境界のバーストを含めて5バースト
+        assert deadlines[-1] == 7_550_000_000
+
+    def test_iter_loop_invalid(self, sequence):
+        """不正な区間や繰り返し回数"""
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        with pytest.raises(ValueError, match="Invalid loop region"):
+            compiled.iter_loop(1_000_000_000, 1_000_000_000)
+        with pytest.raises(ValueError, match="Loop count"):
+            compiled.iter_loop(0, 1_000_000_000, count=0)
+        with pytest.raises(ValueError, match="no events"):
+            compiled.iter_loop(100_000_000, 200_000_000)
+
+    def test_note_offs_before_note_ons(self):
+        """バースト内ではノートオフがノートオンより先に並ぶ"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.5, MIDIEventType.NOTE_ON, 53),
+            MIDIEvent(0.5, MIDIEventType.NOTE_OFF, 52),
+            MIDIEvent(0.5, MIDIEventType.NOTE_ON, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=1.0, slot=1, tempo=120)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert compiled.bursts[1] == (
+            bytes([0x80, 52, 0]), bytes([0x90, 53, 127]), bytes([0x90, 60, 127]),
+        )
+        assert compiled.note_masks[1] == ((1 << 53) | (1 << 60), 1 << 52)
+
+    def test_byte_time(self):
+        """DIN MIDIの1バイトは320マイクロ秒"""
+        assert byte_time_ns(31250) == 320_000
+        with pytest.raises(ValueError, match="baud_rate"):
+            byte_time_ns(0)
+
+    def test_max_link_delay(self):
+        """前のバーストを送出しきる前に次の締め切りが来ると遅れになる"""
+        events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note) for note in range(52, 57)]
+        events.append(MIDIEvent(0.002, MIDIEventType.NOTE_ON, 60))
+        sequence = PlaybackSequence(events=events, total_duration=1.0, slot=1, tempo=120)
+
+        with pytest.warns(UserWarning, match="sustainable MIDI message rate"):
+            compiled = CompiledSequence.from_sequence(sequence)
+
+        # 5メッセージ x 3バイト x 320us = 4.8ms, 2ms後の締め切りに対して2.8msの遅れ
+        assert compiled.max_link_delay(31250) == (2_800_000, 2_000_000)
+        assert compiled.max_link_delay(31250 * 10) == (0, 0)
+
+    def test_no_warning_within_bandwidth(self, sequence):
+        """帯域内のシーケンスでは警告しない"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            CompiledSequence.from_sequence(sequence)
+
+    def test_empty_sequence(self):
+        """空のシーケンス"""
+        sequence = PlaybackSequence(events=[], total_duration=0.0, slot=1, tempo=120)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert len(compiled) == 0
+        assert compiled.bursts == ()
+        assert compiled.held_before(0) == 0
@@ -0,0 +1,116 @@
+"""
+演奏メトリクスのテスト
+"""
+import json
+import time
+
+from unittest.mock import patch
+
+from kantan_play_midi.metrics import PlaybackMetrics
+from kantan_play_midi.backends import LoopbackBackend
+from kantan_play_midi.player import MIDIPlayer
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+
+
+class TestPlaybackMetrics:
+    """PlaybackMetricsクラスのテスト"""
+
+    def test_observe_burst(self):
+        """バーストの記録"""
+        metrics = PlaybackMetrics(lateness_buckets_ns=[1_000, 1_000_000])
+        metrics.observe_burst(500, 2, 6)
+        metrics.observe_burst(2_000, 1, 3)
+        metrics.observe_burst(5_000_000, 1, 3)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["events_sent"] == 4
+        assert snapshot["bytes_sent"] == 12
+        assert snapshot["max_loop_stall"] == 0.005
+        assert snapshot["lateness"]["buckets"] == [
+            (1e-06, 2), (0.001, 1), (float("inf"), 1)
+        ]
+        assert snapshot["lateness"]["count"] == 4
+
+    def test_snapshot_is_a_copy(self):
+        """スナップショットは以後の更新の影響を受けない"""
+        metrics = PlaybackMetrics()
+        snapshot = metrics.snapshot()
+        metrics.observe_burst(0, 1, 3)
+
+        assert snapshot["events_sent"] == 0
+        assert snapshot["lateness"]["count"] == 0
+
+    def test_to_json(self):
+        """JSON形式の出力"""
+        metrics = PlaybackMetrics(lateness_buckets_ns=[1_000])
+        metrics.observe_burst(10, 1, 3)
+        data = json.loads(metrics.to_json())
+
+        assert data["events_sent"] == 1
+        assert data["lateness"]["buckets"] == [
+            {"le": 1e-06, "count": 1}, {"le": "+Inf", "count": 0}
+        ]
+
+    def test_to_prometheus(self):
+        """Prometheusテキスト形式の出力"""
+        metrics = PlaybackMetrics(lateness_buckets_ns=[1_000, 1_000_000])
+        metrics.observe_burst(500, 2, 6)
+        metrics.observe_burst(2_000, 1, 3)
+        metrics.send_errors += 1
+        text = metrics.to_prometheus()
+
+        assert "# TYPE kantan_play_midi_events_sent_total counter" in text
+        assert "kantan_play_midi_events_sent_total 3" in text
+        assert "kantan_play_midi_send_errors_total 1" in text
+        assert 'kantan_play_midi_lateness_seconds_bucket{le="1e-06"} 2' in text
+        assert 'kantan_play_midi_lateness_seconds_bucket{le="0.001"} 3' in text
+        assert 'kantan_play_midi_lateness_seconds_bucket{le="+Inf"} 3' in text
+        assert "kantan_play_midi_lateness_seconds_count 3" in text
+
+    def test_player_updates_metrics(self):
+        """演奏中にプレイヤーのメトリクスが更新される"""
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.1, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.1, slot=1, tempo=120)
+
+        player.play_sequence(sequence)
+        player.pause()
+        time.sleep(0.02)
+        player.resume()
+        player.wait(2.0)
+
+        snapshot = player.metrics.snapshot()
+        assert snapshot["events_sent"] == 4
+        assert snapshot["bytes_sent"] == 12
+        assert snapshot["send_errors"] == 0
+        assert snapshot["pause_time"] >= 0.02
+        assert snapshot["lateness"]["count"] == 4
+
+    def test_failed_sends_are_not_counted_as_sent(self):
+        """送信に失敗したメッセージは送出数に含めず、失敗数として数える"""
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.01, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+
+        with patch.object(backend, "send_message", side_effect=OSError("device gone")):
+            player.play_sequence(sequence)
+            player.wait(2.0)
+
+        snapshot = player.metrics.snapshot()
+        assert snapshot["events_sent"] == 0
+        assert snapshot["bytes_sent"] == 0
+        assert snapshot["lateness"]["count"] == 0
+        assert snapshot["send_errors"] == 2
+        assert snapshot["messages_failed"] == 2
+        assert "kantan_play_midi_messages_failed_total 2" in player.metrics.to_prometheus()
@@ -0,0 +1,168 @@
+"""
+複数ポート同期演奏機能のテスト
+"""
+from array import array
+import time
+import warnings
+
+import pytest
+from unittest.mock import Mock, patch
+
+from kantan_play_midi.multi_player import MultiPortPlayer
+from kantan_play_midi.compiled import CompiledSequence
+from kantan_play_midi.player import PlaybackState
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from kantan_play_midi.exceptions import MIDIDeviceError
+
+
+class TestMultiPortPlayer:
+    """MultiPortPlayerクラスのテスト"""
+
+    @pytest.fixture
+    def log(self):
+        """全ポートの送出を (ポート名, メッセージ) の順で記録するリスト"""
+        return []
+
+    @pytest.fixture
+    def player(self, log):
+        """2つのポートに接続済みのプレイヤー"""
+        def make_midi_out():
+            midi_out = Mock()
+            midi_out.get_ports.return_value = ["PortA", "PortB"]
+            midi_out.is_port_open.return_value = True
+            midi_out.open_port.side_effect = lambda index: setattr(
+                midi_out, "port_name", ["PortA", "PortB"][index]
+            )
+            midi_out.send_message.side_effect = lambda message: log.append(
+                (midi_out.port_name, bytes(message))
+            )
+            return midi_out
+
+        with patch('rtmidi.MidiOut', side_effect=make_midi_out):
+            player = MultiPortPlayer()
+            player.connect("PortA")
+            player.connect("PortB")
+            yield player
+            player.disconnect()
+
+    def _sequence(self, note, timestamps):
+        events = []
+        for timestamp in timestamps:
+            events.append(MIDIEvent(timestamp, MIDIEventType.NOTE_ON, note))
+            events.append(MIDIEvent(timestamp + 0.01, MIDIEventType.NOTE_OFF, note))
+        return PlaybackSequence(events=events, total_duration=0.2, slot=1, tempo=120)
+
+    def test_ports(self, player):
+        """接続順のポート一覧"""
+        assert player.ports == ["PortA", "PortB"]
+
+    def test_unconnected_port(self, player):
+        """未接続のポートを指定した場合のエラー"""
+        with pytest.raises(MIDIDeviceError, match="not connected"):
+            player.play_sequences([("PortC", self._sequence(60, [0.0]))])
+
+    def test_merged_deadline_order(self, player, log):
+        """全ポートのイベントが1つのクロック上で締め切り順に送出される"""
+        player.play_sequences([
+            ("PortA", self._sequence(60, [0.0, 0.1])),
+            ("PortB", self._sequence(64, [0.05, 0.1])),
+        ])
+        time.sleep(0.3)
+        assert player.get_state() == PlaybackState.STOPPED
+
+        assert log == [
+            ("PortA", bytes([0x90, 60, 127])),
+            ("PortA", bytes([0x80, 60, 0])),
+            ("PortB", bytes([0x90, 64, 127])),
+            ("PortB", bytes([0x80, 64, 0])),
+            ("PortA", bytes([0x90, 60, 127])),
+            ("PortB", bytes([0x90, 64, 127])),
+            ("PortA", bytes([0x80, 60, 0])),
+            ("PortB", bytes([0x80, 64, 0])),
+        ]
+        assert len(player.scheduler.lateness_ns) == 8
+
+    def test_does_not_check_bandwidth(self, player):
+        """出力を帯域制限しないため、演奏時のコンパイルで伝送帯域を検査しない"""
+        events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note) for note in range(52, 60)]
+        events.append(MIDIEvent(0.001, MIDIEventType.NOTE_OFF, 52))
+        dense = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            player.play_sequences([("PortA", dense), ("PortB", dense)])
+        time.sleep(0.05)
+        assert player.get_state() == PlaybackState.STOPPED
+
+    def test_stop_releases_all_ports(self, player, log):
+        """停止時に各ポートの押下中ノートが解放される"""
+        held = PlaybackSequence(
+            events=[
+                MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+                MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 52),
+            ],
+            total_duration=10.0, slot=1, tempo=120
+        )
+        player.play_sequences([("PortA", held), ("PortB", held)])
+        time.sleep(0.05)
+
+        player.pause()
+        assert player.get_state() == PlaybackState.PAUSED
+        player.resume()
+
+        del log[:]
+        player.stop()
+        assert player.get_state() == PlaybackState.STOPPED
+        assert sorted(log) == [
+            ("PortA", bytes([0x80, 52, 0])),
+            ("PortB", bytes([0x80, 52, 0])),
+        ]
+
+    def test_play_while_paused_replaces_playback(self, player, log):
+        """一時停止中に演奏を開始すると、前の演奏を停止してから置き換える"""
+        held = PlaybackSequence(
+            events=[
+                MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+                MIDIEvent(0.1, MIDIEventType.NOTE_OFF, 52),
+            ],
+            total_duration=0.1, slot=1, tempo=120
+        )
+        player.play_sequences([("PortA", held), ("PortB", held)])
+        time.sleep(0.05)
+        player.pause()
+
+        del log[:]
+        player.play_sequences([("PortA", self._sequence(60, [0.0, 0.1]))])
+        time.sleep(0.3)
+        assert player.get_state() == PlaybackState.STOPPED
+
+        # 前の演奏の解放のあと、新しい演奏のメッセージだけが送出される
+        assert sorted(log[:2]) == [
+            ("PortA", bytes([0x80, 52, 0])),
+            ("PortB", bytes([0x80, 52, 0])),
+        ]
+        assert log[2:] == [
+            ("PortA", bytes([0x90, 60, 127])),
+            ("PortA", bytes([0x80, 60, 0])),
+            ("PortA", bytes([0x90, 60, 127])),
+            ("PortA", bytes([0x80, 60, 0])),
+        ]
+
+    def test_dispatch_error_stops_playback(self, player, log):
+        """送出処理が例外で終了した場合は演奏を停止し、全ポートの押下中ノートを解放する"""
+        # バーストより締め切りが多い不正なシーケンス（2つ目のバーストの後に失敗する）
+        broken = CompiledSequence(
+            deadlines_ns=array('q', [0, 10_000_000, 20_000_000]),
+            bursts=((bytes([0x90, 52, 127]),), (bytes([0x90, 60, 127]),)),
+            note_masks=((1 << 52, 0), (1 << 60, 0)),
+            total_duration_ns=30_000_000,
+            event_count=2,
+        )
+        player.play_sequences([("PortA", broken), ("PortB", self._sequence(64, [0.0]))])
+        time.sleep(0.1)
+
+        assert player.get_state() == PlaybackState.STOPPED
+        assert sorted(log[-2:]) == [
+            ("PortA", bytes([0x80, 52, 0])),
+            ("PortA", bytes([0x80, 60, 0])),
+        ]
@@ -2,14 +2,34 @@
 MIDI演奏機能のテスト
 """
 import time
+import warnings
 import pytest
 from unittest.mock import Mock, patch
 
 from kantan_play_midi.player import MIDIPlayer, PlaybackState
-from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+from kantan_play_midi.sequence import PlaybackSequence, EventStream, MIDIEvent, MIDIEventType
+from kantan_play_midi.backends import LoopbackBackend
 from kantan_play_midi.exceptions import MIDIDeviceError
 
 
+class FlakyBackend(LoopbackBackend):
+    """downの間は送信も接続も失敗するループバックバックエンド"""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+
+    def open(self, port_name=None):
+        if self.down:
+            raise MIDIDeviceError("device unavailable")
+        return super().open(port_name)
+
+    def send_message(self, message):
+        if self.down:
+            raise MIDIDeviceError("device unavailable")
+        super().send_message(message)
+
+
 class TestMIDIPlayer:
     """MIDIPlayerクラスのテスト"""
 
@@ -43,7 +63,9 @@ class TestMIDIPlayer:
 
         ports = player.get_available_ports()
         assert ports == ["Port1", "Port2"]
-        mock_instance.delete.assert_called_once()
+        # 列挙結果はキャッシュされ、MidiOutを繰り返し生成しない
+        assert player.get_available_ports() == ["Port1", "Port2"]
+        mock_midi_out.assert_called_once()
 
     @patch('rtmidi.MidiOut')
     def test_connect_success(self, mock_midi_out, player):
@@ -137,6 +159,604 @@ class TestMIDIPlayer:
         player.stop()
         assert player.get_state() == PlaybackState.STOPPED
 
+    @patch('rtmidi.MidiOut')
+    def test_playback_records_lateness(self, mock_midi_out, player, simple_sequence):
+        """演奏したイベントごとに遅延が記録される"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        player.connect()
+        player.play_sequence(simple_sequence)
+
+        time.sleep(0.8)
+        assert player.get_state() == PlaybackState.STOPPED
+
+        assert len(player.scheduler.lateness_ns) == len(simple_sequence.events)
+        # 締め切りより早く送出されたイベントはない
+        assert min(player.scheduler.lateness_ns) >= 0
+
+    @patch('rtmidi.MidiOut')
+    def test_playback_sends_encoded_messages(self, mock_midi_out, player, simple_sequence):
+        """コンパイル済みのメッセージが時刻順に送出される"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        player.connect()
+        player.play_sequence(simple_sequence)
+        time.sleep(0.8)
+
+        sent = [bytes(call.args[0]) for call in mock_instance.send_message.call_args_list]
+        assert sent[:4] == [
+            bytes([0x90, 60, 127]),
+            bytes([0x80, 60, 0]),
+            bytes([0x90, 64, 127]),
+            bytes([0x80, 64, 0]),
+        ]
+
+    @patch('rtmidi.MidiOut')
+    def test_slot_press_does_not_block_playback(self, mock_midi_out, player):
+        """スロット押下中も後続イベントが遅延しない"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        events = [
+            MIDIEvent(0.0, MIDIEventType.SLOT_PRESS, 24, duration=0.2),
+            MIDIEvent(0.01, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.02, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.3, slot=1, tempo=120)
+
+        player.connect()
+        player.play_sequence(sequence)
+        time.sleep(0.5)
+
+        sent = [bytes(call.args[0]) for call in mock_instance.send_message.call_args_list]
+        assert sent[:4] == [
+            bytes([0x90, 24, 127]),
+            bytes([0x90, 60, 127]),
+            bytes([0x80, 60, 0]),
+            bytes([0x80, 24, 0]),
+        ]
+        # ノート60はスロット押下の解放を待たずに送出される
+        assert max(player.scheduler.lateness_ns[:3]) < 100_000_000
+
+    def test_play_stream(self):
+        """遅延生成されるイベントを先読みしながら演奏する"""
+        consumed = []
+
+        def events():
+            for i in range(20):
+                consumed.append(i)
+                yield MIDIEvent(i * 0.01, MIDIEventType.NOTE_ON, 60)
+                yield MIDIEvent(i * 0.01 + 0.005, MIDIEventType.NOTE_OFF, 60)
+
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+        stream = EventStream(events=events(), total_duration=0.2, slot=1, tempo=120)
+
+        player.play_stream(stream, lookahead=4)
+        time.sleep(0.05)
+        # 先読みバッファを超えて先まで生成されていない
+        assert len(consumed) < 20
+
+        assert player.wait(2.0)
+        assert len(consumed) == 20
+        assert backend.count == 40
+        assert min(player.scheduler.lateness_ns) >= 0
+
+    def test_play_stream_invalid_lookahead(self, player):
+        """先読み数は1以上"""
+        stream = EventStream(events=iter([]), total_duration=0.0, slot=1, tempo=120)
+        with pytest.raises(ValueError, match="lookahead"):
+            player.play_stream(stream, lookahead=0)
+
+    def test_play_stream_prefills_before_start(self):
+        """先読みバッファは演奏開始時刻を決める前に満たされ、最初のイベントが遅れない"""
+        def events():
+            for i in range(8):
+                time.sleep(0.005)
+                yield MIDIEvent(i * 0.01, MIDIEventType.NOTE_ON, 60)
+
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+        stream = EventStream(events=events(), total_duration=0.1, slot=1, tempo=120)
+
+        player.play_stream(stream, lookahead=4)
+        assert player.wait(2.0)
+
+        first_ns = backend.get_messages()[0][0]
+        assert first_ns - player.start_ns < 5_000_000
+
+    def test_play_stream_error_stops_playback(self):
+        """演奏中にイベントの生成が失敗した場合は停止し、押下中のノートを解放する"""
+        def events():
+            yield MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52)
+            for i in range(4):
+                yield MIDIEvent(0.01 * (i + 1), MIDIEventType.NOTE_ON, 60 + i)
+            raise RuntimeError("broken stream")
+
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+        stream = EventStream(events=events(), total_duration=0.1, slot=1, tempo=120)
+
+        player.play_stream(stream, lookahead=1)
+        assert player.wait(2.0)
+
+        assert player.get_state() == PlaybackState.STOPPED
+        assert player.get_held_notes() == []
+        assert bytes([0x80, 52, 0]) in [message for _, message in backend.get_messages()]
+
+        # 次の演奏を開始できる
+        player.play_stream(EventStream(events=iter([]), total_duration=0.0, slot=1, tempo=120))
+        assert player.wait(2.0)
+
+    def test_play_sequence_start_at(self):
+        """途中から演奏を始め、その時点で押下中のノートを先に押下する"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.1, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(5.0, MIDIEventType.NOTE_ON, 64),
+            MIDIEvent(5.02, MIDIEventType.NOTE_OFF, 64),
+            MIDIEvent(5.03, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=5.03, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        start = time.perf_counter()
+        player.play_sequence(sequence, start_at=4.99)
+        assert player.wait(2.0)
+
+        assert time.perf_counter() - start < 1.0
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 64, 127]),
+            bytes([0x80, 64, 0]),
+            bytes([0x80, 52, 0]),
+        ]
+
+    def test_play_sequence_start_at_boundary(self):
+        """音符の境界から演奏を始めても、その時刻に解放されるモディファイアを押下しない"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.8, MIDIEventType.NOTE_OFF, 52),
+            MIDIEvent(0.8, MIDIEventType.NOTE_ON, 54),
+            MIDIEvent(0.85, MIDIEventType.NOTE_OFF, 54),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.85, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_sequence(sequence, start_at=0.8)
+        assert player.wait(2.0)
+
+        messages = [message for _, message in backend.get_messages()]
+        assert bytes([0x90, 52, 127]) not in messages
+        assert messages[-2:] == [bytes([0x90, 54, 127]), bytes([0x80, 54, 0])]
+
+    def test_play_sequence_negative_start_at(self, player, simple_sequence):
+        """負の開始位置は指定できない"""
+        with pytest.raises(ValueError, match="start_at"):
+            player.play_sequence(simple_sequence, start_at=-1.0)
+
+    def test_play_loop(self):
+        """コンパイル済みシーケンスを締め切りをずらして繰り返し演奏する"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.01, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.02, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_loop(sequence, count=3)
+        assert player.wait(2.0)
+
+        messages = backend.get_messages()
+        assert [message for _, message in messages] == [
+            bytes([0x90, 60, 127]), bytes([0x80, 60, 0]),
+        ] * 3
+        # 周回の始端の締め切り（送信時刻からスケジューラが記録した遅延を引いた時刻）は
+        # 区間長の格子上に並ぶ
+        lateness_ns = player.scheduler.lateness_ns
+        deadlines = [messages[i][0] - lateness_ns[i] for i in range(0, 6, 2)]
+        for cycle in range(3):
+            assert deadlines[cycle] - deadlines[0] == pytest.approx(cycle * 20_000_000, abs=2_000_000)
+
+    def test_play_loop_start_on_release(self):
+        """区間の始端ちょうどで解放されるノートは演奏前に押下しない"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.01, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.02, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.03, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.03, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.03, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_loop(sequence, loop_start=0.01, loop_end=0.03, count=1)
+        assert player.wait(2.0)
+
+        assert [message for _, message in backend.get_messages()][:3] == [
+            bytes([0x90, 52, 127]), bytes([0x80, 60, 0]), bytes([0x90, 60, 127]),
+        ]
+
+    def test_play_loop_until_stopped(self):
+        """繰り返し回数を指定しない場合は停止するまで演奏する"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.005, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_loop(sequence)
+        time.sleep(0.1)
+        assert player.get_state() == PlaybackState.PLAYING
+        player.stop()
+
+        assert backend.count >= 10
+        assert player.get_held_notes() == []
+
+    def test_play_loop_invalid_region(self, simple_sequence):
+        """イベントのない区間は繰り返せない"""
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+
+        with pytest.raises(ValueError, match="no events"):
+            player.play_loop(simple_sequence, loop_start=0.7, loop_end=0.9)
+        assert player.get_state() == PlaybackState.STOPPED
+
+    def test_set_tempo(self):
+        """テンポ変更は再コンパイルせずに次のイベントから反映される"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.1, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(1.0, MIDIEventType.NOTE_ON, 62),
+            MIDIEvent(1.1, MIDIEventType.NOTE_OFF, 62),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=1.2, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_sequence(sequence)
+        time.sleep(0.2)
+        position = player.get_current_time()
+        player.set_tempo(240)
+
+        assert player.get_tempo() == pytest.approx(240)
+        # 演奏位置は連続している
+        assert player.get_current_time() == pytest.approx(position, abs=0.01)
+        assert player.wait(2.0)
+
+        timestamps = [timestamp for timestamp, _ in backend.get_messages()]
+        # 0.2秒時点から残り0.8拍相当を2倍速で演奏
+        assert (timestamps[2] - timestamps[0]) / 1e9 == pytest.approx(0.6, abs=0.05)
+        assert (timestamps[3] - timestamps[2]) / 1e9 == pytest.approx(0.05, abs=0.01)
+
+    def test_set_tempo_scales_press_length(self):
+        """テンポ変更ではボタンの押下時間もテンポの比で伸縮する"""
+        events = [
+            MIDIEvent(0.1, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.15, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.2, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_sequence(sequence)
+        player.set_tempo(600)
+        assert player.wait(2.0)
+
+        # 送出時刻から遅延を引いた締め切りで比べる（基準テンポ120での50msの押下は、テンポ600では10ms）
+        messages = backend.get_messages()
+        lateness_ns = player.scheduler.lateness_ns
+        deadlines = [messages[i][0] - lateness_ns[i] for i in range(2)]
+        assert (deadlines[1] - deadlines[0]) / 1e9 == pytest.approx(0.01, abs=0.001)
+
+    def test_set_tempo_while_paused(self):
+        """一時停止中のテンポ変更は演奏位置を変えない"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+
+        player.play_sequence(sequence, start_at=2.0)
+        player.pause()
+        position = player.get_current_time()
+        player.set_tempo(60)
+
+        assert player.get_current_time() == pytest.approx(position)
+        player.stop()
+
+    def test_set_tempo_invalid(self, player):
+        """演奏中でない場合や不正なテンポ"""
+        with pytest.raises(ValueError, match="Tempo must be positive"):
+            player.set_tempo(0)
+        with pytest.raises(MIDIDeviceError, match="No sequence is playing"):
+            player.set_tempo(120)
+
+    def test_pause_does_not_consume_cpu(self):
+        """一時停止中の演奏スレッドはwake()まで眠る"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+
+        player.play_sequence(sequence)
+        player.pause()
+        time.sleep(0.3)
+        player.stop()
+
+        assert player.playback_cpu_time < 0.05
+
+    def test_control_latency(self):
+        """制御コマンドは締め切り待ちの途中でも即座に処理される"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 60),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+        player.play_sequence(sequence)
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        player.pause()
+        player.resume()
+        player.stop()
+
+        assert time.perf_counter() - start < 0.1
+        assert not player._playback_thread.is_alive()
+
+    def test_release_on_pause(self):
+        """一時停止中は押下中のノートを解放し、再開時に押下し直す"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend, release_on_pause=True)
+        player.connect()
+
+        player.play_sequence(sequence)
+        time.sleep(0.05)
+        player.pause()
+        assert player.get_held_notes() == []
+        player.resume()
+        assert player.get_held_notes() == [52]
+        player.stop()
+
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x80, 52, 0]),
+            bytes([0x90, 52, 127]),
+            bytes([0x80, 52, 0]),
+        ]
+
+    def test_bandwidth_shaping(self):
+        """伝送速度を指定するとバースト内のメッセージを伝送時間の間隔で送出する"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 53),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.001, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend, baud_rate=31250)
+        player.connect()
+
+        with pytest.warns(UserWarning):
+            player.play_sequence(sequence)
+        assert player.wait(1.0)
+
+        timestamps = [timestamp - player.start_ns for timestamp, _ in backend.get_messages()]
+        # 1メッセージ = 3バイト x 320us = 960us、4つ目は伝送路が空くまで待つ
+        for index, timestamp in enumerate(timestamps):
+            assert timestamp >= index * 960_000
+        assert timestamps[-1] < 50_000_000
+
+    @pytest.fixture
+    def outage_sequence(self):
+        """モディファイア(52)押下中に切断され、切断中に53が押下されるシーケンス"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.1, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.15, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.2, MIDIEventType.NOTE_ON, 53),
+            MIDIEvent(0.5, MIDIEventType.NOTE_OFF, 52),
+            MIDIEvent(0.55, MIDIEventType.NOTE_OFF, 53),
+        ]
+        return PlaybackSequence(events=events, total_duration=0.6, slot=1, tempo=120)
+
+    def _play_with_outage(self, policy, sequence):
+        """0.05秒から0.3秒まで出力が失われた状態で演奏する"""
+        backend = FlakyBackend()
+        player = MIDIPlayer(backend=backend, reconnect=policy, reconnect_backoff=(0.01, 0.02))
+        player.connect()
+
+        player.play_sequence(sequence)
+        time.sleep(0.05)
+        backend.down = True
+        time.sleep(0.25)
+        backend.down = False
+        assert player.wait(2.0)
+        return player, backend
+
+    def test_reconnect_drop(self, outage_sequence):
+        """drop: 切断中のイベントは破棄し、切断前から押下中のノートだけを押下し直す"""
+        player, backend = self._play_with_outage("drop", outage_sequence)
+
+        messages = backend.get_messages()
+        assert [message for _, message in messages] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 52, 127]),
+            bytes([0x80, 52, 0]),
+            bytes([0x80, 53, 0]),
+        ]
+        # クロックは切断中も進み続けている
+        assert (messages[2][0] - player.start_ns) / 1e9 == pytest.approx(0.5, abs=0.02)
+        assert player.metrics.reconnects == 1
+        assert player.metrics.messages_missed == 2
+
+    def test_reconnect_catch_up(self, outage_sequence):
+        """catch_up: 切断中の押下状態の変化も反映して押下し直す"""
+        player, backend = self._play_with_outage("catch_up", outage_sequence)
+
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 53, 127]),
+            bytes([0x80, 52, 0]),
+            bytes([0x80, 53, 0]),
+        ]
+
+    def test_stop_cancels_reconnect(self, outage_sequence):
+        """停止すると再接続を中止する"""
+        backend = FlakyBackend()
+        player = MIDIPlayer(backend=backend, reconnect="drop", reconnect_backoff=(0.01, 0.02))
+        player.connect()
+
+        player.play_sequence(outage_sequence)
+        time.sleep(0.02)
+        backend.down = True
+        time.sleep(0.15)
+        player.stop()
+        player._reconnect_thread.join(1.0)
+
+        assert not player._reconnect_thread.is_alive()
+        assert player.metrics.reconnects == 0
+
+    def test_stop_while_reopening(self, outage_sequence):
+        """ポートを開き直している間に停止された場合は、開いたポートを閉じて再接続しない"""
+        class StoppingBackend(FlakyBackend):
+            def open(self, port_name=None):
+                if self.player is not None and not self.down:
+                    self.player.stop()
+                return super().open(port_name)
+
+        backend = StoppingBackend()
+        backend.player = None
+        player = MIDIPlayer(backend=backend, reconnect="drop", reconnect_backoff=(0.01, 0.02))
+        player.connect()
+
+        player.play_sequence(outage_sequence)
+        time.sleep(0.02)
+        backend.player = player
+        backend.down = True
+        time.sleep(0.1)
+        backend.down = False
+        player._reconnect_thread.join(1.0)
+
+        assert player.get_state() == PlaybackState.STOPPED
+        assert not backend.is_open()
+        assert player.metrics.reconnects == 0
+
+    @pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+    def test_invalid_reconnect_policy(self):
+        """不正な再接続方針"""
+        with pytest.raises(ValueError, match="reconnect"):
+            MIDIPlayer(backend=LoopbackBackend(), reconnect="retry")
+
+    def test_unlimited_bandwidth_does_not_warn(self):
+        """伝送速度を指定しない場合は伝送帯域を検査しない"""
+        events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note) for note in range(52, 60)]
+        events.append(MIDIEvent(0.001, MIDIEventType.NOTE_OFF, 52))
+        sequence = PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            player.play_sequence(sequence)
+            assert player.wait(1.0)
+            player.play_loop(sequence, count=1)
+            assert player.wait(1.0)
+
+    def test_seek(self):
+        """演奏中に位置を移動し、押下状態の差分だけを送信する"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(5.0, MIDIEventType.NOTE_OFF, 52),
+            MIDIEvent(5.0, MIDIEventType.NOTE_ON, 53),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 53),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        player.play_sequence(sequence)
+        time.sleep(0.05)
+        player.seek(7.0)
+
+        assert player.get_state() == PlaybackState.PLAYING
+        assert 7.0 <= player.get_current_time() < 7.5
+        time.sleep(0.05)
+        assert player.get_held_notes() == [53]
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x80, 52, 0]),
+            bytes([0x90, 53, 127]),
+        ]
+        player.stop()
+
+    def test_seek_while_paused(self):
+        """一時停止中の移動は一時停止したまま位置だけを変える"""
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(10.0, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=10.0, slot=1, tempo=120)
+        player = MIDIPlayer(backend=LoopbackBackend())
+        player.connect()
+
+        player.play_sequence(sequence)
+        player.pause()
+        player.seek(3.0)
+
+        assert player.get_state() == PlaybackState.PAUSED
+        assert player.get_current_time() == pytest.approx(3.0)
+        player.stop()
+
+    def test_seek_without_playback(self, player):
+        """演奏していない場合は移動できない"""
+        with pytest.raises(MIDIDeviceError, match="No seekable sequence"):
+            player.seek(1.0)
+
     @patch('rtmidi.MidiOut')
     def test_pause_resume_functionality(self, mock_midi_out, player, simple_sequence):
         """一時停止・再開機能"""
@@ -206,18 +826,72 @@ class TestMIDIPlayer:
 
     @patch('rtmidi.MidiOut')
     def test_all_notes_off_on_stop(self, mock_midi_out, player):
-        """停止時の全ノートオフ"""
+        """停止時は押下中のノートだけを解放"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        player.connect()
+        player.send_note_on(52)
+        player.send_note_on(60)
+        player.send_note_on(64)
+        player.send_note_off(60)
+        assert player.get_held_notes() == [52, 64]
+
+        mock_instance.send_message.reset_mock()
+        player.stop()
+
+        sent = [call.args[0] for call in mock_instance.send_message.call_args_list]
+        assert sent == [[0x80, 52, 0], [0x80, 64, 0]]
+        assert player.get_held_notes() == []
+
+    @patch('rtmidi.MidiOut')
+    def test_fast_panic_on_stop(self, mock_midi_out):
+        """fast_panic有効時はCC 123/CC 120のみを送信"""
+        mock_instance = Mock()
+        mock_instance.get_ports.return_value = ["TestPort"]
+        mock_instance.is_port_open.return_value = True
+        mock_midi_out.return_value = mock_instance
+
+        player = MIDIPlayer(fast_panic=True)
+        player.connect()
+        player.send_note_on(52)
+        player.send_note_on(60)
+
+        mock_instance.send_message.reset_mock()
+        player.stop()
+
+        sent = [call.args[0] for call in mock_instance.send_message.call_args_list]
+        assert sent == [[0xB0, 123, 0], [0xB0, 120, 0]]
+        assert player.get_held_notes() == []
+
+    @patch('rtmidi.MidiOut')
+    def test_held_notes_tracked_during_playback(self, mock_midi_out, player):
+        """演奏中の押下状態が追跡され、停止時に解放される"""
         mock_instance = Mock()
         mock_instance.get_ports.return_value = ["TestPort"]
         mock_instance.is_port_open.return_value = True
         mock_midi_out.return_value = mock_instance
 
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52),
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(0.05, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(5.0, MIDIEventType.NOTE_OFF, 52),
+        ]
+        sequence = PlaybackSequence(events=events, total_duration=5.0, slot=1, tempo=120)
+
         player.connect()
+        player.play_sequence(sequence)
+        time.sleep(0.2)
+        assert player.get_held_notes() == [52]
+
+        mock_instance.send_message.reset_mock()
         player.stop()
 
-        # 全ノートオフが送信されることを確認
-        # (実際には128回呼ばれるが、呼ばれていることを確認)
-        assert mock_instance.send_message.call_count > 0
+        sent = [call.args[0] for call in mock_instance.send_message.call_args_list]
+        assert sent == [[0x80, 52, 0]]
 
     def test_destructor_cleanup(self, player):
         """デストラクタでのクリーンアップ"""
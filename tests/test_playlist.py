@@ -0,0 +1,150 @@
+"""
+プレイリスト機能のテスト
+"""
+import json
+import time
+import warnings
+
+import pytest
+
+from kantan_play_midi.playlist import Playlist
+from kantan_play_midi.player import MIDIPlayer, PlaybackState
+from kantan_play_midi.backends import LoopbackBackend
+from kantan_play_midi.config import MIDIConfig
+from kantan_play_midi.compiled import CompiledSequence
+from kantan_play_midi.models import Note, Performance
+from kantan_play_midi.processor import PerformanceProcessor
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+
+
+def _sequence(note, duration=0.1, release=True):
+    """1音だけのシーケンス"""
+    events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note)]
+    if release:
+        events.append(MIDIEvent(duration / 2, MIDIEventType.NOTE_OFF, note))
+    return PlaybackSequence(events=events, total_duration=duration, slot=1, tempo=120)
+
+
+class TestPlaylist:
+    """Playlistクラスのテスト"""
+
+    def test_splices_items_on_one_timeline(self):
+        """各曲はそれまでの演奏時間と曲間の分だけずらして連結される"""
+        playlist = Playlist(gap=0.5)
+        playlist.add(_sequence(60))
+        playlist.add(CompiledSequence.from_sequence(_sequence(62)))
+
+        deadlines = [deadline for deadline, _, _ in playlist.iter_bursts()]
+
+        assert deadlines == [0, 50_000_000, 600_000_000, 650_000_000]
+        assert playlist.current_index == 1
+
+    def test_releases_held_notes_between_items(self):
+        """曲の終端で押下中のノートは次の曲の前に解放される"""
+        playlist = Playlist()
+        playlist.add(_sequence(60, release=False))
+        playlist.add(_sequence(62))
+
+        bursts = list(playlist.iter_bursts())
+
+        assert bursts[1] == (100_000_000, (bytes([0x80, 60, 0]),), (0, 1 << 60))
+        assert bursts[2][0] == 100_000_000
+
+    def test_compiles_performances_and_files(self, temp_midi_config_file, tmp_path):
+        """演奏データとJSONファイルはプロセッサでシーケンス生成される"""
+        processor = PerformanceProcessor(MIDIConfig(temp_midi_config_file))
+        path = tmp_path / "song.json"
+        path.write_text(json.dumps({"slot": 2, "tempo": 120, "notes": [{"degree": "1"}]}))
+
+        playlist = Playlist(processor)
+        playlist.add(Performance(slot=1, tempo=120, notes=[Note("1")]))
+        playlist.add(path)
+
+        first = playlist.compile(0)
+        second = playlist.compile(1)
+        bursts = list(playlist.iter_bursts())
+
+        assert first.total_duration_ns == 4_000_000_000
+        assert len(bursts) == len(first) + len(second)
+        assert bursts[len(first)][0] == 4_000_000_000
+
+    def test_performance_requires_processor(self):
+        """プロセッサなしでは演奏データを追加できない"""
+        playlist = Playlist()
+        with pytest.raises(ValueError, match="PerformanceProcessor"):
+            playlist.add(Performance(slot=1, tempo=120, notes=[Note("1")]))
+
+    def test_empty_playlist(self):
+        """空のプレイリストは演奏できない"""
+        with pytest.raises(ValueError, match="empty"):
+            Playlist().iter_bursts()
+
+    def test_player_plays_playlist_gaplessly(self):
+        """プレイヤーはプレイリストを1つのクロックで連続演奏する"""
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        playlist = Playlist()
+        for note in (60, 62, 64):
+            playlist.add(_sequence(note, duration=0.05))
+
+        player.play_playlist(playlist)
+        assert player.wait(2.0)
+
+        messages = backend.get_messages()
+        assert [message[1] for _, message in messages] == [60, 60, 62, 62, 64, 64]
+        # 各曲の先頭の締め切り（送信時刻からスケジューラが記録した遅延を引いた時刻）は
+        # total_durationの格子上に並ぶ
+        lateness_ns = player.scheduler.lateness_ns
+        deadlines = [messages[i][0] - lateness_ns[i] for i in range(0, 6, 2)]
+        for item in range(3):
+            assert deadlines[item] - deadlines[0] == pytest.approx(item * 50_000_000, abs=2_000_000)
+
+    def test_failed_item_is_skipped(self, tmp_path):
+        """読み込みに失敗した曲は飛ばし、演奏を続ける"""
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        playlist = Playlist()
+        playlist.add(_sequence(60, duration=0.05))
+        playlist.add(tmp_path / "missing.kpseq")
+        playlist.add(_sequence(64, duration=0.05))
+
+        player.play_playlist(playlist)
+        assert player.wait(2.0)
+
+        assert [message[1] for _, message in backend.get_messages()] == [60, 60, 64, 64]
+        assert playlist.skipped == [1]
+        assert player.get_state() == PlaybackState.STOPPED
+
+    def test_items_added_during_playback(self):
+        """演奏中に追加された曲も連結される"""
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        playlist = Playlist()
+        playlist.add(_sequence(60, duration=0.1))
+        player.play_playlist(playlist)
+        time.sleep(0.02)
+        playlist.add(_sequence(62, duration=0.1))
+
+        assert player.wait(2.0)
+        assert [message[1] for _, message in backend.get_messages()] == [60, 60, 62, 62]
+
+    def test_compile_does_not_check_bandwidth_by_default(self):
+        """伝送速度を指定しない場合は伝送帯域を検査しない"""
+        events = [MIDIEvent(0.0, MIDIEventType.NOTE_ON, note) for note in range(52, 60)]
+        events.append(MIDIEvent(0.001, MIDIEventType.NOTE_OFF, 52))
+        playlist = Playlist()
+        playlist.add(PlaybackSequence(events=events, total_duration=0.01, slot=1, tempo=120))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            playlist.compile(0)
+            list(playlist.iter_bursts())
+
+        with pytest.warns(UserWarning, match="sustainable MIDI message rate"):
+            playlist.compile(0, baud_rate=31250)
@@ -0,0 +1,150 @@
+"""
+MIDI出力ポート管理のテスト
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from kantan_play_midi.ports import PortManager, get_port_manager
+from kantan_play_midi.backends import RtMidiBackend
+from kantan_play_midi.exceptions import MIDIDeviceError
+
+
+class TestPortManager:
+    """PortManagerクラスのテスト"""
+
+    @pytest.fixture
+    def midi_out(self):
+        """ポート一覧を変更できるMidiOutのモック"""
+        ports = ["Port1", "Port2"]
+
+        def make_midi_out():
+            instance = Mock()
+            instance.get_ports.side_effect = lambda: list(ports)
+            instance.is_port_open.return_value = True
+            return instance
+
+        with patch('rtmidi.MidiOut', side_effect=make_midi_out) as mock_midi_out:
+            mock_midi_out.ports = ports
+            yield mock_midi_out
+
+    def test_enumeration_is_cached(self, midi_out):
+        """列挙結果はキャッシュされる"""
+        manager = PortManager(cache_ttl=60.0)
+
+        assert manager.get_ports() == ["Port1", "Port2"]
+        midi_out.ports.append("Port3")
+        assert manager.get_ports() == ["Port1", "Port2"]
+        assert manager.get_ports(refresh=True) == ["Port1", "Port2", "Port3"]
+        # 列挙専用のMidiOutは1つだけ
+        assert midi_out.call_count == 1
+
+    def test_change_detection(self, midi_out):
+        """ポート構成が変わるとgenerationが進む"""
+        manager = PortManager(cache_ttl=0.0)
+
+        manager.get_ports()
+        assert manager.generation == 0
+        manager.get_ports()
+        assert manager.generation == 0
+
+        midi_out.ports.remove("Port2")
+        assert manager.get_ports() == ["Port1"]
+        assert manager.generation == 1
+
+    def test_handles_are_pooled(self, midi_out):
+        """同じポートのハンドルは参照カウント付きで共有される"""
+        manager = PortManager()
+
+        name_a, handle_a = manager.acquire("Port2")
+        name_b, handle_b = manager.acquire("Port2")
+
+        assert name_a == name_b == "Port2"
+        assert handle_a is handle_b
+        handle_a.open_port.assert_called_once_with(1)
+        assert manager.pooled_ports() == {"Port2": 2}
+
+        manager.release("Port2", handle_a)
+        manager.release("Port2", handle_b)
+        # 参照がなくなってもプールに残る
+        assert manager.pooled_ports() == {"Port2": 0}
+        assert manager.acquire("Port2")[1] is handle_a
+        handle_a.close_port.assert_not_called()
+
+    def test_release_without_keep_idle(self, midi_out):
+        """keep_idleが無効な場合は参照がなくなったハンドルを閉じる"""
+        manager = PortManager(keep_idle=False)
+
+        _, handle = manager.acquire()
+        manager.release("Port1", handle)
+
+        handle.close_port.assert_called_once()
+        assert manager.pooled_ports() == {}
+
+    def test_port_not_found(self, midi_out):
+        """存在しないポート（再列挙しても見つからない場合）"""
+        manager = PortManager(cache_ttl=60.0)
+        manager.get_ports()
+
+        with pytest.raises(MIDIDeviceError, match="MIDI port 'Missing' not found"):
+            manager.acquire("Missing")
+
+    def test_new_port_found_by_refresh(self, midi_out):
+        """キャッシュにないポートは再列挙して探す"""
+        manager = PortManager(cache_ttl=60.0)
+        manager.get_ports()
+        midi_out.ports.append("Port3")
+
+        assert manager.acquire("Port3")[0] == "Port3"
+
+    def test_invalidate(self, midi_out):
+        """失われたポートのハンドルを破棄する"""
+        manager = PortManager()
+        _, handle = manager.acquire("Port1")
+
+        manager.invalidate("Port1")
+
+        handle.close_port.assert_called_once()
+        assert manager.acquire("Port1")[1] is not handle
+
+    def test_release_after_invalidate(self, midi_out):
+        """破棄されたハンドルの返却は、開き直したハンドルの参照数に影響しない"""
+        manager = PortManager(keep_idle=False)
+        backend_a = RtMidiBackend(manager)
+        backend_b = RtMidiBackend(manager)
+        backend_a.open("Port1")
+        backend_b.open("Port1")
+
+        backend_a.discard()
+        backend_a.open("Port1")
+        backend_b.close()
+
+        assert backend_a.is_open()
+        assert manager.pooled_ports() == {"Port1": 1}
+
+        # 古いハンドルでの破棄は開き直したハンドルを閉じない
+        backend_b.open("Port1")
+        backend_a.discard()
+        backend_a.open("Port1")
+        backend_b.discard()
+
+        assert backend_a.is_open()
+        assert manager.pooled_ports() == {"Port1": 1}
+
+    def test_backends_share_handles(self, midi_out):
+        """同じPortManagerを使うバックエンドはハンドルを共有する"""
+        manager = PortManager()
+        backend_a = RtMidiBackend(manager)
+        backend_b = RtMidiBackend(manager)
+
+        backend_a.open("Port1")
+        backend_b.open("Port1")
+        assert manager.pooled_ports() == {"Port1": 2}
+
+        backend_a.close()
+        assert backend_b.is_open()
+        assert manager.pooled_ports() == {"Port1": 1}
+
+    def test_shared_instance(self):
+        """既定のPortManagerはプロセス全体で共有される"""
+        assert get_port_manager() is get_port_manager()
+        assert RtMidiBackend().port_manager is get_port_manager()
@@ -2,11 +2,13 @@
 パフォーマンス処理のテスト
 """
 import pytest
+from unittest.mock import patch
 
 from kantan_play_midi.models import Note, Performance
 from kantan_play_midi.config import MIDIConfig
 from kantan_play_midi.processor import PerformanceProcessor
-from kantan_play_midi.sequence import MIDIEventType
+from kantan_play_midi.sequence import MIDIEventType, PlaybackSequence
+from kantan_play_midi.compiled import CompiledSequence
 
 
 class TestPerformanceProcessor:
@@ -145,6 +147,126 @@ class TestPerformanceProcessor:
         assert len(slot_events) == 1
         assert slot_events[0].note == 28  # slot 5 -> MIDI note 28
 
+    def test_stream_matches_process_performance(self, processor):
+        """ストリーム生成は一括生成と同じイベントを同じ順序で生成する"""
+        performance = Performance(
+            slot=3,
+            tempo=600,
+            notes=[
+                Note(degree="1", modifier1=1, modifier2=1),
+                Note(degree="3b", modifier3=2),
+                Note(degree="5"),
+                Note(degree="7", modifier1=8, modifier2=4, modifier3=1),
+            ]
+        )
+
+        sequence = processor.process_performance(performance)
+        stream = processor.stream_performance(performance)
+
+        assert stream.total_duration == sequence.total_duration
+        assert stream.slot == 3
+        assert stream.tempo == 600
+        assert list(stream.events) == sequence.events
+
+    def test_events_ordered_without_sort(self, processor):
+        """イベントは全体のソートなしで時刻順に生成され、sort_events()と同じ順序になる"""
+        performance = Performance(
+            slot=2,
+            tempo=600,
+            notes=[Note(degree="1", modifier1=1, modifier2=1), Note(degree="3b", modifier1=1)] * 20
+        )
+
+        with patch.object(PlaybackSequence, "sort_events", side_effect=AssertionError):
+            sequence = processor.process_performance(performance)
+
+        expected = PlaybackSequence(list(sequence.events), sequence.total_duration, 2, 600)
+        expected.sort_events()
+        assert sequence.events == expected.events
+
+    def test_tie_break_order(self, processor):
+        """同時刻ではノートオフ・ノートオン・スロット押下の順、同じ種類では生成順"""
+        performance = Performance(
+            slot=1,
+            tempo=120,
+            notes=[Note(degree="1", modifier1=1, modifier2=5), Note(degree="3", modifier1=1)]
+        )
+
+        sequence = processor.process_performance(performance)
+
+        at_start = [(e.event_type, e.note) for e in sequence.events if e.time_ns == 0]
+        assert at_start == [
+            (MIDIEventType.NOTE_ON, 52),
+            (MIDIEventType.NOTE_ON, 56),
+            (MIDIEventType.NOTE_ON, 60),
+            (MIDIEventType.SLOT_PRESS, 24),
+        ]
+        at_boundary = [(e.event_type, e.note) for e in sequence.events if e.time_ns == 4_000_000_000]
+        assert at_boundary == [
+            (MIDIEventType.NOTE_OFF, 52),
+            (MIDIEventType.NOTE_OFF, 56),
+            (MIDIEventType.NOTE_ON, 52),
+            (MIDIEventType.NOTE_ON, 64),
+        ]
+
+    def test_descriptions(self, config, processor, simple_performance):
+        """説明を無効にしても説明以外は同じイベントを生成する"""
+        sequence = processor.process_performance(simple_performance)
+        bare = PerformanceProcessor(config, descriptions=False).process_performance(simple_performance)
+
+        slot_event = next(e for e in sequence.events if e.event_type == MIDIEventType.SLOT_PRESS)
+        assert slot_event.description == "Slot 1 selection"
+        assert all(event.description for event in sequence.events)
+        assert all(event.description == "" for event in bare.events)
+        assert [
+            (e.timestamp, e.event_type, e.note, e.velocity, e.duration) for e in bare.events
+        ] == [
+            (e.timestamp, e.event_type, e.note, e.velocity, e.duration) for e in sequence.events
+        ]
+
+    def test_exact_timeline(self, processor):
+        """長い演奏でも同時刻のイベントは正確に同じ時刻になり、順序が変わらない"""
+        notes = [Note(degree="1", modifier1=1), Note(degree="3", modifier1=1)] * 500
+        performance = Performance(slot=1, tempo=110, notes=notes)
+
+        sequence = processor.process_performance(performance)
+
+        # 各音符のモディファイア解放は次の音符のモディファイア押下と同じ時刻で、必ず先に送出される
+        modifier_events = [e for e in sequence.events if e.note == 52]
+        for release, press in zip(modifier_events[1:-1:2], modifier_events[2::2]):
+            assert release.event_type == MIDIEventType.NOTE_OFF
+            assert press.event_type == MIDIEventType.NOTE_ON
+            assert release.time_ns == press.time_ns
+            assert release.timestamp == press.timestamp
+
+        last_press = modifier_events[-2]
+        assert last_press.time_ns == 999 * 8 * 60_000_000_000 // 110
+        assert sequence.events[-1].time_ns == 1000 * 8 * 60_000_000_000 // 110
+
+    def test_fractional_tempo_compiles(self, processor):
+        """小数のテンポの演奏もイベント時刻が整数になり、コンパイルできる"""
+        performance = Performance(slot=1, tempo=120.5, notes=[Note(degree="1", modifier1=1)] * 3)
+
+        sequence = processor.process_performance(performance)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        assert all(isinstance(event.time_ns, int) for event in sequence.events)
+        assert compiled.deadlines_ns[-1] == 3 * 8 * 60_000_000_000 * 2 // 241
+
+    def test_stream_is_lazy(self, processor):
+        """ストリームは読み出した分だけ生成される"""
+        performance = Performance(slot=1, tempo=120, notes=[Note(degree="1")] * 10000)
+        stream = processor.stream_performance(performance)
+
+        first = next(stream.events)
+        assert first.timestamp == 0.0
+
+    def test_stream_invalid_slot(self, processor):
+        """ストリーム生成でも無効なスロットは即座にエラー"""
+        performance = Performance(slot=1, tempo=120, notes=[Note(degree="1")])
+        performance.slot = 10
+        with pytest.raises(ValueError, match="Invalid slot"):
+            processor.stream_performance(performance)
+
     def test_sequence_summary(self, processor, simple_performance):
         """シーケンス概要の生成"""
         sequence = processor.process_performance(simple_performance)
@@ -0,0 +1,108 @@
+"""
+リアルタイム優先度設定のテスト
+"""
+import os
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from kantan_play_midi.realtime import RealtimeConfig, RealtimeReport, apply_realtime
+from kantan_play_midi.player import MIDIPlayer
+from kantan_play_midi.backends import LoopbackBackend
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+
+
+def _in_thread(func):
+    """別スレッドで実行して結果を返す（テストスレッドの優先度を変えないため）"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestRealtimeConfig:
+    """RealtimeConfigクラスのテスト"""
+
+    def test_invalid_values(self):
+        """不正な設定値"""
+        with pytest.raises(ValueError, match="policy"):
+            RealtimeConfig(policy="idle")
+        with pytest.raises(ValueError, match="priority"):
+            RealtimeConfig(priority=0)
+        with pytest.raises(ValueError, match="nice"):
+            RealtimeConfig(nice=-21)
+
+
+class TestApplyRealtime:
+    """apply_realtime関数のテスト"""
+
+    @patch('os.sched_setscheduler', create=True)
+    def test_realtime_policy(self, mock_setscheduler):
+        """リアルタイムポリシーが適用できる場合"""
+        report = apply_realtime(RealtimeConfig(policy="rr", priority=70))
+
+        assert report.policy == "SCHED_RR"
+        assert report.priority == 70
+        assert report.is_realtime
+        assert report.describe() == "SCHED_RR priority 70"
+        assert mock_setscheduler.call_args[0][1] == os.SCHED_RR
+
+    @patch('os.setpriority', create=True)
+    @patch('os.getpriority', create=True, return_value=-5)
+    @patch('os.sched_setscheduler', create=True, side_effect=PermissionError("denied"))
+    def test_fallback_to_nice(self, mock_setscheduler, mock_getpriority, mock_setpriority):
+        """権限がない場合はnice値にフォールバックする"""
+        report = apply_realtime(RealtimeConfig(nice=-5))
+
+        assert report.policy == "nice"
+        assert report.nice == -5
+        assert not report.is_realtime
+        assert "sched_setscheduler: denied" in report.errors
+
+    @patch('os.setpriority', create=True, side_effect=PermissionError("denied"))
+    @patch('os.sched_setscheduler', create=True, side_effect=PermissionError("denied"))
+    def test_nothing_permitted(self, mock_setscheduler, mock_setpriority):
+        """いずれも適用できない場合は既定のスケジューリングのまま"""
+        report = apply_realtime(RealtimeConfig())
+
+        assert report.policy == "default"
+        assert len(report.errors) == 2
+        assert report.describe() == "default scheduling"
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="requires sched_setaffinity")
+    def test_affinity(self):
+        """CPUアフィニティを適用する"""
+        cpu = min(os.sched_getaffinity(0))
+        with patch('os.sched_setscheduler', create=True):
+            report = _in_thread(lambda: apply_realtime(RealtimeConfig(cpus=[cpu])))
+
+        assert report.affinity == (cpu,)
+        assert f"CPUs [{cpu}]" in report.describe()
+
+
+class TestPlayerRealtime:
+    """MIDIPlayerへのリアルタイム設定の適用"""
+
+    def test_report_after_playback(self):
+        """演奏スレッドに設定を適用し、結果を記録する"""
+        sequence = PlaybackSequence(
+            events=[MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60)],
+            total_duration=0.01, slot=1, tempo=120
+        )
+        player = MIDIPlayer(backend=LoopbackBackend(), realtime=RealtimeConfig())
+        player.connect()
+
+        with patch('kantan_play_midi.player.apply_realtime', return_value=RealtimeReport()) as mock_apply:
+            player.play_sequence(sequence)
+            assert player.wait(1.0)
+
+        mock_apply.assert_called_once_with(player.realtime)
+        assert player.realtime_report.policy == "default"
+
+    def test_disabled_by_default(self):
+        """指定しない場合は適用しない"""
+        player = MIDIPlayer(backend=LoopbackBackend())
+        assert player.realtime is None
+        assert player.realtime_report is None
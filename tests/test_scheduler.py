@@ -0,0 +1,79 @@
+"""
+高精度スケジューラのテスト
+"""
+import threading
+import time
+
+import pytest
+
+from kantan_play_midi.scheduler import PrecisionScheduler
+
+
+class TestPrecisionScheduler:
+    """PrecisionSchedulerクラスのテスト"""
+
+    def test_invalid_spin_window(self):
+        """負のスピン幅はエラー"""
+        with pytest.raises(ValueError, match="spin_window"):
+            PrecisionScheduler(spin_window=-0.001)
+
+    def test_wait_until_reaches_deadline(self):
+        """締め切りまで待機し、それより早く戻らない"""
+        scheduler = PrecisionScheduler(spin_window=0.002)
+        deadline = scheduler.now_ns() + 20_000_000  # 20ms後
+
+        assert scheduler.wait_until(deadline) is True
+        assert scheduler.now_ns() >= deadline
+
+    def test_wait_until_past_deadline(self):
+        """過去の締め切りは即座に戻る"""
+        scheduler = PrecisionScheduler()
+        assert scheduler.wait_until(scheduler.now_ns() - 1) is True
+
+    def test_wake_interrupts_wait(self):
+        """wake()で待機が中断される"""
+        scheduler = PrecisionScheduler()
+        deadline = scheduler.now_ns() + 5_000_000_000  # 5秒後
+
+        timer = threading.Timer(0.05, scheduler.wake)
+        timer.start()
+        start = time.perf_counter()
+        assert scheduler.wait_until(deadline) is False
+        assert time.perf_counter() - start < 1.0
+        timer.join()
+
+    def test_idle(self):
+        """idle()はwake()で起こされる"""
+        scheduler = PrecisionScheduler()
+        assert scheduler.idle(0.01) is False
+
+        scheduler.wake()
+        assert scheduler.idle(1.0) is True
+
+    def test_record_lateness_and_stats(self):
+        """遅延の記録と統計"""
+        scheduler = PrecisionScheduler()
+        assert scheduler.get_lateness_stats()["count"] == 0
+
+        for _ in range(10):
+            scheduler.record_lateness(scheduler.now_ns())
+
+        stats = scheduler.get_lateness_stats()
+        assert stats["count"] == 10
+        assert 0.0 <= stats["p50"] <= stats["p99"] <= stats["max"]
+
+        scheduler.reset()
+        assert len(scheduler.lateness_ns) == 0
+
+    def test_lateness_is_bounded(self):
+        """遅延は直近lateness_capacity件だけ古い順に記録される"""
+        scheduler = PrecisionScheduler(lateness_capacity=4)
+        for seconds in range(6):
+            scheduler.record_lateness(scheduler.now_ns() - seconds * 1_000_000_000)
+
+        assert scheduler.lateness_count == 6
+        assert [round(value / 1e9) for value in scheduler.lateness_ns] == [2, 3, 4, 5]
+        assert scheduler.get_lateness_stats()["count"] == 4
+
+        with pytest.raises(ValueError, match="lateness_capacity"):
+            PrecisionScheduler(lateness_capacity=0)
@@ -1,9 +1,12 @@
 """
 シーケンスモデルのテスト
 """
+import sys
+
 import pytest
 
-from kantan_play_midi.sequence import MIDIEvent, MIDIEventType, PlaybackSequence
+from kantan_play_midi.sequence import MIDIEvent, MIDIEventType, PlaybackSequence, ColumnarSequence
+from kantan_play_midi.compiled import CompiledSequence
 
 
 class TestMIDIEvent:
@@ -145,4 +148,83 @@ class TestPlaybackSequence:
         
         assert len(empty_sequence.events) == 0
         assert empty_sequence.get_events_at_time(0.0) == []
-        assert empty_sequence.get_events_in_range(0.0, 10.0) == []
\ No newline at end of file
+        assert empty_sequence.get_events_in_range(0.0, 10.0) == []
+
+
+class TestColumnarSequence:
+    """ColumnarSequenceクラスのテスト"""
+
+    @pytest.fixture
+    def sequence(self):
+        """時刻順が混在したサンプルシーケンス"""
+        return PlaybackSequence(
+            events=[
+                MIDIEvent(2.0, MIDIEventType.NOTE_ON, 60, duration=0.05),
+                MIDIEvent(0.0, MIDIEventType.SLOT_PRESS, 24, duration=0.05),
+                MIDIEvent(1.0, MIDIEventType.NOTE_ON, 52, velocity=100),
+                MIDIEvent(1.0, MIDIEventType.NOTE_OFF, 60, description="release"),
+                MIDIEvent(2.05, MIDIEventType.NOTE_OFF, 60),
+                MIDIEvent(3.0, MIDIEventType.NOTE_OFF, 52),
+            ],
+            total_duration=4.0,
+            slot=1,
+            tempo=120
+        )
+
+    def test_round_trip(self, sequence):
+        """MIDIEventのビューは元のイベントを時刻順に再現する（descriptionは保持しない）"""
+        columnar = ColumnarSequence.from_sequence(sequence)
+        sequence.sort_events()
+
+        assert len(columnar) == 6
+        assert [
+            (e.timestamp, e.event_type, e.note, e.velocity, e.duration) for e in columnar.events
+        ] == [
+            (e.timestamp, e.event_type, e.note, e.velocity, e.duration) for e in sequence.events
+        ]
+        assert columnar.events[-1] == MIDIEvent(3.0, MIDIEventType.NOTE_OFF, 52)
+        assert columnar.to_sequence().total_duration == 4.0
+
+    def test_queries_match_playback_sequence(self, sequence):
+        """時刻による検索はPlaybackSequenceと同じ結果を返す"""
+        columnar = ColumnarSequence.from_sequence(sequence)
+        sequence.sort_events()
+
+        for start, end in [(0.0, 2.0), (1.0, 3.0), (1.01, 1.99), (10.0, 20.0), (2.0, 1.0)]:
+            assert [e.note for e in columnar.get_events_in_range(start, end)] == \
+                [e.note for e in sequence.get_events_in_range(start, end)]
+        for timestamp in [0.0, 1.0, 1.001, 2.04, 5.0]:
+            assert [e.event_type for e in columnar.get_events_at_time(timestamp)] == \
+                [e.event_type for e in sequence.get_events_at_time(timestamp)]
+        assert columnar.index_range(1.0, 2.0) == (1, 4)
+
+    def test_compiles_like_playback_sequence(self, sequence):
+        """PlaybackSequenceの代わりにコンパイルできる"""
+        columnar = ColumnarSequence.from_sequence(sequence)
+        sequence.sort_events()
+
+        compiled = CompiledSequence.from_sequence(columnar)
+        expected = CompiledSequence.from_sequence(sequence)
+        assert list(compiled.iter_bursts()) == list(expected.iter_bursts())
+
+    def test_memory_per_event(self):
+        """1イベントあたりのメモリ使用量はMIDIEventの1/10以下"""
+        events = [MIDIEvent(i * 0.1, MIDIEventType.NOTE_ON, 60, duration=0.05) for i in range(1000)]
+        columnar = ColumnarSequence.from_sequence(
+            PlaybackSequence(events=events, total_duration=100.0, slot=1, tempo=120)
+        )
+        event = events[0]
+        per_event = sys.getsizeof(event) + sys.getsizeof(event.__dict__) + sys.getsizeof(event.timestamp)
+
+        assert columnar.nbytes == 19 * 1000
+        assert columnar.nbytes / len(columnar) * 10 <= per_event
+
+    def test_mismatched_columns(self):
+        """配列の長さが揃っていない場合"""
+        columnar = ColumnarSequence.from_sequence(
+            PlaybackSequence(events=[MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60)],
+                             total_duration=1.0, slot=1, tempo=120)
+        )
+        with pytest.raises(ValueError, match="same length"):
+            ColumnarSequence(columnar.timestamps, columnar.event_types, columnar.notes,
+                             columnar.velocities, columnar.durations[:0], 1.0, 1, 120)
@@ -0,0 +1,204 @@
+"""
+シーケンスファイルのテスト
+"""
+import struct
+
+import pytest
+from unittest.mock import patch
+
+from kantan_play_midi.sequence_file import (
+    MappedSequence, save_sequence, load_sequence, FORMAT_VERSION
+)
+from kantan_play_midi.sequence import (
+    PlaybackSequence, ColumnarSequence, MIDIEvent, MIDIEventType, event_row
+)
+from kantan_play_midi.compiled import CompiledSequence
+from kantan_play_midi.player import MIDIPlayer
+from kantan_play_midi.playlist import Playlist
+from kantan_play_midi.backends import LoopbackBackend
+from kantan_play_midi.exceptions import InvalidInputError
+from kantan_play_midi.config import MIDIConfig
+from kantan_play_midi.models import Note, Performance
+from kantan_play_midi.processor import PerformanceProcessor
+
+
+@pytest.fixture
+def sequence():
+    """スロット押下とノートを含むシーケンス"""
+    return PlaybackSequence(
+        events=[
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 52, time_ns=0),
+            MIDIEvent(0.0, MIDIEventType.SLOT_PRESS, 24, duration=0.05),
+            MIDIEvent(0.1, MIDIEventType.NOTE_ON, 60, velocity=100),
+            MIDIEvent(0.15, MIDIEventType.NOTE_OFF, 60),
+            MIDIEvent(0.3, MIDIEventType.NOTE_OFF, 52, time_ns=300_000_000),
+        ],
+        total_duration=0.4,
+        slot=1,
+        tempo=120
+    )
+
+
+class TestSequenceFile:
+    """save_sequence / load_sequenceのテスト"""
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_round_trip(self, sequence, tmp_path, compress):
+        """保存したシーケンスは同じイベントとして読み込まれる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path, compress=compress)
+
+        with load_sequence(path) as loaded:
+            assert isinstance(loaded, MappedSequence)
+            assert loaded.is_mapped is not compress
+            assert (loaded.slot, loaded.tempo, loaded.total_duration) == (1, 120, 0.4)
+            assert len(loaded) == 5
+            assert list(loaded.iter_rows()) == list(map(event_row, sequence.events))
+            assert loaded.events[2] == MIDIEvent(
+                0.1, MIDIEventType.NOTE_ON, 60, velocity=100, time_ns=100_000_000
+            )
+            assert loaded.events[0].duration is None
+            assert loaded.events[1].duration == 0.05
+            assert len(loaded.to_sequence().events) == 5
+
+    def test_close_while_iterating(self, sequence, tmp_path):
+        """行の読み出し中でも閉じられ、読み出しは最後まで続けられる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+
+        with load_sequence(path) as loaded:
+            rows = loaded.iter_rows()
+            first = next(rows)
+        assert not loaded.is_mapped
+
+        assert [first] + list(rows) == list(map(event_row, sequence.events))
+
+    def test_fractional_tempo(self, tmp_path, temp_midi_config_file):
+        """小数のテンポの演奏もテンポを変えずに保存・読み込みできる"""
+        config = MIDIConfig(temp_midi_config_file)
+        performance = Performance(slot=1, tempo=120.5, notes=[Note(degree="1", modifier1=1)] * 2)
+        sequence = PerformanceProcessor(config).process_performance(performance)
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+
+        with load_sequence(path) as loaded:
+            assert loaded.tempo == 120.5
+            assert list(loaded.iter_rows()) == list(sequence.iter_rows())
+            compiled = CompiledSequence.from_sequence(loaded)
+        assert compiled.tempo == 120.5
+        assert compiled.deadlines_ns == CompiledSequence.from_sequence(sequence).deadlines_ns
+
+    def test_fixed_width_table(self, sequence, tmp_path):
+        """非圧縮のファイルは32バイトのヘッダと1イベント20バイトのイベント表からなる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+
+        data = path.read_bytes()
+        assert data[:4] == b"KPSQ"
+        assert struct.unpack_from("<H", data, 4)[0] == FORMAT_VERSION
+        assert len(data) == 32 + 20 * 5
+
+    def test_compression(self, tmp_path):
+        """圧縮すると繰り返しの多い演奏のファイルが小さくなる"""
+        events = []
+        for i in range(1000):
+            events.append(MIDIEvent(i * 0.5, MIDIEventType.NOTE_ON, 60, time_ns=i * 500_000_000))
+            events.append(MIDIEvent(i * 0.5 + 0.05, MIDIEventType.NOTE_OFF, 60,
+                                    time_ns=i * 500_000_000 + 50_000_000))
+        sequence = PlaybackSequence(events=events, total_duration=500.0, slot=1, tempo=120)
+
+        save_sequence(sequence, tmp_path / "raw.kpseq")
+        save_sequence(sequence, tmp_path / "packed.kpseq", compress=True)
+
+        assert (tmp_path / "packed.kpseq").stat().st_size < (tmp_path / "raw.kpseq").stat().st_size / 4
+
+    def test_compiles_without_events(self, sequence, tmp_path):
+        """コンパイルはイベント表から直接行い、MIDIEventを生成しない"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(ColumnarSequence.from_sequence(sequence), path)
+        expected = CompiledSequence.from_sequence(sequence)
+
+        with load_sequence(path) as loaded:
+            with patch('kantan_play_midi.sequence_file.MIDIEvent', side_effect=AssertionError):
+                compiled = CompiledSequence.from_sequence(loaded)
+
+        assert list(compiled.iter_bursts()) == list(expected.iter_bursts())
+        assert compiled.total_duration_ns == expected.total_duration_ns
+
+    def test_invalid_files(self, sequence, tmp_path):
+        """不正なファイル"""
+        path = tmp_path / "song.kpseq"
+
+        path.write_bytes(b"KPSQ")
+        with pytest.raises(InvalidInputError, match="Truncated"):
+            load_sequence(path)
+
+        path.write_bytes(b"JSON" + bytes(28))
+        with pytest.raises(InvalidInputError, match="Not a sequence file"):
+            load_sequence(path)
+
+        save_sequence(sequence, path)
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 4, FORMAT_VERSION + 1)
+        path.write_bytes(bytes(data))
+        with pytest.raises(InvalidInputError, match="version"):
+            load_sequence(path)
+
+        save_sequence(sequence, path)
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(InvalidInputError, match="Truncated"):
+            load_sequence(path)
+
+    def test_play_loaded_sequence(self, sequence, tmp_path):
+        """読み込んだシーケンスをそのまま演奏できる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        with load_sequence(path) as loaded:
+            player.play_sequence(loaded)
+        assert player.wait(2.0)
+
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 24, 127]),
+            bytes([0x80, 24, 0]),
+            bytes([0x90, 60, 100]),
+            bytes([0x80, 60, 0]),
+            bytes([0x80, 52, 0]),
+        ]
+
+    def test_stream_loaded_sequence(self, sequence, tmp_path):
+        """読み込んだシーケンスはコンパイルせずにイベント表から直接演奏できる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+        backend = LoopbackBackend()
+        player = MIDIPlayer(backend=backend)
+        player.connect()
+
+        with load_sequence(path) as loaded:
+            with patch.object(CompiledSequence, "from_sequence", side_effect=AssertionError), \
+                    patch('kantan_play_midi.sequence_file.MIDIEvent', side_effect=AssertionError):
+                player.play_stream(loaded)
+                assert player.wait(2.0)
+
+        assert [message for _, message in backend.get_messages()] == [
+            bytes([0x90, 52, 127]),
+            bytes([0x90, 24, 127]),
+            bytes([0x80, 24, 0]),
+            bytes([0x90, 60, 100]),
+            bytes([0x80, 60, 0]),
+            bytes([0x80, 52, 0]),
+        ]
+
+    def test_playlist_item(self, sequence, tmp_path):
+        """シーケンスファイルはプロセッサなしでプレイリストに追加できる"""
+        path = tmp_path / "song.kpseq"
+        save_sequence(sequence, path)
+
+        playlist = Playlist()
+        playlist.add(path)
+
+        assert len(playlist.compile(0)) == len(CompiledSequence.from_sequence(sequence))
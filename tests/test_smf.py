@@ -0,0 +1,110 @@
+"""
+スタンダードMIDIファイル書き出しのテスト
+"""
+import mido
+import pytest
+
+from kantan_play_midi.smf import export_smf
+from kantan_play_midi.compiled import CompiledSequence
+from kantan_play_midi.config import MIDIConfig
+from kantan_play_midi.models import Note, Performance
+from kantan_play_midi.processor import PerformanceProcessor
+from kantan_play_midi.sequence import PlaybackSequence, MIDIEvent, MIDIEventType
+
+
+def _absolute(track):
+    """(絶対ティック, メッセージ) のリスト"""
+    tick = 0
+    result = []
+    for message in track:
+        tick += message.time
+        result.append((tick, message))
+    return result
+
+
+class TestExportSMF:
+    """export_smf関数のテスト"""
+
+    @pytest.fixture
+    def sequence(self):
+        """スロット押下とノートを含むシーケンス（テンポ120）"""
+        return PlaybackSequence(
+            events=[
+                MIDIEvent(0.0, MIDIEventType.SLOT_PRESS, 24, duration=0.05),
+                MIDIEvent(0.5, MIDIEventType.NOTE_ON, 60, velocity=100),
+                MIDIEvent(0.55, MIDIEventType.NOTE_OFF, 60),
+            ],
+            total_duration=2.0,
+            slot=1,
+            tempo=120
+        )
+
+    def test_type0_file(self, sequence, tmp_path):
+        """テンポ設定とデルタタイム付きのフォーマット0ファイルを書き出す"""
+        path = tmp_path / "song.mid"
+        export_smf(sequence, path, channel=2, ppq=96)
+
+        midi = mido.MidiFile(path)
+        assert midi.type == 0
+        assert midi.ticks_per_beat == 96
+        assert len(midi.tracks) == 1
+
+        events = [
+            (tick, message.type, getattr(message, "note", None), getattr(message, "channel", None))
+            for tick, message in _absolute(midi.tracks[0])
+        ]
+        assert events == [
+            (0, "set_tempo", None, None),
+            (0, "note_on", 24, 2),
+            (10, "note_off", 24, 2),      # 0.05秒 = 9.6ティック
+            (96, "note_on", 60, 2),
+            (106, "note_off", 60, 2),
+            (384, "end_of_track", None, None),
+        ]
+        assert midi.tracks[0][0].tempo == 500_000
+        assert midi.length == pytest.approx(2.0)
+
+    def test_compiled_sequence(self, sequence, tmp_path):
+        """コンパイル済みシーケンスはシーケンスと同じ内容で書き出される"""
+        export_smf(sequence, tmp_path / "a.mid")
+        export_smf(CompiledSequence.from_sequence(sequence), tmp_path / "b.mid")
+
+        assert (tmp_path / "a.mid").read_bytes() == (tmp_path / "b.mid").read_bytes()
+
+    def test_long_performance(self, temp_midi_config_file, tmp_path):
+        """長い演奏も1回の走査で書き出され、全メッセージが含まれる"""
+        processor = PerformanceProcessor(MIDIConfig(temp_midi_config_file), descriptions=False)
+        performance = Performance(slot=1, tempo=150, notes=[Note("1", modifier1=1), Note("5")] * 1000)
+        sequence = processor.process_performance(performance)
+        compiled = CompiledSequence.from_sequence(sequence)
+
+        path = tmp_path / "long.mid"
+        export_smf(compiled, path)
+
+        midi = mido.MidiFile(path)
+        messages = [message for message in midi.tracks[0] if not message.is_meta]
+        assert len(messages) == sum(len(burst) for _, burst, _ in compiled.iter_bursts())
+        assert midi.length == pytest.approx(sequence.total_duration)
+        assert sum(message.time for message in midi.tracks[0]) == 2000 * 8 * 480
+
+    def test_invalid_ppq(self, sequence, tmp_path):
+        """不正なPPQ"""
+        with pytest.raises(ValueError, match="ppq"):
+            export_smf(sequence, tmp_path / "song.mid", ppq=0)
+
+    def test_failed_export_leaves_no_file(self, sequence, tmp_path):
+        """デルタタイムが表せない場合は書きかけのファイルを残さず、既存のファイルも置き換えない"""
+        path = tmp_path / "song.mid"
+        export_smf(sequence, path)
+        original = path.read_bytes()
+
+        events = [
+            MIDIEvent(0.0, MIDIEventType.NOTE_ON, 60),
+            MIDIEvent(300000.0, MIDIEventType.NOTE_OFF, 60),
+        ]
+        too_long = PlaybackSequence(events=events, total_duration=300000.0, slot=1, tempo=120)
+        with pytest.raises(ValueError, match="Delta time"):
+            export_smf(too_long, path)
+
+        assert path.read_bytes() == original
+        assert list(tmp_path.iterdir()) == [path]
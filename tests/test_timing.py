@@ -27,6 +27,13 @@ class TestTimingCalculator:
         assert timings[1] == 8.0      # 2音符目: 8秒後
         assert timings[2] == 16.0     # 3音符目: 16秒後
 
+    def test_iter_note_timings(self):
+        """音符タイミングの遅延生成"""
+        calc = TimingCalculator(90)
+
+        assert list(calc.iter_note_timings(5)) == calc.calculate_note_timings(5)
+        assert list(calc.iter_note_timings(0)) == []
+
     def test_calculate_degree_press_timings(self):
         """degreeボタン押下タイミングのテスト"""
         calc = TimingCalculator(60)  # 1秒 = 1拍
@@ -69,4 +76,40 @@ class TestTimingCalculator:
         timings_60 = calc_60.calculate_note_timings(2)
         
         # テンポが2倍なら、時間は半分になる
-        assert timings_120[1] == timings_60[1] / 2
\ No newline at end of file
+        assert timings_120[1] == timings_60[1] / 2
+
+    def test_ticks(self):
+        """ティックのタイムライン"""
+        calc = TimingCalculator(120, ppq=96)
+
+        assert calc.ticks_per_note == 768
+        assert list(calc.iter_note_ticks(3)) == [0, 768, 1536]
+        assert calc.calculate_degree_press_ticks(768) == [768 + i * 96 for i in range(8)]
+        assert calc.calculate_modifier_release_tick(768) == 1536
+        assert calc.get_total_ticks(3) == 2304
+        assert calc.ticks_to_ns(96) == 500_000_000
+        assert calc.ticks_to_seconds(2304) == 12.0
+
+    def test_no_drift(self):
+        """長い演奏でも時刻は音符番号から直接求められ、誤差が蓄積しない"""
+        calc = TimingCalculator(110)
+        note_count = 100000
+
+        last = list(calc.iter_note_timings(note_count))[-1]
+        ticks = (note_count - 1) * calc.ticks_per_note
+        assert calc.ticks_to_ns(ticks) == ticks * 60_000_000_000 // (110 * 480)
+        assert last == calc.ticks_to_ns(ticks) / 1_000_000_000
+        assert calc.get_total_duration(note_count) == calc.ticks_to_seconds(note_count * calc.ticks_per_note)
+
+    def test_fractional_tempo(self):
+        """小数のテンポでも時刻は切り捨ての整数ナノ秒になる"""
+        calc = TimingCalculator(120.5)
+        ticks = 1000 * calc.ticks_per_note
+
+        assert calc.ticks_to_ns(ticks) == ticks * 60_000_000_000 * 2 // (241 * 480)
+        assert isinstance(calc.ticks_to_ns(ticks), int)
+
+    def test_invalid_ppq(self):
+        """不正なPPQ"""
+        with pytest.raises(ValueError, match="ppq"):
+            TimingCalculator(120, ppq=0)